@@ -8,6 +8,7 @@ const express = require('express');
 const cors = require('cors');
 const morgan = require('morgan');
 const path = require('path');
+const fs = require('fs');
 const { errorHandler, notFoundHandler } = require('./middleware/errorHandler');
 
 // 创建Express应用
@@ -24,9 +25,67 @@ app.use(cors({
 }));
 
 // 静态文件服务 - 必须在API路由之前!
-const staticPath = path.join(__dirname, '..');
+// 默认为仓库根目录（开发时直接访问源页面）；预压缩副本和哈希文件名的资源只存在于 build-pages.py 的输出目录 dist/ 中，
+// 生产环境通过 STATIC_ROOT 指向 dist/（见 ecosystem.config.js）
+const staticPath = path.resolve(process.env.STATIC_ROOT || path.join(__dirname, '..'));
 console.log('📁 静态文件目录:', staticPath);
-app.use(express.static(staticPath));
+// 按内容哈希命名的文件（如 js/sidebar.0123456789.js）内容不会变，允许浏览器长期缓存
+const HASHED_ASSET = /\.[0-9a-f]{10}\.(js|css|svg)$/;
+// build-pages.py 的 precompress 阶段生成的 .gz / .deflate 副本：客户端支持时直接发送，不再逐次压缩
+const PRECOMPRESSED = [['gzip', '.gz'], ['deflate', '.deflate']];
+const COMPRESSIBLE = /\.(html|js|css|svg|json|txt)$/;
+// 启动时扫描一次静态目录中的预压缩副本，请求时只查集合，不再逐次访问文件系统（重新构建后需要重启服务）
+function findPrecompressed(root) {
+    const found = new Set();
+    const walk = (dir) => {
+        for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+            if (entry.name.startsWith('.') || entry.name === 'node_modules') {
+                continue;
+            }
+            const fullPath = path.join(dir, entry.name);
+            if (entry.isDirectory()) {
+                walk(fullPath);
+            } else if (PRECOMPRESSED.some(([, ext]) => entry.name.endsWith(ext))) {
+                found.add(fullPath);
+            }
+        }
+    };
+    walk(root);
+    return found;
+}
+const precompressedFiles = findPrecompressed(staticPath);
+console.log('📦 预压缩副本:', precompressedFiles.size);
+app.use((req, res, next) => {
+    if ((req.method !== 'GET' && req.method !== 'HEAD') || !COMPRESSIBLE.test(req.path)) {
+        return next();
+    }
+    let filePath;
+    try {
+        filePath = path.join(staticPath, decodeURIComponent(req.path));
+    } catch (e) {
+        return next();
+    }
+    if (!filePath.startsWith(staticPath + path.sep)) {
+        return next();
+    }
+    res.vary('Accept-Encoding');
+    for (const [encoding, ext] of PRECOMPRESSED) {
+        if (req.acceptsEncodings(encoding) === encoding && precompressedFiles.has(filePath + ext)) {
+            res.type(path.extname(req.path));
+            res.setHeader('Content-Encoding', encoding);
+            req.url = req.path + ext + req.url.slice(req.path.length);
+            break;
+        }
+    }
+    next();
+});
+app.use(express.static(staticPath, {
+    setHeaders: (res, filePath) => {
+        if (HASHED_ASSET.test(filePath.replace(/\.(gz|deflate)$/, ''))) {
+            res.setHeader('Cache-Control', 'public, max-age=31536000, immutable');
+        }
+    }
+}));
 
 // 请求体解析
 app.use(express.json({ limit: '10mb' }));
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+侧边栏改写脚本的基准测试
+在临时目录生成合成页面，按 变换 × 页面大小 × 侧边栏变体 × 页数 统计各阶段耗时，结果保存为 JSON
+用 --compare 与之前保存的结果对比，查看不同提交之间的性能变化
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from page_tools.bench import (
+    BENCH_TRANSFORMS, DEFAULT_SIZES, PHASES, VARIANTS, compare_results, environment_info, generate_corpus, run_case,
+)
+
+
+def format_size(size):
+    return f'{size // 1024} KB' if size < 1024 * 1024 else f'{size / 1024 / 1024:g} MB'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='侧边栏改写脚本的基准测试')
+    parser.add_argument('--transforms', nargs='+', choices=sorted(BENCH_TRANSFORMS), default=list(BENCH_TRANSFORMS),
+                        help='要测试的变换')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[size // 1024 for size in DEFAULT_SIZES],
+                        help='页面大小（KB）')
+    parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=list(VARIANTS), help='侧边栏变体')
+    parser.add_argument('--pages', nargs='+', type=int, default=[12], help='每组页面数，可以指定多个观察页面数增长的影响')
+    parser.add_argument('--repeat', type=int, default=5, help='每组重复轮数，取中位数')
+    parser.add_argument('--seed', type=int, default=0, help='合成页面的随机种子')
+    parser.add_argument('-o', '--output', default='bench-sidebars.json', help='结果 JSON 文件')
+    parser.add_argument('--compare', metavar='JSON', help='与之前保存的结果对比')
+    args = parser.parse_args()
+
+    sizes = [size * 1024 for size in args.sizes]
+    results = []
+
+    print('=' * 60)
+    print('侧边栏改写基准测试')
+    print('=' * 60)
+    header = f"{'变换':<10}{'大小':>8}  {'变体':<12}{'页数':>5}{'命中':>5}" + ''.join(f'{phase:>9}' for phase in PHASES) + f"{'合计ms':>9}"
+    print(header)
+
+    with tempfile.TemporaryDirectory(prefix='bench-sidebars-') as tmp:
+        for pages in args.pages:
+            corpus = generate_corpus(os.path.join(tmp, str(pages)), sizes, args.variants, pages, args.seed)
+            for name in args.transforms:
+                for (size, variant), paths in corpus.items():
+                    result = run_case(BENCH_TRANSFORMS[name], paths, args.repeat)
+                    result.update({'transform': name, 'size': size, 'variant': variant, 'pages': pages})
+                    results.append(result)
+                    print(f"{name:<10}{format_size(size):>8}  {variant:<12}{pages:>5}{result['hits']:>5}"
+                          + ''.join(f"{result['phases'][phase]['median_ms']:>9.2f}" for phase in PHASES)
+                          + f"{result['total']['median_ms']:>9.2f}")
+
+    data = {
+        'environment': environment_info(os.path.dirname(os.path.abspath(__file__))),
+        'config': {'repeat': args.repeat, 'seed': args.seed},
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print('=' * 60)
+    print(f'[OK] 结果已保存: {args.output}')
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            old = json.load(f)
+        print(f"\n与 {args.compare} ({old['environment'].get('commit') or '未知提交'}) 对比，总耗时中位数:")
+        for (name, size, variant, pages), old_ms, new_ms, ratio in compare_results(old, data):
+            tag = '[WARN]' if ratio > 1.2 else '[OK]  '
+            print(f"{tag} {name:<10}{format_size(size):>8}  {variant:<12}{pages:>5}  {old_ms:>9.2f} -> {new_ms:>9.2f} ms  x{ratio:.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
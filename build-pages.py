@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+发布构建：把页面处理后写到 dist/，源页面保持不变
+
+用法:
+    python build-pages.py --list
+    python build-pages.py
+    python build-pages.py minify --pages index.html customers.html -o /tmp/dist
+    python build-pages.py precompress -j 4
+"""
+
+import argparse
+import os
+import sys
+
+from page_tools.build import DIST_DIR, STAGES, BuildError, get_stages, print_savings, run_build
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='发布构建：处理后的页面写到单独的输出目录')
+    parser.add_argument('stages', nargs='*', help='按顺序执行的构建阶段（默认全部内置阶段）')
+    parser.add_argument('--pages', nargs='+', help='只构建指定页面（默认所有页面）')
+    parser.add_argument('-o', '--output', help=f'输出目录（默认 {DIST_DIR}/）')
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='并行进程数，0 表示使用全部CPU核心（默认）')
+    parser.add_argument('--list', action='store_true', help='列出所有可用的构建阶段')
+    args = parser.parse_args()
+
+    from page_tools.stages import DEFAULT_STAGES
+
+    if args.list:
+        print('可用的构建阶段（默认顺序: ' + ' → '.join(DEFAULT_STAGES) + '）:')
+        for name, stage in STAGES.items():
+            print(f'  {name:<22}{stage.description}')
+        return 0
+
+    try:
+        stages = get_stages(args.stages or DEFAULT_STAGES)
+    except KeyError as e:
+        print(f'[ERROR] {e.args[0]}')
+        return 1
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    out_dir = os.path.abspath(args.output or os.path.join(base_dir, DIST_DIR))
+    if out_dir == base_dir:
+        print('[ERROR] 输出目录不能是源目录')
+        return 1
+
+    print('=' * 60)
+    print(f"开始构建: {' → '.join(stage.name for stage in stages)}")
+    print('=' * 60)
+
+    try:
+        build = run_build(base_dir, out_dir, stages, args.pages, args.jobs)
+    except BuildError as e:
+        print(f'[ERROR] {e}')
+        return 1
+    print_savings(build)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+检查页面和 js/、css/ 之间的引用
+一次解析所有页面和脚本、样式中的 href/src/import，报告不存在的引用目标（404）、没有页面加载的孤立文件、
+同一页面重复加载的文件，以及每个页面传递加载的字节数。有不存在的引用时返回非零退出码。
+
+用法:
+    python check-assets.py
+    python check-assets.py --pages customer-detail.html customer-detail-v2.html --files
+    python check-assets.py --json asset-report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from page_tools.assets import load_graph
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='检查页面和静态资源之间的引用')
+    parser.add_argument('--pages', nargs='+', help='只列出这些页面的加载字节数（默认所有页面）')
+    parser.add_argument('--files', action='store_true', help='列出每个页面加载的文件')
+    parser.add_argument('--json', metavar='FILE', help='把完整结果写入 JSON 文件')
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    graph = load_graph(base_dir)
+
+    print('=' * 60)
+    print(f'资源引用检查: {len(graph.pages)} 个页面，{len(graph.entries)} 个文件，本次解析 {len(graph.scanned)} 个')
+    print('=' * 60)
+
+    missing = graph.missing()
+    for ref in missing:
+        print(f'[ERROR] {ref.source}:{ref.line} {ref.kind} 引用不存在的文件 {ref.target}')
+
+    duplicates = graph.duplicates()
+    for dup in duplicates:
+        print(f"[WARN] {dup.page} 重复加载 {dup.target}（第 {', '.join(map(str, dup.lines))} 行）")
+
+    orphans = graph.orphans()
+    for relpath in orphans:
+        print(f'[WARN] 没有页面加载 {relpath}（{graph.size(relpath)} 字节）')
+
+    pages = [page for page in (args.pages or graph.pages) if page in graph.entries]
+    weights = sorted(graph.weights(pages), key=lambda w: w.own + w.static_bytes, reverse=True)
+    print()
+    print(f"{'页面':<36}{'页面字节':>10}{'加载字节':>10}{'合计':>10}{'按需字节':>10}")
+    for weight in weights:
+        print(f'{weight.page:<36}{weight.own:>10}{weight.static_bytes:>10}'
+              f'{weight.own + weight.static_bytes:>10}{weight.dynamic_bytes:>10}')
+        if args.files:
+            for target in weight.static:
+                print(f'    {target} ({graph.size(target)})')
+            for target in weight.dynamic:
+                print(f'    {target} ({graph.size(target)}，按需)')
+
+    if args.json:
+        report = {
+            'missing': [ref._asdict() for ref in missing],
+            'duplicates': [dup._asdict() for dup in duplicates],
+            'orphans': orphans,
+            'pages': [weight._asdict() for weight in weights],
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f'\n[OK] 结果已保存到 {args.json}')
+
+    print()
+    if missing:
+        print(f'[ERROR] {len(missing)} 个引用指向不存在的文件')
+        return 1
+    print('[OK] 所有本地引用的目标都存在')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -38,6 +38,25 @@ if [ ! -f ".env" ]; then
         exit 1
     fi
 fi
+# 侧边栏检查和发布构建都需要 python3；服务器以 dist/ 作为静态文件根目录，不能上传旧的构建结果
+if ! command -v python3 &> /dev/null; then
+    echo -e "${RED}错误: 未找到 python3，无法构建 dist/${NC}"
+    exit 1
+fi
+# 侧边栏一致性检查（只读，不修改页面）
+if ! python3 update-sidebars-unified.py --check; then
+    echo -e "${RED}警告: 部分页面的侧边栏与标准模板不一致${NC}"
+    read -p "是否继续？(y/n) " -n 1 -r
+    echo
+    if [[ ! $REPLY =~ ^[Yy]$ ]]; then
+        exit 1
+    fi
+fi
+# 发布构建：预压缩副本和哈希文件名的资源写到 dist/，清理上次构建留下的过期文件
+if ! python3 build-pages.py; then
+    echo -e "${RED}错误: 页面构建失败${NC}"
+    exit 1
+fi
 echo -e "${GREEN}✓ 本地文件检查完成${NC}"
 echo ""
 
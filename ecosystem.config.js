@@ -1,3 +1,5 @@
+const path = require('path');
+
 module.exports = {
   apps: [{
     name: 'beauty-crm-backend',
@@ -8,7 +10,9 @@ module.exports = {
     max_memory_restart: '500M',
     env: {
       NODE_ENV: 'production',
-      APP_PORT: 5004
+      APP_PORT: 5004,
+      // build-pages.py 的输出目录，预压缩副本和哈希文件名的资源只存在于其中
+      STATIC_ROOT: path.join(__dirname, 'dist')
     },
     error_file: './logs/pm2-error.log',
     out_file: './logs/pm2-out.log',
@@ -2,73 +2,66 @@
 # -*- coding: utf-8 -*-
 """
 修改任务模板页面
+分类按钮整块替换，分类键和显示名称一遍替换，按键统计替换次数
+
+用法:
+    python fix-task-templates.py
+    python fix-task-templates.py --pages task-templates.html templates.html --dry-run
 """
 
-import re
+import argparse
+import os
+from collections import Counter
+
+from page_tools.categories import BUTTONS_KEY, CATEGORY_MAP, CATEGORY_TARGETS, DISPLAY_NAMES, migrate_task_categories
+from page_tools.fileio import write_atomic
+from page_tools.index import select_pages
+
 
-# 读取文件
-with open('task-templates.html', 'r', encoding='utf-8') as f:
-    content = f.read()
+def pad(text, width):
+    """中文按两列宽补齐"""
+    return text + ' ' * (width - sum(2 if ord(ch) > 0x2e7f else 1 for ch in text))
 
-# 1. 替换分类按钮
-old_categories = r'''<button onclick="filterCategory\('hydration'\)".*?补水保湿.*?</button>
-\s*<button onclick="filterCategory\('whitening'\)".*?美白亮肤.*?</button>
-\s*<button onclick="filterCategory\('anti_aging'\)".*?抗衰老.*?</button>
-\s*<button onclick="filterCategory\('repair'\)".*?修复护理.*?</button>
-\s*<button onclick="filterCategory\('hair_care'\)".*?头发护理.*?</button>'''
 
-new_categories = '''<button onclick="filterCategory('customer_follow_up')" id="filter-customer_follow_up" class="category-filter-btn px-4 py-2 text-sm font-medium rounded-lg transition-colors whitespace-nowrap text-gray-600 hover:bg-gray-100">
-                        客户跟进
-                    </button>
-                    <button onclick="filterCategory('service_process')" id="filter-service_process" class="category-filter-btn px-4 py-2 text-sm font-medium rounded-lg transition-colors whitespace-nowrap text-gray-600 hover:bg-gray-100">
-                        服务流程
-                    </button>
-                    <button onclick="filterCategory('quality_check')" id="filter-quality_check" class="category-filter-btn px-4 py-2 text-sm font-medium rounded-lg transition-colors whitespace-nowrap text-gray-600 hover:bg-gray-100">
-                        质量检查
-                    </button>
-                    <button onclick="filterCategory('inventory')" id="filter-inventory" class="category-filter-btn px-4 py-2 text-sm font-medium rounded-lg transition-colors whitespace-nowrap text-gray-600 hover:bg-gray-100">
-                        库存管理
-                    </button>
-                    <button onclick="filterCategory('training')" id="filter-training" class="category-filter-btn px-4 py-2 text-sm font-medium rounded-lg transition-colors whitespace-nowrap text-gray-600 hover:bg-gray-100">
-                        培训
-                    </button>'''
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='迁移任务模板页面的分类')
+    parser.add_argument('--pages', nargs='+', help='处理指定页面（默认为还带有旧分类按钮的页面）')
+    parser.add_argument('--dry-run', action='store_true', help='只统计替换次数，不写回文件')
+    args = parser.parse_args()
 
-content = re.sub(old_categories, new_categories, content, flags=re.DOTALL)
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    pages = args.pages or select_pages(base_dir, CATEGORY_TARGETS, save=not args.dry_run)
+    if not pages:
+        print("[SKIP] 没有需要迁移分类的页面")
+        return
 
-# 2. 替换分类标签的CSS类名和显示逻辑
-# 将getCategoryBadge函数中的分类替换
-category_map = {
-    'hydration': 'customer_follow_up',
-    'whitening': 'service_process',
-    'anti_aging': 'quality_check',
-    'repair': 'inventory',
-    'hair_care': 'training',
-}
+    totals = Counter()
+    for page in pages:
+        file_path = os.path.join(base_dir, page)
+        if not os.path.exists(file_path):
+            print(f"[WARN] {page} - 文件不存在")
+            continue
 
-for old, new in category_map.items():
-    content = content.replace(f"'{old}'", f"'{new}'")
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
 
-# 3. 替换分类显示名称
-display_names = {
-    '补水保湿': '客户跟进',
-    '美白亮肤': '服务流程',
-    '抗衰老': '质量检查',
-    '修复护理': '库存管理',
-    '头发护理': '培训',
-}
+        # 替换分类按钮、分类键和显示名称
+        new_content, counts = migrate_task_categories(content)
+        totals.update(counts)
+        if new_content == content:
+            print(f"[SKIP] {page} - 无需修改")
+            continue
 
-for old, new in display_names.items():
-    content = content.replace(old, new)
+        if not args.dry_run:
+            write_atomic(file_path, new_content)
+        print(f"[OK] {page} - 替换 {sum(counts.values())} 处")
 
-# 4. 将"其他任务模板"替换为"其他"
-content = content.replace('其他任务模板', '其他')
+    print("=" * 60)
+    print("替换次数:")
+    for key in [BUTTONS_KEY, *CATEGORY_MAP, *DISPLAY_NAMES]:
+        print(f"  {pad(key, 20)}{totals[key]:>6}")
 
-# 保存文件
-with open('task-templates.html', 'w', encoding='utf-8') as f:
-    f.write(content)
 
-print("[OK] 任务模板页面修改完成!")
-print("已替换:")
-print("- 分类筛选按钮")
-print("- 分类显示名称")
-print("- 分类相关逻辑")
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面体积分析
+把每个页面分为内联脚本、内联样式、侧边栏、注释、空白和其余标记，统计与其它页面重复的字节，
+并按 page-budgets.json 中的预算检查，有页面超出预算时返回非零退出码。
+
+用法:
+    python page-weight.py
+    python page-weight.py --sort script --pages customer-detail.html settings.html
+    python page-weight.py --budgets my-budgets.json --json page-weight.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from page_tools.index import PageQuery, load_index
+from page_tools.weight import BUDGET_KEYS, CATEGORIES, analyze_pages, check_budgets, load_budgets
+
+BUDGET_FILE = 'page-budgets.json'
+
+
+def format_kb(size):
+    return f'{size / 1024:.1f}'
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='页面体积分析与预算检查')
+    parser.add_argument('--pages', nargs='+', help='只分析指定页面（默认所有页面；重复字节始终与全部页面比较）')
+    parser.add_argument('--sort', choices=BUDGET_KEYS, default='total', help='排序依据（默认 total）')
+    parser.add_argument('--budgets', help=f'预算配置文件（默认 {BUDGET_FILE}）')
+    parser.add_argument('--no-budgets', action='store_true', help='只输出分析结果，不检查预算')
+    parser.add_argument('--json', metavar='FILE', help='把分析结果写入 JSON 文件')
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    names = load_index(base_dir).select(PageQuery())
+    pages = {}
+    for name in names:
+        with open(os.path.join(base_dir, name), 'rb') as f:
+            pages[name] = f.read()
+
+    unknown = [name for name in args.pages or () if name not in pages]
+    if unknown:
+        print(f"[ERROR] 找不到页面: {', '.join(unknown)}")
+        return 1
+
+    results = analyze_pages(pages)
+    if args.pages:
+        results = [item for item in results if item.page in args.pages]
+
+    def sort_key(item):
+        return {'total': item.total, 'duplicate': item.duplicate}.get(args.sort, item.categories.get(args.sort))
+
+    results.sort(key=sort_key, reverse=True)
+
+    print('=' * 100)
+    print('页面体积（KB），重复为与其它页面相同的行')
+    print('=' * 100)
+    header = f"{'页面':<34}{'合计':>6}" + ''.join(f'{name:>11}' for name in CATEGORIES) + f"{'重复':>7}"
+    print(header)
+    for item in results:
+        print(f'{item.page:<36}{format_kb(item.total):>8}'
+              + ''.join(f'{format_kb(item.categories[name]):>11}' for name in CATEGORIES)
+              + f'{format_kb(item.duplicate):>9}')
+    total = sum(item.total for item in results)
+    print('-' * 100)
+    print(f"{'合计':<34}{format_kb(total):>8}"
+          + ''.join(f'{format_kb(sum(item.categories[name] for item in results)):>11}' for name in CATEGORIES)
+          + f'{format_kb(sum(item.duplicate for item in results)):>9}')
+    print()
+    print('重复字节按分类: ' + '，'.join(
+        f'{name} {format_kb(sum(item.duplicate_by[name] for item in results))} KB' for name in CATEGORIES))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([item._asdict() for item in results], f, ensure_ascii=False, indent=2)
+        print(f'[OK] 结果已保存到 {args.json}')
+
+    if args.no_budgets:
+        return 0
+    budget_file = args.budgets or os.path.join(base_dir, BUDGET_FILE)
+    if not os.path.exists(budget_file):
+        if args.budgets:
+            print(f'[ERROR] 预算配置不存在: {budget_file}')
+            return 1
+        print(f'[SKIP] 没有预算配置 {BUDGET_FILE}，不检查预算')
+        return 0
+    try:
+        default, page_budgets = load_budgets(budget_file)
+    except ValueError as e:
+        print(f'[ERROR] {e}')
+        return 1
+
+    violations = check_budgets(results, default, page_budgets)
+    print()
+    for item in violations:
+        print(f'[ERROR] {item.page} 的 {item.key} 为 {format_kb(item.actual)} KB，超出预算 {format_kb(item.budget)} KB')
+    if violations:
+        print(f'[ERROR] {len({item.page for item in violations})} 个页面超出预算')
+        return 1
+    print(f'[OK] {len(results)} 个页面都在预算之内')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+页面批量改写工具
+各个 update-*.py / fix-*.py 脚本共用的侧边栏渲染、页面变换和改写引擎
+"""
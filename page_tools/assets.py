@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+静态资源引用图
+一次遍历所有页面和 js/、css/ 下的文件，解析其中的 href/src/import/url() 引用，建立文件之间的依赖图。
+依赖图保存在 .asset-graph.json，与页面索引一样按文件大小和修改时间判断是否失效，只重新解析有变化的文件。
+
+由依赖图得出:
+    missing      引用的本地文件不存在（每次访问都多一次 404）
+    orphans      js/、css/ 中没有任何页面直接或间接加载的文件
+    duplicates   同一个页面多次加载同一个文件（如 js/api.js 和 /js/api.js）
+    weights      每个页面传递加载的本地文件字节数，分为页面加载时就请求的和按需加载的
+
+引用的种类:
+    script  <script src>、脚本中的 xxx.src = '...'        style   <link rel="stylesheet">、CSS 的 @import
+    import  ES 模块的 import                               asset   图片、图标、CSS 的 url() 等其它资源
+    frame   <iframe src>                                   link    <a href>、location.href = '...' 等页面跳转
+link 只检查目标是否存在，不算作加载。脚本中的模板字符串 `js/modules/${name}.js` 记为通配引用 js/modules/*.js，
+匹配的文件都算作按需加载（如 module-loader.js 动态加载的模块）。
+"""
+
+import bisect
+import json
+import os
+import posixpath
+import re
+from collections import namedtuple
+
+from page_tools.build import ASSET_DIRS, ASSET_FILES
+from page_tools.fileio import write_atomic
+from page_tools.scanner import ATTRS, parse_attrs
+
+GRAPH_NAME = '.asset-graph.json'
+GRAPH_VERSION = 1
+
+LOAD_KINDS = frozenset({'script', 'style', 'import', 'asset', 'frame'})
+
+# 注释整体跳过；<script>/<style> 取出内容另行解析；其余只看会引用文件的标签
+HTML_TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->'
+    rf'|<(?P<raw>script|style)\b(?P<raw_attrs>{ATTRS})>(?P<body>.*?)</(?P=raw)\s*>'
+    rf'|<(?P<name>a|area|link|img|source|iframe|embed|video|audio|track)\b(?P<attrs>{ATTRS})/?>',
+    re.S | re.I)
+
+# 标签名 -> (引用属性, 种类)
+TAG_REFERENCES = {
+    'a': ('href', 'link'),
+    'area': ('href', 'link'),
+    'link': ('href', 'asset'),
+    'img': ('src', 'asset'),
+    'source': ('src', 'asset'),
+    'iframe': ('src', 'frame'),
+    'embed': ('src', 'asset'),
+    'video': ('src', 'asset'),
+    'audio': ('src', 'asset'),
+    'track': ('src', 'asset'),
+}
+
+# 脚本中的引用: (正则, 种类, 是否相对脚本文件解析)
+# 经典脚本中的路径相对于加载它的页面（页面都在根目录），只有 ES 模块的 import 相对于模块文件本身
+JS_PATTERNS = (
+    (re.compile(r'''\bimport\s*(?:[\w*$\s{},]+?\s*from\s*)?(["'])([^"'\n]+)\1'''), 'import', True),
+    (re.compile(r'''\bimport\s*\(\s*(["'`])([^"'`\n]+)\1\s*\)'''), 'import', True),
+    (re.compile(r'''\.src\s*=\s*(["'`])([^"'`\n]+)\1'''), 'script', False),
+    (re.compile(r'''\blocation(?:\.href)?\s*=\s*(["'`])([^"'`\n]+)\1'''), 'link', False),
+    (re.compile(r'''<script\b[^<>]*?\bsrc\s*=\s*(["'])([^"'\n]+)\1'''), 'script', False),
+    (re.compile(r'''<a\b[^<>]*?\bhref\s*=\s*(["'])([^"'\n]+)\1'''), 'link', False),
+)
+
+CSS_PATTERNS = (
+    (re.compile(r'''@import\s+(?:url\(\s*)?(["'])([^"']+)\1'''), 'style'),
+    (re.compile(r'''url\(\s*(["']?)([^"')\s]+)\1\s*\)'''), 'asset'),
+)
+
+SCHEME_PATTERN = re.compile(r'^[A-Za-z][\w+.-]*:')
+TEMPLATE_PATTERN = re.compile(r'\$\{[^}]*\}')
+
+# source: 引用所在文件；target: 解析后的相对路径（/ 分隔，通配引用含 *）；line: 行号
+Reference = namedtuple('Reference', ['source', 'target', 'kind', 'line'])
+
+# own: 页面本身字节数；static: 页面加载时请求的本地文件；dynamic: 只按需加载的本地文件
+PageWeight = namedtuple('PageWeight', ['page', 'own', 'static', 'dynamic', 'static_bytes', 'dynamic_bytes'])
+
+Duplicate = namedtuple('Duplicate', ['page', 'target', 'lines'])
+
+
+def reference_path(value):
+    """
+    引用值中的本地路径（去掉 ?查询 和 #片段，模板占位符 ${...} 换成 *）
+    外部地址、锚点、data:/javascript: 等以及以占位符开头的（无法确定目录）返回 None
+    """
+    value = TEMPLATE_PATTERN.sub('*', value.strip())
+    if not value or value.startswith(('#', '//', '*')) or SCHEME_PATTERN.match(value):
+        return None
+    path = re.split(r'[?#]', value, 1)[0]
+    return path or None
+
+
+def resolve(base, path):
+    """相对 base 文件解析路径，/ 开头的从根目录算起"""
+    joined = path.lstrip('/') if path.startswith('/') else posixpath.join(posixpath.dirname(base), path)
+    return posixpath.normpath(joined)
+
+
+class _LineIndex:
+    """偏移 -> 行号"""
+
+    def __init__(self, text):
+        self.newlines = [m.start() for m in re.finditer('\n', text)]
+
+    def line(self, offset):
+        return bisect.bisect_right(self.newlines, offset - 1) + 1
+
+
+def _add(refs, base, value, kind, line):
+    path = reference_path(value)
+    if path is not None:
+        refs.append([resolve(base, path), kind, line])
+
+
+def scan_script(relpath, text, lines, offset=0):
+    """脚本中的引用；offset 为脚本在页面中的起始位置"""
+    refs = []
+    for pattern, kind, module_relative in JS_PATTERNS:
+        for match in pattern.finditer(text):
+            _add(refs, relpath if module_relative else '', match.group(2), kind, lines.line(offset + match.start()))
+    return refs
+
+
+def scan_css(relpath, text, lines, offset=0):
+    """样式表中的引用，相对于样式表文件解析（内联样式相对于页面）"""
+    refs = []
+    for pattern, kind in CSS_PATTERNS:
+        for match in pattern.finditer(text):
+            _add(refs, relpath, match.group(2), kind, lines.line(offset + match.start()))
+    return refs
+
+
+def scan_html(relpath, text, lines):
+    refs = []
+    for match in HTML_TOKEN_PATTERN.finditer(text):
+        raw = match.group('raw')
+        if raw:
+            raw = raw.lower()
+            attrs = parse_attrs(match.group('raw_attrs'))
+            if raw == 'script':
+                if 'src' in attrs:
+                    _add(refs, relpath, attrs['src'], 'script', lines.line(match.start()))
+                refs.extend(scan_script(relpath, match.group('body'), lines, match.start('body')))
+            else:
+                refs.extend(scan_css(relpath, match.group('body'), lines, match.start('body')))
+            continue
+
+        name = match.group('name')
+        if name is None:
+            continue
+        name = name.lower()
+        attrs = parse_attrs(match.group('attrs'))
+        attr, kind = TAG_REFERENCES[name]
+        if attr not in attrs:
+            continue
+        if name == 'link':
+            rel = attrs.get('rel', '').lower().split()
+            if 'stylesheet' in rel:
+                kind = 'style'
+            elif 'modulepreload' in rel or attrs.get('as') == 'script':
+                kind = 'script'
+        _add(refs, relpath, attrs[attr], kind, lines.line(match.start()))
+    return refs
+
+
+def scan_file(base_dir, relpath, st=None):
+    """解析单个文件，返回图中的记录"""
+    path = os.path.join(base_dir, relpath)
+    st = st or os.stat(path)
+    entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'refs': []}
+    scanners = {'.html': scan_html, '.js': scan_script, '.css': scan_css}
+    scanner = scanners.get(os.path.splitext(relpath)[1].lower())
+    if scanner:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        entry['refs'] = scanner(relpath, text, _LineIndex(text))
+    return entry
+
+
+def _pattern_regex(target):
+    return re.compile('[^/]*'.join(re.escape(part) for part in target.split('*')) + '$')
+
+
+class AssetGraph:
+    """页面和静态资源之间的引用图"""
+
+    def __init__(self, base_dir, directories=ASSET_DIRS, files=ASSET_FILES):
+        self.base_dir = base_dir
+        self.directories = directories
+        self.files = files
+        self.entries = {}
+        self.scanned = []
+        self.dirty = False
+        self._matches = {}
+
+    @property
+    def path(self):
+        return os.path.join(self.base_dir, GRAPH_NAME)
+
+    def load(self):
+        """读取已保存的引用图，文件不存在、损坏或版本不符时从空图开始"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get('version') == GRAPH_VERSION:
+            self.entries = data.get('files', {})
+        return self
+
+    def _iter_files(self):
+        """(相对路径, stat) ：根目录下的页面和附加文件，以及资源目录下的所有文件"""
+        with os.scandir(self.base_dir) as it:
+            for item in it:
+                if item.is_file() and (item.name.endswith('.html') or item.name in self.files):
+                    yield item.name, item.stat()
+        for directory in self.directories:
+            for root, dirs, names in os.walk(os.path.join(self.base_dir, directory)):
+                dirs.sort()
+                for name in names:
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, self.base_dir).replace(os.sep, '/'), os.stat(path)
+
+    def refresh(self):
+        """
+        遍历一次文件：大小和修改时间没变的沿用旧记录，其余重新解析，已删除的移出
+        重新解析的文件记录在 self.scanned
+        """
+        entries = {}
+        self.scanned = []
+        for relpath, st in self._iter_files():
+            entry = self.entries.get(relpath)
+            if not entry or entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+                entry = scan_file(self.base_dir, relpath, st)
+                self.scanned.append(relpath)
+            entries[relpath] = entry
+        self.dirty = self.dirty or bool(self.scanned) or entries.keys() != self.entries.keys()
+        self.entries = dict(sorted(entries.items()))
+        self._matches = {}
+        return self
+
+    def save(self):
+        if self.dirty:
+            data = {'version': GRAPH_VERSION, 'files': self.entries}
+            write_atomic(self.path, json.dumps(data, ensure_ascii=False, indent=1))
+            self.dirty = False
+        return self
+
+    @property
+    def pages(self):
+        return [relpath for relpath in self.entries if relpath.endswith('.html') and '/' not in relpath]
+
+    def references(self, source=None):
+        """所有引用（或某个文件中的引用），按文件和出现顺序"""
+        sources = [source] if source is not None else list(self.entries)
+        for relpath in sources:
+            for target, kind, line in self.entries.get(relpath, {}).get('refs', []):
+                yield Reference(relpath, target, kind, line)
+
+    def targets(self, target):
+        """引用实际指向的文件：普通引用为自身（不存在时为空），通配引用为匹配的所有文件"""
+        if '*' not in target:
+            return [target] if self.exists(target) else []
+        if target not in self._matches:
+            regex = _pattern_regex(target)
+            self._matches[target] = [relpath for relpath in self.entries if regex.match(relpath)]
+        return self._matches[target]
+
+    def exists(self, target):
+        return target in self.entries or os.path.isfile(os.path.join(self.base_dir, target))
+
+    def size(self, target):
+        entry = self.entries.get(target)
+        if entry:
+            return entry['size']
+        try:
+            return os.path.getsize(os.path.join(self.base_dir, target))
+        except OSError:
+            return 0
+
+    def missing(self):
+        """指向不存在文件的引用（通配引用没有匹配任何文件时也算）"""
+        return [ref for ref in self.references() if not self.targets(ref.target)]
+
+    def closure(self, page):
+        """
+        页面传递加载的本地文件，返回 (加载时请求的文件, 只按需加载的文件)
+        按需加载指只能经过通配引用（动态拼出的路径）到达
+        """
+        def walk(start, dynamic):
+            seen = set()
+            stack = [start]
+            while stack:
+                for ref in self.references(stack.pop()):
+                    if ref.kind not in LOAD_KINDS or ('*' in ref.target and not dynamic):
+                        continue
+                    for target in self.targets(ref.target):
+                        if target not in seen and target != start:
+                            seen.add(target)
+                            stack.append(target)
+            return seen
+
+        static = walk(page, False)
+        return static, walk(page, True) - static
+
+    def weights(self, pages=None):
+        """各页面的传递加载字节数"""
+        result = []
+        for page in pages or self.pages:
+            static, dynamic = self.closure(page)
+            result.append(PageWeight(page, self.size(page), sorted(static), sorted(dynamic),
+                                     sum(self.size(t) for t in static), sum(self.size(t) for t in dynamic)))
+        return result
+
+    def orphans(self):
+        """资源目录中没有任何页面加载的文件"""
+        reached = set()
+        for page in self.pages:
+            static, dynamic = self.closure(page)
+            reached.update(static, dynamic)
+        return [relpath for relpath in self.entries
+                if '/' in relpath and relpath.split('/', 1)[0] in self.directories and relpath not in reached]
+
+    def duplicates(self):
+        """同一页面中多次加载同一文件的引用"""
+        result = []
+        for page in self.pages:
+            lines = {}
+            for ref in self.references(page):
+                if ref.kind in LOAD_KINDS and '*' not in ref.target:
+                    lines.setdefault(ref.target, []).append(ref.line)
+            result.extend(Duplicate(page, target, found) for target, found in lines.items() if len(found) > 1)
+        return result
+
+
+def load_graph(base_dir, save=True):
+    """读取并刷新目录的资源引用图，有变化时写回；save=False 时只在内存中刷新（构建等不能写源目录的场合）"""
+    graph = AssetGraph(base_dir).load().refresh()
+    return graph.save() if save else graph
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+页面改写基准测试
+生成与真实页面结构相同的合成页面（几种侧边栏变体、不同大小、缺少标记的页面），
+对每个变换分别统计 读取 / 匹配 / 渲染 / 写入 四个阶段的耗时。
+
+变换与脚本的对应关系:
+    sidebar     update-sidebars-unified.py 的 update_page_sidebar（mmap 定位 + 流式拼接写入）
+    template    update-all-sidebars.py 的 update_sidebar（apply_template_menu）
+    org-order   update-sidebar-order.py 的 update_sidebar_order（move_organizations_last）
+"""
+
+import contextlib
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+
+from page_tools.fileio import commit_temp, iter_splice, open_mmap, write_atomic, write_temp
+from page_tools.sections import OLD_SYSTEM_SECTION, apply_template_menu, move_organizations_last
+from page_tools.sidebar import SIDEBAR_PAGES, get_sidebar_template
+from page_tools.spans import locate_sidebar, section_block, splice
+
+PHASES = ('read', 'match', 'render', 'write')
+
+# 侧边栏变体
+#   standard     标准侧边栏
+#   legacy       系统管理分组是旧顺序（组织管理在前），update_sidebar_order 会命中
+#   no-overlay   缺少遮罩层注释，整块替换找不到区段
+#   no-sidebar   没有 <aside id="sidebar">
+VARIANTS = ('standard', 'legacy', 'no-overlay', 'no-sidebar')
+
+# 页面大小（字节），245 KB 对应 customer-detail.html
+DEFAULT_SIZES = (5 * 1024, 20 * 1024, 64 * 1024, 245 * 1024, 1024 * 1024)
+
+PAGE_HEAD = '''<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - 美业客户管理系统</title>
+    <script src="https://cdn.tailwindcss.com"></script>
+    <link rel="stylesheet" href="css/styles.css">
+</head>
+<body class="bg-gray-50">
+    <div class="flex h-screen">
+'''
+
+PAGE_TAIL = '''
+    </div>
+    <script src="js/utils.js"></script>
+    <script src="js/api.js"></script>
+</body>
+</html>
+'''
+
+# 主内容区的填充片段：嵌套 div、表格行和内联脚本，与真实页面的标记密度接近
+FILLER_CARD = '''            <!-- 卡片 {n} -->
+            <div class="bg-white rounded-lg shadow-sm p-6">
+                <div class="flex items-center justify-between mb-4">
+                    <h3 class="text-lg font-semibold text-gray-900">{title}</h3>
+                    <button class="px-3 py-1 text-sm text-purple-600 hover:bg-purple-50 rounded" onclick="openModal('{key}')">编辑</button>
+                </div>
+                <table class="min-w-full divide-y divide-gray-200">
+                    <tbody class="bg-white divide-y divide-gray-200">
+{rows}
+                    </tbody>
+                </table>
+            </div>
+'''
+
+FILLER_ROW = '''                        <tr class="hover:bg-gray-50">
+                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-900">{name}</td>
+                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">{value}</td>
+                            <td class="px-6 py-4 whitespace-nowrap"><span class="px-2 py-1 text-xs rounded-full bg-green-100 text-green-800">{status}</span></td>
+                        </tr>'''
+
+FILLER_SCRIPT = '''    <script>
+        function loadSection{n}() {{
+            const data = window.__cache['{key}'] || [];
+            return data.filter(item => item.status === '{status}').map(item => `<div class="p-2">${{item.name}}</div>`).join('');
+        }}
+    </script>
+'''
+
+NAMES = ('张女士', '李先生', '王女士', '赵女士', '陈先生', '刘女士', '杨女士', '黄先生')
+STATUSES = ('已完成', '跟进中', '待处理', '已取消')
+
+
+def render_variant(variant, active_page):
+    """渲染指定变体的侧边栏区段；no-sidebar 返回空串"""
+    sidebar = get_sidebar_template(active_page)
+    if variant == 'legacy':
+        layout = locate_sidebar(sidebar)
+        return splice(sidebar, section_block(sidebar, layout.sections['系统管理']), OLD_SYSTEM_SECTION)
+    if variant == 'no-overlay':
+        return sidebar.replace('<!-- 遮罩层 (移动端) -->', '')
+    if variant == 'no-sidebar':
+        return ''
+    return sidebar
+
+
+def make_page(size, variant, active_page, rng):
+    """生成大约 size 字节（UTF-8）的合成页面"""
+    head = PAGE_HEAD.format(title=active_page) + render_variant(variant, active_page) + '\n\n        <main class="flex-1 overflow-y-auto p-6 space-y-6">\n'
+    parts = [head]
+    total = len(head.encode('utf-8')) + len(PAGE_TAIL)
+    n = 0
+    while total < size:
+        n += 1
+        key = f'{active_page}-{n}'
+        status = rng.choice(STATUSES)
+        rows = '\n'.join(
+            FILLER_ROW.format(name=rng.choice(NAMES), value=rng.randint(1, 99999), status=rng.choice(STATUSES))
+            for _ in range(rng.randint(2, 6))
+        )
+        chunk = FILLER_CARD.format(n=n, title=f'数据分组 {n}', key=key, rows=rows)
+        if n % 4 == 0:
+            chunk += FILLER_SCRIPT.format(n=n, key=key, status=status)
+        parts.append(chunk)
+        total += len(chunk.encode('utf-8'))
+    parts.append('        </main>' + PAGE_TAIL)
+    return ''.join(parts)
+
+
+def generate_corpus(out_dir, sizes=DEFAULT_SIZES, variants=VARIANTS, pages=12, seed=0):
+    """
+    生成合成页面集合
+    返回 {(size, variant): [文件路径, ...]}
+    """
+    rng = random.Random(seed)
+    active_pages = list(SIDEBAR_PAGES.values())
+    corpus = {}
+    for size in sizes:
+        for variant in variants:
+            directory = os.path.join(out_dir, f'{size}-{variant}')
+            os.makedirs(directory, exist_ok=True)
+            paths = []
+            for index in range(pages):
+                active_page = active_pages[index % len(active_pages)]
+                path = os.path.join(directory, f'page-{index:04d}-{active_page}.html')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(make_page(size, variant, active_page, rng))
+                paths.append((path, active_page))
+            corpus[(size, variant)] = paths
+    return corpus
+
+
+class PhaseTimer:
+    """累计各阶段耗时（秒）"""
+
+    def __init__(self):
+        self.totals = dict.fromkeys(PHASES, 0.0)
+
+    @contextlib.contextmanager
+    def __call__(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[phase] += time.perf_counter() - start
+
+
+# 每个变换: func(源文件, 输出文件, 激活菜单, timer) -> 是否命中
+# 输入页面保持不变，结果写到输出文件，重复测量时每轮的输入相同
+
+def bench_sidebar(path, out_path, active_page, timer):
+    with contextlib.ExitStack() as stack:
+        with timer('read'):
+            buffer = stack.enter_context(open_mmap(path))
+        with timer('match'):
+            layout = locate_sidebar(buffer)
+        if layout is None or layout.block is None:
+            return False
+        with timer('render'):
+            replacement = get_sidebar_template(active_page).encode('utf-8')
+        with timer('write'):
+            temp_path, _ = write_temp(out_path, iter_splice(buffer, layout.block, replacement))
+    with timer('write'):
+        commit_temp(temp_path, out_path)
+    return True
+
+
+def bench_template(path, out_path, active_page, timer):
+    with timer('read'):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    with timer('match'):
+        found = '<aside' in content and '系统管理' in content
+    if not found:
+        return False
+    # apply_template_menu 定位和拼接是一步完成的，整体计入渲染
+    with timer('render'):
+        new_content, matched = apply_template_menu(content)
+    if not matched:
+        return False
+    with timer('write'):
+        write_atomic(out_path, new_content)
+    return True
+
+
+def bench_org_order(path, out_path, active_page, timer):
+    with timer('read'):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    with timer('match'):
+        found = OLD_SYSTEM_SECTION in content
+    if not found:
+        return False
+    with timer('render'):
+        new_content, _ = move_organizations_last(content)
+    with timer('write'):
+        write_atomic(out_path, new_content)
+    return True
+
+
+BENCH_TRANSFORMS = {
+    'sidebar': bench_sidebar,
+    'template': bench_template,
+    'org-order': bench_org_order,
+}
+
+
+def run_case(func, paths, repeat):
+    """
+    对一组页面重复执行 repeat 轮
+    返回 {'hits', 'bytes', 'phases': {阶段: {'median_ms', 'min_ms'}}, 'total': {...}}，耗时为每轮处理全部页面的总和
+    """
+    rounds = []
+    hits = 0
+    for _ in range(repeat):
+        timer = PhaseTimer()
+        hits = sum(1 for path, active_page in paths if func(path, path + '.out', active_page, timer))
+        rounds.append(timer.totals)
+
+    def summary(values):
+        return {'median_ms': round(statistics.median(values) * 1000, 4), 'min_ms': round(min(values) * 1000, 4)}
+
+    return {
+        'hits': hits,
+        'bytes': sum(os.path.getsize(path) for path, _ in paths),
+        'phases': {phase: summary([r[phase] for r in rounds]) for phase in PHASES},
+        'total': summary([sum(r.values()) for r in rounds]),
+    }
+
+
+def environment_info(repo_dir):
+    """记录结果对应的提交和运行环境，便于跨提交比较"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=repo_dir,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare_results(old, new):
+    """
+    按 (变换, 大小, 变体, 页数) 对比两次结果的总耗时中位数
+    返回 [(key, 旧 ms, 新 ms, 新/旧)]
+    """
+    def index(data):
+        return {(r['transform'], r['size'], r['variant'], r['pages']): r['total']['median_ms'] for r in data['results']}
+
+    old_index = index(old)
+    rows = []
+    for key, new_ms in index(new).items():
+        if key in old_index:
+            old_ms = old_index[key]
+            rows.append((key, old_ms, new_ms, new_ms / old_ms if old_ms else float('inf')))
+    return rows
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+发布构建
+把源页面读入内存，按顺序执行已注册的构建阶段，结果写到单独的输出目录（默认 dist/）。
+源页面不做任何修改，各个改写脚本依赖的注释标记都还在；页面索引、资源引用图等缓存也不写回源目录。
+
+构建阶段与改写引擎的变换类似，用 @register_stage 注册，func(build) 直接修改 build 中的页面和附加文件，
+返回一行摘要（或 None），无法完成时抛出 BuildError。build 中有:
+    pages    文件名 -> 页面内容（str）
+    files    输出目录下的相对路径 -> 内容（str 或 bytes），由各阶段生成的附加文件
+    sources  文件名 -> 源页面字节数
+    jobs     可以并行的阶段使用的进程数
+注册时 output=True 的阶段在页面和附加文件写出之后执行，处理的是输出目录中的最终文件（如预压缩）。
+完整构建（不指定页面）写出后会删除输出目录中本次没有生成的文件，旧的哈希文件名资源不会堆积下来被部署。
+"""
+
+import os
+import shutil
+import time
+from collections import namedtuple
+
+from page_tools.fileio import commit_temp, write_atomic, write_temp
+from page_tools.index import PageQuery, load_index
+from page_tools.precompress import ENCODINGS
+
+DIST_DIR = 'dist'
+
+# 原样复制到输出目录的静态资源
+ASSET_DIRS = ('js', 'css')
+ASSET_FILES = ('favicon.ico',)
+
+# 已注册的构建阶段：名称 -> Stage
+STAGES = {}
+
+Stage = namedtuple('Stage', ['name', 'func', 'description', 'output'])
+
+
+class BuildError(Exception):
+    """构建阶段无法完成（如缺少依赖的文件），构建中止，输出目录中的页面不会被更新"""
+
+
+def register_stage(name, description='', output=False):
+    """注册一个构建阶段；output=True 表示在写出文件之后执行"""
+    def decorator(func):
+        STAGES[name] = Stage(name, func, description, output)
+        return func
+    return decorator
+
+
+def get_stages(names):
+    """按名称取出构建阶段，保持传入顺序"""
+    # 导入内置阶段，完成注册
+    from page_tools import stages  # noqa: F401
+
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        raise KeyError(f"未知的构建阶段: {', '.join(unknown)}")
+    return [STAGES[name] for name in names]
+
+
+class Build:
+    """一次构建的内存状态"""
+
+    def __init__(self, base_dir, out_dir, jobs=1):
+        self.base_dir = base_dir
+        self.out_dir = out_dir
+        self.jobs = jobs
+        self.pages = {}
+        self.files = {}
+        self.sources = {}
+
+    def load_pages(self, pages=None):
+        """读入源页面，默认为页面索引中除 _ 开头片段以外的所有页面"""
+        if pages is None:
+            pages = load_index(self.base_dir, save=False).select(PageQuery())
+        for filename in pages:
+            filepath = os.path.join(self.base_dir, filename)
+            with open(filepath, 'r', encoding='utf-8') as f:
+                self.pages[filename] = f.read()
+            self.sources[filename] = os.path.getsize(filepath)
+        return self
+
+    def output_size(self, filename):
+        return len(self.pages[filename].encode('utf-8'))
+
+
+def _same_file(src, dst):
+    try:
+        a, b = os.stat(src), os.stat(dst)
+    except OSError:
+        return False
+    return a.st_size == b.st_size and a.st_mtime_ns == b.st_mtime_ns
+
+
+def asset_sources(base_dir):
+    """原样复制到输出目录的静态资源（相对路径）"""
+    sources = [name for name in ASSET_FILES if os.path.isfile(os.path.join(base_dir, name))]
+    for directory in ASSET_DIRS:
+        for root, _, names in os.walk(os.path.join(base_dir, directory)):
+            sources.extend(os.path.relpath(os.path.join(root, name), base_dir) for name in names)
+    return sources
+
+
+def copy_assets(base_dir, out_dir):
+    """把静态资源复制到输出目录，大小和修改时间相同的文件跳过；返回复制的文件数"""
+    copied = 0
+    for relpath in asset_sources(base_dir):
+        src = os.path.join(base_dir, relpath)
+        dst = os.path.join(out_dir, relpath)
+        if _same_file(src, dst):
+            continue
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copy2(src, dst)
+        copied += 1
+    return copied
+
+
+def write_output(out_dir, relpath, content):
+    """写入输出文件，内容没变时不重写（保留修改时间，后续阶段可以据此跳过）；返回是否写入"""
+    path = os.path.join(out_dir, relpath)
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if isinstance(content, str):
+        write_atomic(path, content)
+    else:
+        temp_path, _ = write_temp(path, [data])
+        commit_temp(temp_path, path)
+    return True
+
+
+def prune_output(out_dir, keep):
+    """
+    删除输出目录中不在 keep（相对路径集合）里的文件，返回删除的数量
+    . 开头的缓存文件保留；原文件还在的预压缩副本留给 precompress 阶段处理
+    """
+    removed = 0
+    for root, _, names in os.walk(out_dir):
+        for name in names:
+            relpath = os.path.relpath(os.path.join(root, name), out_dir)
+            base, ext = os.path.splitext(relpath)
+            if name.startswith('.') or relpath in keep or (ext in ENCODINGS and base in keep):
+                continue
+            os.remove(os.path.join(root, name))
+            removed += 1
+    return removed
+
+
+def _run_stage(stage, build):
+    start = time.perf_counter()
+    summary = stage.func(build)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"[OK] {stage.name}: {summary or '完成'} ({elapsed:.1f} ms)")
+
+
+def run_build(base_dir, out_dir, stages, pages=None, jobs=1):
+    """
+    执行构建：读入页面 → 复制静态资源 → 依次执行各阶段 → 写出页面和附加文件 → 执行输出阶段
+    返回 Build
+    """
+    build = Build(base_dir, out_dir, jobs).load_pages(pages)
+    os.makedirs(out_dir, exist_ok=True)
+    copied = copy_assets(base_dir, out_dir)
+    print(f"[OK] 读入 {len(build.pages)} 个页面，复制静态资源 {copied} 个")
+
+    for stage in stages:
+        if not stage.output:
+            _run_stage(stage, build)
+
+    written = sum(write_output(out_dir, filename, content) for filename, content in build.pages.items())
+    written += sum(write_output(out_dir, relpath, content) for relpath, content in build.files.items())
+    print(f"[OK] 写出 {written} 个文件到 {out_dir}")
+
+    # 只构建部分页面时输出目录中还有其它页面，不做清理
+    if pages is None:
+        keep = {os.path.normpath(relpath) for relpath in [*build.pages, *build.files, *asset_sources(base_dir)]}
+        removed = prune_output(out_dir, keep)
+        if removed:
+            print(f"[OK] 删除输出目录中过期的文件 {removed} 个")
+
+    for stage in stages:
+        if stage.output:
+            _run_stage(stage, build)
+    return build
+
+
+def print_savings(build, limit=None):
+    """打印每个页面的源大小、输出大小和节省比例"""
+    rows = sorted(build.pages, key=lambda filename: build.sources[filename] - build.output_size(filename),
+                  reverse=True)
+    print()
+    print('=' * 60)
+    print('页面' + ' ' * 32 + '源字节    输出字节    节省')
+    for filename in rows[:limit]:
+        before = build.sources[filename]
+        after = build.output_size(filename)
+        saved = 100 * (before - after) / before if before else 0
+        print(f"{filename:<34}{before:>10}{after:>12}{saved:>7.1f}%")
+    total_before = sum(build.sources.values())
+    total_after = sum(build.output_size(filename) for filename in build.pages)
+    saved = 100 * (total_before - total_after) / total_before if total_before else 0
+    print('-' * 60)
+    print(f"{'合计':<32}{total_before:>10}{total_after:>12}{saved:>7.1f}%")
+    print('=' * 60)
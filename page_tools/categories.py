@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+任务模板分类迁移
+把美容护理类分类（补水保湿、美白亮肤…）迁移为门店运营类分类（客户跟进、服务流程…）
+分类按钮整块替换，分类键和显示名称由一个多模式替换器一遍完成（见 page_tools/remap.py）
+"""
+
+import re
+
+from page_tools.index import PageQuery
+from page_tools.remap import Remapper, RemapRule
+
+# 还带有旧分类按钮的任务模板页面（templates.html 的护理分类按钮与旧按钮相同，不能改）
+CATEGORY_TARGETS = PageQuery(marker='task-categories', pages=['task-templates.html'])
+
+# 分类筛选按钮
+OLD_CATEGORY_BUTTONS = r'''<button onclick="filterCategory\('hydration'\)".*?补水保湿.*?</button>
+\s*<button onclick="filterCategory\('whitening'\)".*?美白亮肤.*?</button>
+\s*<button onclick="filterCategory\('anti_aging'\)".*?抗衰老.*?</button>
+\s*<button onclick="filterCategory\('repair'\)".*?修复护理.*?</button>
+\s*<button onclick="filterCategory\('hair_care'\)".*?头发护理.*?</button>'''
+
+NEW_CATEGORY_BUTTONS = '''<button onclick="filterCategory('customer_follow_up')" id="filter-customer_follow_up" class="category-filter-btn px-4 py-2 text-sm font-medium rounded-lg transition-colors whitespace-nowrap text-gray-600 hover:bg-gray-100">
+                        客户跟进
+                    </button>
+                    <button onclick="filterCategory('service_process')" id="filter-service_process" class="category-filter-btn px-4 py-2 text-sm font-medium rounded-lg transition-colors whitespace-nowrap text-gray-600 hover:bg-gray-100">
+                        服务流程
+                    </button>
+                    <button onclick="filterCategory('quality_check')" id="filter-quality_check" class="category-filter-btn px-4 py-2 text-sm font-medium rounded-lg transition-colors whitespace-nowrap text-gray-600 hover:bg-gray-100">
+                        质量检查
+                    </button>
+                    <button onclick="filterCategory('inventory')" id="filter-inventory" class="category-filter-btn px-4 py-2 text-sm font-medium rounded-lg transition-colors whitespace-nowrap text-gray-600 hover:bg-gray-100">
+                        库存管理
+                    </button>
+                    <button onclick="filterCategory('training')" id="filter-training" class="category-filter-btn px-4 py-2 text-sm font-medium rounded-lg transition-colors whitespace-nowrap text-gray-600 hover:bg-gray-100">
+                        培训
+                    </button>'''
+
+# 分类键
+CATEGORY_MAP = {
+    'hydration': 'customer_follow_up',
+    'whitening': 'service_process',
+    'anti_aging': 'quality_check',
+    'repair': 'inventory',
+    'hair_care': 'training',
+}
+
+# 分类显示名称
+DISPLAY_NAMES = {
+    '补水保湿': '客户跟进',
+    '美白亮肤': '服务流程',
+    '抗衰老': '质量检查',
+    '修复护理': '库存管理',
+    '头发护理': '培训',
+    '其他任务模板': '其他',
+}
+
+# 分类键只替换整个字符串或属性值（'hydration'、value="hydration"），不动 filter-hydration 之类的标识；
+# 显示名称只替换文本、属性值和脚本字符串中的出现，不动注释
+CATEGORY_REMAP = Remapper([
+    RemapRule(CATEGORY_MAP, ('quoted', 'attribute'), whole=True),
+    RemapRule(DISPLAY_NAMES, ('text', 'attribute', 'quoted')),
+])
+
+# 分类按钮整块替换在统计中的名称
+BUTTONS_KEY = 'filter-buttons'
+
+
+def migrate_task_categories(content):
+    """迁移任务模板页面的分类按钮、分类键和显示名称，返回 (新内容, Counter{键: 替换次数})"""
+    content, buttons = re.subn(OLD_CATEGORY_BUTTONS, lambda m: NEW_CATEGORY_BUTTONS, content, flags=re.DOTALL)
+    content, counts = CATEGORY_REMAP.remap(content)
+    if buttons:
+        counts[BUTTONS_KEY] = buttons
+    return content, counts
+
+
+def remap_task_categories(content):
+    """迁移任务模板页面的分类按钮、分类键和显示名称"""
+    new_content, _ = migrate_task_categories(content)
+    return new_content, new_content != content
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+只读的侧边栏一致性检查
+用 mmap 打开页面，只定位并读取侧边栏区段，与期望的渲染结果比较指纹，不写任何文件
+比较时忽略每行首尾的空白和空行：标签之间的缩进不影响页面显示，只报告会改变页面的差异
+"""
+
+import os
+from collections import namedtuple
+
+from page_tools.fileio import find_sidebar_block, open_mmap
+from page_tools.manifest import content_hash
+
+# status: ok / drift / no-sidebar / missing / error
+CheckResult = namedtuple('CheckResult', ['filepath', 'status', 'detail'])
+
+ACTIVE_MARKER = 'text-blue-600 bg-blue-50'
+
+
+def read_sidebar_span(filepath, block=None):
+    """返回页面侧边栏区段的字节，找不到侧边栏时返回 None；block 为页面索引记录的偏移"""
+    with open_mmap(filepath) as buffer:
+        block = find_sidebar_block(buffer, block)
+        if block is None:
+            return None
+        # CRLF 换行的页面按 LF 比较
+        return buffer[block.start:block.end].replace(b'\r\n', b'\n')
+
+
+def normalize_markup(text):
+    """去掉每行首尾的空白和空行，用于忽略缩进差异的比较"""
+    return '\n'.join(line for line in (line.strip() for line in text.splitlines()) if line)
+
+
+def find_active_href(sidebar):
+    """侧边栏中高亮菜单项的链接，没有高亮项时返回 None"""
+    pos = sidebar.find(ACTIVE_MARKER)
+    if pos < 0:
+        return None
+    start = sidebar.rfind('href="', 0, pos)
+    if start < 0:
+        return None
+    start += len('href="')
+    return sidebar[start:sidebar.find('"', start)]
+
+
+def describe_drift(actual, expected):
+    """一行描述：第一处不同的行，以及实际/期望的高亮菜单"""
+    actual_lines = normalize_markup(actual).splitlines()
+    expected_lines = normalize_markup(expected).splitlines()
+    line = next(
+        (i for i, (a, b) in enumerate(zip(actual_lines, expected_lines)) if a != b),
+        min(len(actual_lines), len(expected_lines)),
+    )
+    detail = f"侧边栏第 {line + 1} 个非空行起不一致 ({len(actual_lines)} 行 / 期望 {len(expected_lines)} 行)"
+
+    actual_active = find_active_href(actual)
+    expected_active = find_active_href(expected)
+    if actual_active != expected_active:
+        detail += f"，高亮菜单 {actual_active or '无'} / 期望 {expected_active or '无'}"
+    return detail
+
+
+def check_page(filepath, expected, block=None):
+    """比较页面侧边栏与期望渲染结果的指纹"""
+    if not os.path.exists(filepath):
+        return CheckResult(filepath, 'missing', '文件不存在')
+
+    try:
+        span = read_sidebar_span(filepath, block)
+    except OSError as e:
+        return CheckResult(filepath, 'error', str(e))
+
+    if span is None:
+        return CheckResult(filepath, 'no-sidebar', '未找到侧边栏')
+
+    if content_hash(span) == content_hash(expected):
+        return CheckResult(filepath, 'ok', '')
+
+    actual = span.decode('utf-8', errors='replace')
+    if normalize_markup(actual) == normalize_markup(expected):
+        return CheckResult(filepath, 'ok', '')
+    return CheckResult(filepath, 'drift', describe_drift(actual, expected))
+
+
+def print_check_result(result):
+    tags = {'ok': '[OK]   ', 'drift': '[DRIFT]', 'no-sidebar': '[WARN] ', 'missing': '[WARN] ', 'error': '[ERROR]'}
+    line = f"{tags[result.status]} {result.filepath}"
+    if result.detail:
+        line += f" - {result.detail}"
+    print(line)
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+内联脚本和样式去重
+找出多个页面中相同（忽略缩进和行尾空白）的内联 <script> / <style> 块，以及内联脚本中相同的顶层函数声明，
+提取到按内容哈希命名的 js/shared.<哈希>.js、css/shared.<哈希>.css，页面改为引用外部文件，浏览器只需下载一次。
+
+为了不改变执行结果，只做以下几种提取:
+    整块相同的 <style>    原位置换成 <link rel="stylesheet">，层叠顺序不变
+    整块相同的 <script>   原位置换成 <script src>，执行时机不变
+    顶层函数声明          移到紧挨着原脚本块之前的 <script src> 中。函数声明本来就会提升到脚本开头，
+                          提前到上一个脚本中定义对本块没有影响，中间也没有其它脚本
+以下情况不提取:
+    - 带 id、nonce 等其它属性或非 JavaScript type 的脚本，带 type/media 以外属性的样式
+    - 以 "use strict" 开头的脚本（提取后严格模式会丢失）
+    - 页面中有同名 function / var / let / const / class 声明的函数（提取会改变覆盖顺序）
+    - 脚本无法完整扫描（括号不配对等）时整块跳过
+含跨行字符串或模板字符串的代码按原文比较，不忽略缩进。
+"""
+
+import hashlib
+import re
+from collections import namedtuple
+
+from page_tools.jslex import BRACKETS, JS_TYPES, is_template_part, iter_tokens
+from page_tools.scanner import ATTRS, parse_attrs
+from page_tools.spans import Span
+
+SHARED_SCRIPT_NAME = 'js/shared.{hash}.js'
+SHARED_STYLE_NAME = 'css/shared.{hash}.css'
+
+BLOCK_PATTERN = re.compile(
+    rf'<!--.*?-->|<(?P<kind>script|style)\b(?P<attrs>{ATTRS})>(?P<body>.*?)</(?P=kind)\s*>',
+    re.S | re.I,
+)
+
+# kind: script / style；outer: 整个元素；body: 元素内容；attrs: 属性字典；indent: 开始标签前的缩进
+InlineBlock = namedtuple('InlineBlock', ['kind', 'outer', 'body', 'attrs', 'indent'])
+
+# 顶层函数声明：start/end 为在脚本内容中的偏移，multiline 表示其中有跨行的字符串或模板字符串
+JsFunction = namedtuple('JsFunction', ['name', 'start', 'end', 'multiline'])
+JsScan = namedtuple('JsScan', ['functions', 'multiline'])
+
+# 每个页面的去重统计：整块提取的块数、提取的函数数、页面减少的字节数
+DedupeStats = namedtuple('DedupeStats', ['blocks', 'functions', 'removed'])
+
+DECLARATION_PATTERN = re.compile(r'\b(?:function\s*\*?|var|let|const|class)\s+([A-Za-z_$][\w$]*)')
+
+
+def iter_inline_blocks(content):
+    """页面中的内联 <script> / <style> 块（注释中的除外）"""
+    for match in BLOCK_PATTERN.finditer(content):
+        if not match.group('kind'):
+            continue
+        line_start = content.rfind('\n', 0, match.start()) + 1
+        indent = content[line_start:match.start()]
+        yield InlineBlock(
+            match.group('kind').lower(),
+            Span(match.start(), match.end()),
+            Span(match.start('body'), match.end('body')),
+            parse_attrs(match.group('attrs')),
+            '' if indent.strip() else indent,
+        )
+
+
+def block_eligible(block):
+    """块的属性是否允许提取"""
+    if block.kind == 'script':
+        return set(block.attrs) <= {'type'} and block.attrs.get('type', '').lower() in JS_TYPES
+    return set(block.attrs) <= {'type', 'media'} and block.attrs.get('type', 'text/css').lower() == 'text/css'
+
+
+class _PendingFunction:
+    """扫描中的函数声明：function [*] 名称 ( 参数 ) { 函数体 }"""
+
+    def __init__(self, start):
+        self.start = start
+        self.name = None
+        self.params = False
+        self.body = False
+        self.multiline = False
+
+
+def scan_js(source):
+    """
+    扫描脚本，找出顶层（不在任何括号内）的函数声明，返回 JsScan；括号不配对等无法扫描时返回 None
+    记号来自 jslex.iter_tokens，不做完整的语法分析
+    """
+    functions = []
+    multiline = False
+    depth = 0
+    prev = None
+    pending = None
+    async_start = None
+
+    def statement_start(token):
+        if prev is None or (prev.kind == 'punct' and prev.text in (';', '}')):
+            return True
+        # 换行处自动插入分号
+        return token.newline and (prev.kind != 'punct' or prev.text in (')', ']'))
+
+    try:
+        for token in iter_tokens(source):
+            kind, text = token.kind, token.text
+            if is_template_part(source, token, prev):
+                spans_lines = '\n' in source[token.start:token.end]
+                multiline = multiline or spans_lines
+                if pending and spans_lines:
+                    pending.multiline = True
+                if text == '${':
+                    depth += 1
+            elif kind == 'word':
+                if not depth:
+                    after_async = prev is not None and prev.kind == 'word' and prev.text == 'async'
+                    if text == 'function' and pending is None and (
+                            statement_start(token) or (after_async and async_start is not None)):
+                        pending = _PendingFunction(async_start if after_async else token.start)
+                    elif pending and pending.name is None:
+                        pending.name = text
+                    elif pending and not pending.body:
+                        pending = None
+                    async_start = token.start if text == 'async' and statement_start(token) else None
+            elif kind == 'punct' and text in BRACKETS:
+                if not depth and pending:
+                    if text == '{' and pending.params and not pending.body:
+                        pending.body = True
+                    elif not (text == '(' and pending.name and not pending.params):
+                        pending = None
+                depth += 1
+            elif kind == 'punct' and text in (')', ']', '}', '}$'):
+                depth -= 1
+                if not depth and pending:
+                    if text == ')':
+                        pending.params = True
+                    elif text == '}' and pending.body:
+                        functions.append(JsFunction(pending.name, pending.start, token.end, pending.multiline))
+                        pending = None
+            elif kind == 'punct' and not depth and pending and not pending.body \
+                    and not (text == '*' and pending.name is None):
+                pending = None
+            prev = token
+    except ValueError:
+        return None
+    return JsScan(functions, multiline)
+
+
+def normalize(text, raw=False):
+    """比较用的规范形式：去掉共同缩进、行尾空白和首尾空行；raw 为 True 时只去掉首尾空白"""
+    if raw:
+        return text.strip()
+    lines = [line.rstrip() for line in text.split('\n')]
+    indents = [len(line) - len(line.lstrip(' \t')) for line in lines if line]
+    common = min(indents, default=0)
+    return '\n'.join(line[common:] for line in lines).strip('\n')
+
+
+def _line_span(content, start, end):
+    """删除区间时连同所在行的缩进和换行一起删掉（行内没有其它内容时）"""
+    line_start = content.rfind('\n', 0, start) + 1
+    if content[line_start:start].strip():
+        line_start = start
+    line_end = content.find('\n', end)
+    line_end = len(content) if line_end < 0 else line_end + 1
+    if content[end:line_end].strip():
+        line_end = end
+    return Span(line_start, line_end)
+
+
+def _splice(content, edits):
+    """按 [(Span, 替换文本), ...] 改写内容，区间互不重叠"""
+    parts = []
+    pos = 0
+    for span, text in sorted(edits):
+        parts.append(content[pos:span.start])
+        parts.append(text)
+        pos = span.end
+    parts.append(content[pos:])
+    return ''.join(parts)
+
+
+def shared_name(pattern, text):
+    return pattern.format(hash=hashlib.sha256(text.encode('utf-8')).hexdigest()[:10])
+
+
+def declared_names(content, blocks):
+    """页面所有内联脚本中各名称的声明次数（字符串和注释中的也算，宁可少提取）"""
+    counts = {}
+    for block in blocks:
+        if block.kind == 'script':
+            for name in DECLARATION_PATTERN.findall(content, block.body.start, block.body.end):
+                counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+class Deduplicator:
+    """
+    收集所有页面的内联块，找出在两个以上页面中出现的部分，生成共享文件并改写页面
+    用法: pages, files, stats = Deduplicator(pages).run()
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.blocks = {}
+        # (类型, media, 规范形式) -> [(页面, 块序号), ...]
+        self.whole = {}
+        # 规范形式 -> [(页面, 块序号, JsFunction), ...]
+        self.functions = {}
+
+    def collect(self):
+        for filename, content in self.pages.items():
+            blocks = list(iter_inline_blocks(content))
+            self.blocks[filename] = blocks
+            names = declared_names(content, blocks)
+            for index, block in enumerate(blocks):
+                if not block_eligible(block):
+                    continue
+                body = content[block.body.start:block.body.end]
+                scan = None
+                if block.kind == 'script':
+                    scan = scan_js(body)
+                    if scan is None or body.lstrip().startswith(('"use strict"', "'use strict'")):
+                        continue
+                text = normalize(body, raw=bool(scan and scan.multiline))
+                if text:
+                    key = (block.kind, block.attrs.get('media', ''), text)
+                    self.whole.setdefault(key, []).append((filename, index))
+                for function in scan.functions if scan else ():
+                    if names.get(function.name) != 1:
+                        continue
+                    # 带上第一行的缩进，规范化时才能和后续行一起去掉
+                    line_start = body.rfind('\n', 0, function.start) + 1
+                    indent = body[line_start:function.start]
+                    text = ('' if indent.strip() else indent) + body[function.start:function.end]
+                    key = normalize(text, raw=function.multiline)
+                    self.functions.setdefault(key, []).append((filename, index, function))
+
+    def run(self):
+        """返回 (改写后的页面, 共享文件 {相对路径: 内容}, {页面: DedupeStats})"""
+        self.collect()
+        edits = {filename: [] for filename in self.pages}
+        files = {}
+        hoisted = set()
+        counts = {filename: [0, 0] for filename in self.pages}
+
+        # 整块相同的脚本和样式
+        for (kind, media, text), occurrences in self.whole.items():
+            if len({filename for filename, _ in occurrences}) < 2:
+                continue
+            name = shared_name(SHARED_SCRIPT_NAME if kind == 'script' else SHARED_STYLE_NAME, text)
+            files[name] = text + '\n'
+            if kind == 'script':
+                tag = f'<script src="{name}"></script>'
+            else:
+                media_attr = f' media="{media}"' if media else ''
+                tag = f'<link rel="stylesheet" href="{name}"{media_attr}>'
+            for filename, index in occurrences:
+                edits[filename].append((self.blocks[filename][index].outer, tag))
+                hoisted.add((filename, index))
+                counts[filename][0] += 1
+
+        # 顶层函数：出现位置（页面, 块）完全相同的函数放在同一个文件里，每个页面只会引入本来就有的函数
+        groups = {}
+        for key, occurrences in self.functions.items():
+            occurrences = [o for o in occurrences if (o[0], o[1]) not in hoisted]
+            pages = [filename for filename, _, _ in occurrences]
+            if len(set(pages)) < 2 or len(set(pages)) != len(pages):
+                continue
+            where = frozenset((filename, index) for filename, index, _ in occurrences)
+            groups.setdefault(where, []).append((key, occurrences))
+
+        block_edits = {}
+        for members in groups.values():
+            text = '\n\n'.join(key for key, _ in members) + '\n'
+            name = shared_name(SHARED_SCRIPT_NAME, text)
+            files[name] = text
+            for _, occurrences in members:
+                for filename, index, function in occurrences:
+                    names, spans = block_edits.setdefault((filename, index), ([], []))
+                    if name not in names:
+                        names.append(name)
+                    offset = self.blocks[filename][index].body.start
+                    spans.append(_line_span(self.pages[filename], offset + function.start, offset + function.end))
+                    counts[filename][1] += 1
+
+        # 共享脚本插在原脚本块之前；函数都移走后只剩空白的脚本块整个删掉
+        for (filename, index), (names, spans) in block_edits.items():
+            block = self.blocks[filename][index]
+            content = self.pages[filename]
+            tags = f'\n{block.indent}'.join(f'<script src="{name}"></script>' for name in names)
+            remaining = _splice(content[:block.body.end], [(span, '') for span in spans])[block.body.start:]
+            if remaining.strip():
+                edits[filename].extend((span, '') for span in spans)
+                edits[filename].append((Span(block.outer.start, block.outer.start), f'{tags}\n{block.indent}'))
+            else:
+                edits[filename].append((block.outer, tags))
+
+        pages = {}
+        stats = {}
+        for filename, content in self.pages.items():
+            pages[filename] = _splice(content, edits[filename]) if edits[filename] else content
+            removed = len(content.encode('utf-8')) - len(pages[filename].encode('utf-8'))
+            stats[filename] = DedupeStats(*counts[filename], removed)
+        return pages, files, stats
+
+
+def dedupe_pages(pages):
+    """对一组页面去重，返回 (改写后的页面, 共享文件, {页面: DedupeStats})"""
+    return Deduplicator(pages).run()
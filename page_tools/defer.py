@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+"""
+脚本加载顺序优化
+页面把 js/utils.js、js/db.js 等外部脚本按顺序写成阻塞的 <script src>，解析 HTML 时每遇到一个都要停下来下载、执行。
+这里按页面分析每个本地脚本在启动时是否真的需要同步执行，其余的改为 defer（无依赖的改为 async），
+并在 <head> 中为仍需同步执行的脚本加 <link rel="preload">，为 module-loader.js 启动时动态加载的模块加预加载提示。
+
+改为 defer 后脚本在 HTML 解析完、DOMContentLoaded 之前按原顺序执行，因此以下情况保持阻塞:
+    - 后面的内联脚本在解析阶段（顶层代码、顶层调用的函数、立即执行的回调）用到它声明的全局名称
+    - 后面的内联脚本重新声明了同名的全局名称（改为 defer 后覆盖顺序会反过来）
+    - 它和后面的内联脚本都注册了 DOMContentLoaded / load 回调（改为 defer 后回调顺序会反过来）
+    - 依赖执行时在文档中的位置（document.write、document.currentScript、insertAdjacentHTML('beforebegin'/'afterend')），
+      或开始标签带 data-sidebar-active（共享侧边栏的桩代码，在桩的位置插入侧边栏），或脚本无法完整扫描
+    - 保持阻塞的脚本在顶层依赖它，或与它存在上面两种顺序关系
+addEventListener / setTimeout 等的回调、赋值给变量或属性但没有立即调用的函数不算解析阶段。
+只在 DOMContentLoaded 之后使用的名称不影响结果。外部（CDN）脚本、已有 defer/async 和 type="module" 的脚本不改动。
+
+分析基于记号扫描，不做完整的语法分析；不确定时按需要同步执行处理。
+"""
+
+import functools
+import re
+from collections import namedtuple
+
+from page_tools.assets import reference_path, resolve
+from page_tools.dedupe import BLOCK_PATTERN
+from page_tools.jslex import JS_TYPES, WORD_PATTERN, iter_tokens
+from page_tools.scanner import parse_attrs
+
+# 回调不会在调用时立即执行的函数
+DEFERRED_CALLS = frozenset({
+    'addEventListener', 'setTimeout', 'setInterval', 'requestAnimationFrame', 'requestIdleCallback',
+})
+
+# 后面跟 ( 时不是函数调用的关键字
+NON_CALL_WORDS = frozenset({
+    'if', 'for', 'while', 'switch', 'catch', 'with', 'return', 'typeof', 'in', 'of', 'else', 'do', 'case', 'void',
+    'delete', 'await', 'yield', 'throw', 'instanceof', 'new',
+})
+
+JS_KEYWORDS = frozenset({
+    'async', 'await', 'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger', 'default', 'delete', 'do',
+    'else', 'export', 'extends', 'false', 'finally', 'for', 'function', 'if', 'import', 'in', 'instanceof', 'let',
+    'new', 'null', 'of', 'return', 'static', 'super', 'switch', 'this', 'throw', 'true', 'try', 'typeof',
+    'undefined', 'var', 'void', 'while', 'with', 'yield',
+})
+
+READY_PATTERN = re.compile(
+    r'''addEventListener\(\s*['"](?:DOMContentLoaded|load|readystatechange)['"]'''
+    r'''|\b(?:window|document)\.on(?:load|readystatechange)\s*=(?!=)''')
+# insertAdjacentHTML 只算插到元素前后（beforebegin/afterend）的用法，往列表里追加（beforeend）不依赖位置
+POSITIONAL_PATTERN = re.compile(
+    r'''\bdocument\.(?:write(?:ln)?\s*\(|currentScript\b)'''
+    r'''|\binsertAdjacent(?:HTML|Element|Text)\s*\(\s*['"](?:beforebegin|afterend)['"]''', re.I)
+
+# 带这些属性的脚本保持阻塞
+POSITIONAL_ATTRS = ('data-sidebar-active',)
+
+# module-loader.js 启动时加载的模块：TabManager 的默认 Tab（页面传入的 defaultTab，否则为构造函数中的默认值）
+# 对应 tabs 配置中的 module
+DEFAULT_TAB_PATTERNS = (
+    re.compile(r'''\bdefaultTab\s*:\s*['"]([\w-]+)['"]'''),
+    re.compile(r'''\.defaultTab\s*\|\|\s*['"]([\w-]+)['"]'''),
+)
+TAB_MODULE_PATTERN = r'''['"]?{tab}['"]?\s*:\s*\{{[^{{}}]*?\bmodule\s*:\s*['"]([\w-]+)['"]'''
+
+# declared: 声明的全局名称；immediate: 执行脚本时（解析阶段）用到的名称；lazy: 顶层声明 -> 其中用到的所有名称
+# names: 脚本中出现的所有名称；ready: 注册了 DOMContentLoaded/load 回调；
+# positional: 使用了 document.write / document.currentScript / 插到元素前后的 insertAdjacentHTML，依赖执行时在文档中的位置
+ScriptInfo = namedtuple('ScriptInfo', ['declared', 'immediate', 'lazy', 'names', 'ready', 'positional'])
+
+# 页面中的一个脚本：open_tag 为开始标签，src 为本地脚本解析后的路径（内联脚本和找不到的脚本为 None），
+# size 为本地脚本的字节数，info 为分析结果（无法分析时为 None），in_head 表示在 <head> 中
+PageScript = namedtuple('PageScript', ['open_tag', 'attrs', 'src', 'size', 'info', 'in_head'])
+
+# content: 改写后的页面（没有变化时为 None）；before/after: 改写前后阻塞加载的本地脚本字节数
+# modes: 各脚本的加载方式 blocking（保持阻塞）/ defer / async / keep（不改动）/ inline（内联脚本）
+# preload/prefetch: 加到 <head> 的提示
+DeferResult = namedtuple('DeferResult', ['content', 'before', 'after', 'modes', 'preload', 'prefetch'])
+
+class _Frame:
+    """
+    扫描中的函数体：collected 为其中用到的名称
+    mode: declaration（函数声明）/ deferred（回调稍后执行）/ argument（作为参数传给其它函数，可能立即执行）/
+          stored（赋值给变量或属性，调用时才执行）
+    """
+
+    def __init__(self, mode, depth, concise=False):
+        self.mode = mode
+        self.depth = depth
+        self.concise = concise
+        self.collected = set()
+
+
+INVOKED_PATTERN = re.compile(r'[ \t]*(?:\)[ \t]*)?[(.]')
+
+
+@functools.lru_cache(maxsize=256)
+def analyze_script(source):
+    """
+    分析脚本中的全局声明和解析阶段用到的名称，返回 ScriptInfo；无法扫描时返回 None
+    同一个外部脚本在多个页面中只分析一次，结果不要修改
+    """
+    declared = set()
+    immediate = set()
+    lazy = {}
+    names = set()
+
+    # 括号栈: [字符, 被调用的函数名]，调用括号为函数名（表达式调用为 ''），其它括号为 None
+    brackets = []
+    frames = []
+    last_paren = None
+    recent = [None, None, None]
+    statement = {'kind': None, 'names': [], 'idents': set()}
+
+    def end_statement():
+        for name in statement['names']:
+            lazy.setdefault(name, set()).update(statement['idents'])
+        statement.update(kind=None, names=[], idents=set())
+
+    def collector():
+        """当前位置用到的名称记录到哪里：函数体中记到函数，顶层的函数和类声明之外记为解析阶段"""
+        if frames:
+            return frames[-1].collected
+        return None if statement['kind'] in ('function', 'class') else immediate
+
+    def close_frame(invoked=False):
+        frame = frames.pop()
+        if frame.mode == 'declaration' or (frame.mode == 'deferred' and not invoked):
+            return
+        # 没有立即执行的函数只有嵌在其它函数中时才并入外层（外层执行时可能调用它）
+        if frame.mode == 'argument' or invoked or frames:
+            target = collector()
+            if target is not None:
+                target.update(frame.collected)
+
+    def frame_mode(at_top):
+        if at_top:
+            return 'declaration' if statement['kind'] == 'function' else 'stored'
+        context = brackets[-1]
+        if context[0] == '(' and context[1] in DEFERRED_CALLS:
+            return 'deferred'
+        if context[0] == '(' and context[1] is not None:
+            return 'argument'
+        return 'stored'
+
+    try:
+        for token in iter_tokens(source):
+            kind, text = token.kind, token.text
+            prev = recent[-1]
+
+            # 简写箭头函数在同层的 , ; 或外层括号结束处结束
+            while frames and frames[-1].concise and kind == 'punct' and (
+                    (text in (',', ';') and len(brackets) == frames[-1].depth)
+                    or (text in (')', ']', '}', '}$') and len(brackets) <= frames[-1].depth)):
+                close_frame()
+
+            at_top = not brackets
+            if at_top and (prev is None or prev.text == ';' or (prev.text == '}' and kind != 'punct') or (
+                    token.newline and (prev.kind != 'punct' or prev.text in (')', ']'))
+                    and not (kind == 'punct' and text in ',.?:=+-*/%&|^<>)]}'))):
+                end_statement()
+
+            if kind == 'word':
+                if at_top and prev is not None and prev.kind == 'word':
+                    if prev.text in ('var', 'let', 'const') and statement['kind'] in (None, 'var') or (
+                            prev.text in ('function', 'class') and statement['kind'] is None):
+                        statement['kind'] = 'var' if prev.text in ('var', 'let', 'const') else prev.text
+                        statement['names'].append(text)
+                        declared.add(text)
+                elif at_top and statement['kind'] == 'var' and prev is not None and prev.text == ',':
+                    statement['names'].append(text)
+                    declared.add(text)
+                if text not in JS_KEYWORDS and not (prev is not None and prev.text == '.'):
+                    names.add(text)
+                    statement['idents'].add(text)
+                    target = collector()
+                    # setTimeout(init) 等直接传入的函数名也不在解析阶段执行
+                    passed = brackets and brackets[-1][0] == '(' and brackets[-1][1] in DEFERRED_CALLS
+                    if target is not None and not (passed and not frames):
+                        target.add(text)
+
+            elif kind == 'punct' and text == '=' and not source.startswith('=', token.end):
+                # window.名称 = ...
+                if recent[0] is not None and recent[0].text == 'window' and recent[1].text == '.' \
+                        and prev.kind == 'word':
+                    declared.add(prev.text)
+
+            elif kind == 'punct' and text in ('(', '[', '${'):
+                callee = None
+                if text == '(' and prev is not None:
+                    if prev.kind == 'word' and prev.text not in NON_CALL_WORDS:
+                        callee = prev.text
+                    elif prev.kind == 'punct' and prev.text in (')', ']'):
+                        callee = ''
+                brackets.append([text, callee])
+
+            elif kind == 'punct' and text == '{':
+                # 箭头函数体，或者 function 名称(...) / 方法名(...) 之后的函数体；if (...) { 等是普通代码块
+                is_function = prev is not None and (prev.text == '=>' or (
+                    prev.text == ')' and last_paren is not None and last_paren[1]))
+                mode = frame_mode(at_top) if is_function else None
+                brackets.append(['{', None])
+                if is_function:
+                    frames.append(_Frame(mode, len(brackets)))
+
+            elif kind == 'punct' and text in (')', ']', '}', '}$'):
+                closed = brackets.pop()
+                if closed[0] == '(':
+                    last_paren = closed
+                if frames and not frames[-1].concise and frames[-1].depth == len(brackets) + 1:
+                    close_frame(bool(INVOKED_PATTERN.match(source, token.end)))
+
+            elif kind == 'punct' and text == '=>' and not re.match(r'\s*\{', source[token.end:token.end + 200]):
+                frames.append(_Frame(frame_mode(at_top), len(brackets), concise=True))
+
+            recent = recent[1:] + [token]
+    except ValueError:
+        return None
+
+    while frames:
+        close_frame()
+    end_statement()
+    return ScriptInfo(declared, immediate, lazy, names, bool(READY_PATTERN.search(source)),
+                      bool(POSITIONAL_PATTERN.search(source)))
+
+
+def needed_names(info, lazy_maps):
+    """解析阶段用到的名称，包括顶层调用的函数（lazy_maps 中的声明）中用到的名称"""
+    needed = set()
+    pending = list(info.immediate)
+    while pending:
+        name = pending.pop()
+        if name in needed:
+            continue
+        needed.add(name)
+        for lazy in lazy_maps:
+            pending.extend(lazy.get(name, ()))
+    return needed
+
+
+def iter_page_scripts(content, read_script):
+    """
+    页面中的脚本，按文档顺序返回 (开始标签区间, PageScript)
+    read_script(路径) 返回本地脚本内容，文件不存在时返回 None
+    """
+    head_end = content.find('</head>')
+    for match in BLOCK_PATTERN.finditer(content):
+        if match.group('kind') is None or match.group('kind').lower() != 'script':
+            continue
+        attrs = parse_attrs(match.group('attrs'))
+        open_end = match.start('body') if match.group('body') is not None else match.end()
+        in_head = head_end >= 0 and match.start() < head_end
+        src = None
+        size = 0
+        if 'src' in attrs:
+            path = reference_path(attrs['src'])
+            text = read_script(resolve('', path)) if path and '*' not in path else None
+            if text is not None:
+                src = resolve('', path)
+                size = len(text.encode('utf-8'))
+        else:
+            text = match.group('body')
+        info = analyze_script(text) if text is not None and attrs.get('type', '').lower() in JS_TYPES else None
+        yield (match.start(), open_end), PageScript(content[match.start():open_end], attrs, src, size, info, in_head)
+
+
+def _depends(later, earlier):
+    """later 保持阻塞时，earlier 是否也必须保持阻塞"""
+    return (bool(needed_names(later, [later.lazy]) & earlier.declared)
+            or bool(later.declared & earlier.declared)
+            or (later.ready and earlier.ready))
+
+
+def plan_scripts(scripts, content):
+    """决定每个脚本的加载方式，返回与 scripts 对应的 mode 列表"""
+    modes = []
+    for script in scripts:
+        classic = script.attrs.get('type', '').lower() in JS_TYPES
+        if 'src' not in script.attrs:
+            modes.append('inline' if classic else 'keep')
+        elif script.src is None or not classic or 'defer' in script.attrs or 'async' in script.attrs:
+            modes.append('keep')
+        else:
+            modes.append('candidate')
+
+    # 无法分析的脚本按需要同步执行、并依赖之前所有脚本处理
+    # 内联脚本在解析阶段调用的函数（包括 new 外部脚本中的类）展开到函数体中用到的名称
+    blocking = set()
+    lazy_maps = []
+    for index, script in enumerate(scripts):
+        if modes[index] not in ('inline', 'candidate'):
+            continue
+        if script.info is None:
+            blocking.update(i for i in range(index + 1) if modes[i] == 'candidate')
+            continue
+        lazy_maps.append(script.info.lazy)
+        if modes[index] != 'inline':
+            continue
+        needed = needed_names(script.info, lazy_maps)
+        for i in range(index):
+            earlier = scripts[i].info
+            if modes[i] == 'candidate' and earlier is not None and (
+                    needed & earlier.declared or script.info.declared & earlier.declared
+                    or (script.info.ready and earlier.ready)):
+                blocking.add(i)
+    for index, script in enumerate(scripts):
+        if modes[index] == 'candidate' and (
+                (script.info is not None and script.info.positional)
+                or any(name in script.attrs for name in POSITIONAL_ATTRS)):
+            blocking.add(index)
+
+    # 保持阻塞的脚本依赖的更早的脚本也保持阻塞
+    pending = list(blocking)
+    while pending:
+        later = pending.pop()
+        for i in range(later):
+            if modes[i] == 'candidate' and i not in blocking and (
+                    scripts[later].info is None or _depends(scripts[later].info, scripts[i].info)):
+                blocking.add(i)
+                pending.append(i)
+
+    # 其余的改为 defer；声明的名称在页面其它地方（包括 onclick 等属性）都没有用到、也不依赖其它脚本的改为 async
+    page_words = set(WORD_PATTERN.findall(content))
+    declared_elsewhere = {}
+    for index, script in enumerate(scripts):
+        if script.info is not None:
+            for name in script.info.declared:
+                declared_elsewhere.setdefault(name, set()).add(index)
+    for index, script in enumerate(scripts):
+        if modes[index] != 'candidate':
+            continue
+        if index in blocking:
+            modes[index] = 'blocking'
+            continue
+        info = script.info
+        used_elsewhere = bool(info.declared & page_words) or any(
+            info.declared & s.info.names for i, s in enumerate(scripts) if i != index and s.info is not None)
+        depends = any(declared_elsewhere.get(name, set()) - {index}
+                      for name in needed_names(info, [info.lazy]))
+        modes[index] = 'defer' if info.ready or used_elsewhere or depends else 'async'
+    return modes
+
+
+def startup_modules(page_texts, wildcard, matches):
+    """
+    module-loader.js 启动时就会加载的模块（wildcard 如 js/modules/*.js 的匹配结果中）
+    page_texts 为页面内容和页面同步加载的脚本
+    """
+    text = '\n'.join(page_texts)
+    tabs = []
+    for pattern in DEFAULT_TAB_PATTERNS:
+        tabs.extend(pattern.findall(text))
+    result = []
+    for tab in dict.fromkeys(tabs):
+        for module in re.findall(TAB_MODULE_PATTERN.format(tab=re.escape(tab)), text):
+            target = wildcard.replace('*', module, 1)
+            if target in matches and target not in result:
+                result.append(target)
+        if result:
+            break
+    return result
+
+
+def positional_violations(content):
+    """
+    页面中带 POSITIONAL_ATTRS 却有 defer/async 的脚本开始标签
+    这类脚本（如共享侧边栏的桩代码）在执行位置插入内容，必须保持阻塞；defer 阶段改写后用它复查
+    """
+    violations = []
+    for match in BLOCK_PATTERN.finditer(content):
+        if match.group('kind') is None or match.group('kind').lower() != 'script':
+            continue
+        attrs = parse_attrs(match.group('attrs'))
+        if any(name in attrs for name in POSITIONAL_ATTRS) and ('defer' in attrs or 'async' in attrs):
+            end = match.start('body') if match.group('body') is not None else match.end()
+            violations.append(content[match.start():end])
+    return violations
+
+
+def _with_attr(open_tag, name):
+    """在开始标签中加上属性"""
+    return open_tag[:-1].rstrip() + f' {name}>'
+
+
+def defer_page(content, read_script, dynamic=None):
+    """
+    改写页面中脚本的加载方式，返回 DeferResult（没有变化时 content 为 None）
+    dynamic(路径) 返回本地脚本动态加载的文件 [(通配路径, [匹配的文件...]), ...]
+    """
+    located = list(iter_page_scripts(content, read_script))
+    scripts = [script for _, script in located]
+    modes = plan_scripts(scripts, content)
+
+    before = sum(s.size for s, mode in zip(scripts, modes) if mode in ('blocking', 'defer', 'async'))
+    after = sum(s.size for s, mode in zip(scripts, modes) if mode == 'blocking')
+
+    preload = [s.src for s, mode in zip(scripts, modes) if mode == 'blocking' and not s.in_head]
+    preload += [s.src for s, mode in zip(scripts, modes)
+                if mode == 'keep' and s.src and s.attrs.get('type', '').lower() == 'module' and not s.in_head]
+    prefetch = []
+    if dynamic:
+        static = [s.src for s in scripts if s.src]
+        texts = [content] + [read_script(src) or '' for src in static]
+        for src in static:
+            for wildcard, matches in dynamic(src):
+                startup = startup_modules(texts, wildcard, matches)
+                preload.extend(target for target in startup if target not in preload)
+                prefetch.extend(target for target in matches if target not in startup and target not in prefetch)
+
+    edits = []
+    for ((start, end), script), mode in zip(located, modes):
+        if mode in ('defer', 'async'):
+            edits.append((start, end, _with_attr(script.open_tag, mode)))
+
+    # 动态加载的模块按脚本中拼出的路径请求，提示带 data-runtime-path，fingerprint 阶段不改写为哈希文件名
+    hints = []
+    for src in preload:
+        module = any(s.src == src and s.attrs.get('type', '').lower() == 'module' for s in scripts)
+        runtime = '' if any(s.src == src for s in scripts) else ' data-runtime-path'
+        hints.append(f'<link rel="modulepreload" href="{src}">' if module
+                     else f'<link rel="preload" href="{src}" as="script"{runtime}>')
+    hints.extend(f'<link rel="prefetch" href="{src}" as="script" data-runtime-path>' for src in prefetch)
+    head_end = content.find('</head>')
+    if hints and head_end >= 0:
+        line_start = content.rfind('\n', 0, head_end) + 1
+        indent = content[line_start:head_end] if not content[line_start:head_end].strip() else ''
+        edits.append((line_start, line_start, ''.join(f'{indent}    {hint}\n' for hint in hints)))
+
+    if not edits:
+        return DeferResult(None, before, after, modes, preload, prefetch)
+    parts = []
+    pos = 0
+    for start, end, text in sorted(edits):
+        parts.append(content[pos:start])
+        parts.append(text)
+        pos = end
+    parts.append(content[pos:])
+    return DeferResult(''.join(parts), before, after, modes, preload, prefetch)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+单次遍历的页面改写引擎
+每个页面只读一次，在内存中依次执行已注册的变换，内容有变化时只写一次
+"""
+
+import os
+from collections import namedtuple
+
+from page_tools.fileio import write_atomic
+from page_tools.index import load_index
+from page_tools.parallel import run_pages
+from page_tools.profiling import NULL_PROFILE, PageProfile, count_regex, run_cprofile
+
+# 已注册的变换：名称 -> Transform
+TRANSFORMS = {}
+
+# func(content, filename) -> (新内容, 是否命中)；targets 为 PageQuery，由页面索引查出默认处理的页面
+Transform = namedtuple('Transform', ['name', 'func', 'targets', 'description'])
+
+# 单个页面的处理结果，profile 为 --profile 时的剖析记录（dict）
+PageResult = namedtuple('PageResult', ['filename', 'status', 'hits', 'misses', 'changed', 'message', 'profile'],
+                        defaults=[None])
+
+
+def register_transform(name, targets, description=''):
+    """注册一个页面变换，targets 为描述默认处理页面的 PageQuery"""
+    def decorator(func):
+        TRANSFORMS[name] = Transform(name, func, targets, description)
+        return func
+    return decorator
+
+
+def get_transforms(names):
+    """按名称取出变换，保持传入顺序"""
+    # 导入内置变换，完成注册
+    from page_tools import transforms  # noqa: F401
+
+    unknown = [name for name in names if name not in TRANSFORMS]
+    if unknown:
+        raise KeyError(f"未知的变换: {', '.join(unknown)}")
+    return [TRANSFORMS[name] for name in names]
+
+
+class PageRewriteEngine:
+    """按顺序对每个页面执行一组变换"""
+
+    def __init__(self, transforms, base_dir):
+        self.transforms = list(transforms)
+        self.base_dir = base_dir
+
+    def plan(self, pages=None, dry_run=False):
+        """
+        生成处理计划：[(文件名, [变换, ...]), ...]
+        未指定页面时从页面索引中查出各变换的目标页面取并集，每个变换只作用于自己的页面；dry_run 时不写回索引
+        """
+        if pages is not None:
+            return [(filename, self.transforms) for filename in pages]
+
+        index = load_index(self.base_dir, save=not dry_run)
+        order = []
+        targets = {}
+        for transform in self.transforms:
+            for filename in index.select(transform.targets):
+                if filename not in targets:
+                    targets[filename] = []
+                    order.append(filename)
+                targets[filename].append(transform)
+        return [(filename, targets[filename]) for filename in order]
+
+    def rewrite_page(self, filename, transforms, dry_run=False, profile=False):
+        """读取一次页面，依次执行变换，有变化时写回一次；profile 为 True 时记录各阶段耗时"""
+        filepath = os.path.join(self.base_dir, filename)
+        if not os.path.exists(filepath):
+            return PageResult(filename, 'missing', [], [], [], '文件不存在')
+
+        prof = PageProfile(filepath) if profile else NULL_PROFILE
+        result = self._rewrite(filename, filepath, transforms, dry_run, prof)
+        return result._replace(profile=prof.to_dict()) if profile else result
+
+    def _rewrite(self, filename, filepath, transforms, dry_run, prof):
+        try:
+            with prof.phase('read'):
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    original = f.read()
+            prof.add_read(os.path.getsize(filepath))
+
+            content = original
+            hits = []
+            misses = []
+            changed = []
+            for transform in transforms:
+                with prof.phase(f'transform:{transform.name}'), count_regex(prof):
+                    updated, hit = transform.func(content, filename)
+                (hits if hit else misses).append(transform.name)
+                if updated != content:
+                    changed.append(transform.name)
+                    content = updated
+
+            if content == original:
+                return PageResult(filename, 'unchanged', hits, misses, changed, '无需更新')
+
+            if not dry_run:
+                with prof.phase('write'):
+                    write_atomic(filepath, content)
+                prof.add_written(os.path.getsize(filepath))
+            return PageResult(filename, 'updated', hits, misses, changed, '已更新')
+
+        except Exception as e:
+            return PageResult(filename, 'error', [], [], [], str(e))
+
+    def _rewrite_and_print(self, filename, transforms, dry_run, profile=False, cprofile_output=None):
+        if cprofile_output:
+            result = run_cprofile(self.rewrite_page, (filename, transforms, dry_run, profile), cprofile_output)
+        else:
+            result = self.rewrite_page(filename, transforms, dry_run=dry_run, profile=profile)
+        print_result(result)
+        return result
+
+    def run(self, pages=None, dry_run=False, jobs=1, profile=False, cprofile=None, cprofile_output=None):
+        """
+        处理所有页面并按页面顺序打印结果，返回 PageResult 列表
+        cprofile 为页面文件名时，该页面在 cProfile 下执行，统计写入 cprofile_output
+        """
+        tasks = [
+            (filename, transforms, dry_run, profile, cprofile_output if filename == cprofile else None)
+            for filename, transforms in self.plan(pages, dry_run)
+        ]
+        return run_pages(self._rewrite_and_print, tasks, jobs)
+
+    def print_summary(self, results, dry_run=False):
+        """打印页面读写次数和每个变换的命中统计"""
+        counts = {}
+        for result in results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        pages_read = counts.get('updated', 0) + counts.get('unchanged', 0)
+        pages_written = 0 if dry_run else counts.get('updated', 0)
+
+        print()
+        print('=' * 60)
+        print(f"页面: 读取 {pages_read}, 写入 {pages_written}, "
+              f"无需更新 {counts.get('unchanged', 0)}, "
+              f"不存在 {counts.get('missing', 0)}, 失败 {counts.get('error', 0)}")
+        print('-' * 60)
+        # 中文标题按两列宽对齐
+        print('变换' + ' ' * 20 + '    命中  未命中    修改')
+        for transform in self.transforms:
+            hits = sum(transform.name in r.hits for r in results)
+            misses = sum(transform.name in r.misses for r in results)
+            changed = sum(transform.name in r.changed for r in results)
+            print(f"{transform.name:<24}{hits:>8}{misses:>8}{changed:>8}")
+        print('=' * 60)
+
+
+def print_result(result):
+    """打印单个页面的处理结果"""
+    tags = {'updated': '[OK]', 'unchanged': '[SKIP]', 'missing': '[WARN]', 'error': '[ERROR]'}
+    line = f"{tags[result.status]} {result.filename} - {result.message}"
+    if result.misses:
+        line += f" (未命中: {', '.join(result.misses)})"
+    print(line)
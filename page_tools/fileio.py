@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+页面文件读写
+    - 原子写入：先写同目录临时文件，fsync 后用 os.replace 换上，中途崩溃不会留下写了一半的页面
+    - 区段拼接：用 mmap 读取页面，替换区段前后的内容按块直接写入临时文件，
+      内存占用只与替换区段和块大小有关，与页面大小无关
+"""
+
+import contextlib
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+
+from page_tools.profiling import NULL_PROFILE
+from page_tools.spans import block_looks_valid, locate_sidebar_block
+
+# 拼接时每次复制的块大小
+CHUNK_SIZE = 64 * 1024
+
+
+@contextlib.contextmanager
+def open_mmap(filepath):
+    """只读 mmap 打开文件；空文件得到 b''"""
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def write_temp(filepath, chunks):
+    """
+    把 chunks 依次写入 filepath 同目录下的临时文件并 fsync
+    返回 (临时文件路径, 写入内容的 sha256)
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(filepath)}.', suffix='.tmp')
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                digest.update(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return temp_path, digest.hexdigest()
+
+
+def _default_mode():
+    """新建文件的默认权限（0o666 去掉 umask），mkstemp 创建的临时文件只有 0o600"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def commit_temp(temp_path, filepath):
+    """用临时文件原子替换目标文件，保留原文件权限；新文件使用默认权限"""
+    try:
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, temp_path)
+        else:
+            os.chmod(temp_path, _default_mode())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def write_atomic(filepath, content):
+    """原子写入文本（UTF-8，换行符处理与 open(filepath, 'w') 相同）"""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(filepath)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    commit_temp(temp_path, filepath)
+
+
+def iter_splice(buffer, span, replacement, chunk_size=CHUNK_SIZE):
+    """按块产生 buffer[:start] + replacement + buffer[end:]，每块最多 chunk_size 字节"""
+    for pos in range(0, span.start, chunk_size):
+        yield buffer[pos:min(pos + chunk_size, span.start)]
+    yield replacement
+    for pos in range(span.end, len(buffer), chunk_size):
+        yield buffer[pos:min(pos + chunk_size, len(buffer))]
+
+
+def match_newlines(buffer, span, text):
+    """页面区段使用 CRLF 换行时，把替换文本也转成 CRLF"""
+    data = text.encode('utf-8')
+    if buffer.find(b'\r\n', span.start, span.end) >= 0:
+        data = data.replace(b'\r\n', b'\n').replace(b'\n', b'\r\n')
+    return data
+
+
+def find_sidebar_block(buffer, block=None):
+    """侧边栏整块区段（或共享模式的桩代码）；block 为页面索引记录的偏移，仍然有效时直接使用，否则重新定位"""
+    if block is not None and block_looks_valid(buffer, block):
+        return block
+    return locate_sidebar_block(buffer)
+
+
+def splice_sidebar_file(filepath, new_sidebar, profile=NULL_PROFILE, block=None):
+    """
+    用 new_sidebar 替换页面中的侧边栏区段，block 为页面索引记录的区段偏移（可选）
+    返回 (状态, 页面内容 sha256, 侧边栏区段 sha256)，状态为 no-sidebar / unchanged / updated；
+    no-sidebar 时两个哈希为 None，updated 时两个哈希都是写入后的内容（区段按页面换行符转换后的字节计算）
+    """
+    temp_path = None
+    with contextlib.ExitStack() as stack:
+        with profile.phase('read'):
+            buffer = stack.enter_context(open_mmap(filepath))
+        profile.add_read(len(buffer))
+
+        with profile.phase('match'):
+            block = find_sidebar_block(buffer, block)
+            if block is None:
+                return 'no-sidebar', None, None
+
+            replacement = match_newlines(buffer, block, new_sidebar)
+            current = buffer[block.start:block.end]
+            span_hash = hashlib.sha256(current).hexdigest()
+            if current == replacement:
+                return 'unchanged', hashlib.sha256(buffer).hexdigest(), span_hash
+
+        with profile.phase('write'):
+            temp_path, page_hash = write_temp(filepath, iter_splice(buffer, block, replacement))
+            span_hash = hashlib.sha256(replacement).hexdigest()
+        profile.add_written(len(buffer) - len(current) + len(replacement))
+
+    # mmap 关闭后再替换，Windows 下被映射的文件不能被覆盖
+    with profile.phase('write'):
+        commit_temp(temp_path, filepath)
+    return 'updated', page_hash, span_hash
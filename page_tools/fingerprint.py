@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+静态资源内容哈希
+为 js/、css/ 下的每个文件生成带内容哈希的副本（js/utils.js -> js/utils.<哈希>.js）和清单 asset-manifest.json，
+并把所有页面中的 src/href 引用一次扫描改写为哈希文件名，服务器即可对这些文件使用一年的 immutable 缓存。
+
+原文件保留在输出目录中：脚本中按路径动态加载的模块（如 module-loader.js）和 CSS/JS 中的相对引用仍然有效，
+哈希副本与原文件在同一目录，相对路径的解析结果不变。已经带哈希的文件（构建阶段生成的共享文件等）不再处理。
+带 data-runtime-path 属性的标签（如动态加载模块的预加载提示）必须与脚本运行时请求的路径一致，其中的引用不改写。
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+
+MANIFEST_NAME = 'asset-manifest.json'
+HASHED_PATTERN = re.compile(r'\.[0-9a-f]{10}\.\w+$')
+
+# src="..." / href='...'，路径后面的 ?查询 和 #片段 保留
+REFERENCE_PATTERN = re.compile(r'''(\b(?:src|href)\s*=\s*)(["'])(/?)((?:\./)?[^"'?#\s]+)([^"']*)\2''', re.I)
+
+RUNTIME_PATH_PATTERN = re.compile(r'<[^<>]*\sdata-runtime-path\b[^<>]*>')
+
+FingerprintResult = namedtuple('FingerprintResult', ['pages', 'files', 'manifest', 'rewritten'])
+
+
+def hashed_name(relpath, data):
+    """js/utils.js -> js/utils.<哈希前10位>.js"""
+    base, ext = os.path.splitext(relpath)
+    return f'{base}.{hashlib.sha256(data).hexdigest()[:10]}{ext}'
+
+
+def collect_assets(base_dir, directories, extra):
+    """
+    需要加哈希的资源：相对路径(/ 分隔) -> 内容字节
+    extra 为构建中生成的附加文件，同名时覆盖源目录中的文件
+    """
+    assets = {}
+    for directory in directories:
+        for root, _, names in os.walk(os.path.join(base_dir, directory)):
+            for name in names:
+                path = os.path.join(root, name)
+                relpath = os.path.relpath(path, base_dir).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    assets[relpath] = f.read()
+    for relpath, content in extra.items():
+        if relpath.split('/', 1)[0] in directories:
+            assets[relpath] = content.encode('utf-8') if isinstance(content, str) else content
+    return {relpath: data for relpath, data in assets.items() if not HASHED_PATTERN.search(relpath)}
+
+
+def rewrite_references(content, manifest):
+    """把 src/href 中的资源路径换成哈希文件名，返回 (新内容, 替换次数)"""
+    count = 0
+    kept = [(m.start(), m.end()) for m in RUNTIME_PATH_PATTERN.finditer(content)]
+
+    def replace(match):
+        nonlocal count
+        if any(start <= match.start() < end for start, end in kept):
+            return match.group(0)
+        prefix, quote, root, path, rest = match.groups()
+        hashed = manifest.get(path[2:] if path.startswith('./') else path)
+        if hashed is None:
+            return match.group(0)
+        count += 1
+        return f'{prefix}{quote}{root}{hashed}{rest}{quote}'
+
+    return REFERENCE_PATTERN.sub(replace, content), count
+
+
+def fingerprint_pages(pages, base_dir, directories, extra):
+    """生成哈希副本和清单并改写页面引用，返回 FingerprintResult"""
+    assets = collect_assets(base_dir, directories, extra)
+    manifest = {relpath: hashed_name(relpath, data) for relpath, data in sorted(assets.items())}
+    files = {manifest[relpath]: data for relpath, data in assets.items()}
+    files[MANIFEST_NAME] = json.dumps(manifest, ensure_ascii=False, indent=2) + '\n'
+
+    rewritten = {}
+    total = 0
+    for filename, content in pages.items():
+        content, count = rewrite_references(content, manifest)
+        if count:
+            rewritten[filename] = content
+            total += count
+    return FingerprintResult(rewritten, files, manifest, total)
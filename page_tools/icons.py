@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Lucide 图标雪碧图
+页面加载 unpkg.com 上完整的 lucide 图标库，每次渲染后调用 lucide.createIcons() 扫描整个 DOM，
+把 <i data-lucide="名称"> 换成内联 SVG。这里在构建时:
+    - 收集页面、js/ 模块和标准侧边栏模板中用到的图标名称
+    - 从仓库中固定版本的图标目录（vendor/lucide-static/icons/，每个图标一个 名称.svg）生成 icons/lucide.<哈希>.svg 雪碧图
+    - 页面中静态的 <i data-lucide> 直接换成 <svg><use href="雪碧图#名称"></use></svg>，属性与 createIcons 的结果一致
+    - CDN 脚本换成很小的兼容脚本：lucide.createIcons() 只处理 JS 动态插入的 [data-lucide] 元素，同样改用 <use>
+
+JS 中动态拼出的图标名（如 data-lucide="${category.icon}"）无法静态确定，
+脚本和页面中所有带引号、且在图标目录中存在的名称都会放进雪碧图。
+页面仍在使用的旧图标名按 ICON_ALIASES 找到改名后的文件，雪碧图中 <symbol> 的 id 保持页面使用的名称。
+"""
+
+import hashlib
+import os
+import re
+from collections import namedtuple
+
+from page_tools.scanner import ATTRS, parse_attrs
+
+ICON_DIR = os.path.join('vendor', 'lucide-static', 'icons')
+SPRITE_NAME = 'icons/lucide.{hash}.svg'
+SHIM_NAME = 'js/lucide-sprite.{hash}.js'
+
+CDN_SCRIPT_PATTERN = re.compile(r'<script\s+src="https://unpkg\.com/lucide@[^"]*"\s*>\s*</script>')
+ICON_ELEMENT_PATTERN = re.compile(
+    rf'<(?P<tag>i|span)\b(?P<attrs>{ATTRS}\bdata-lucide\s*=\s*"(?P<name>[a-z0-9-]+)"{ATTRS})>\s*</(?P=tag)>')
+ICON_ATTR_PATTERN = re.compile(r'data-lucide\s*=\s*"([a-z0-9-]+)"')
+QUOTED_NAME_PATTERN = re.compile(r'''['"]([a-z][a-z0-9]*(?:-[a-z0-9]+)*)['"]''')
+SVG_ROOT_PATTERN = re.compile(r'<svg\b[^>]*>(.*)</svg>', re.S)
+
+# lucide 改名前的图标名 -> 图标目录中的文件名（lucide 运行时兼容这些旧名，图标目录中只有新名字）
+ICON_ALIASES = {
+    'alert-circle': 'circle-alert',
+    'bar-chart-3': 'chart-column',
+    'check-circle': 'circle-check-big',
+    'check-square': 'square-check-big',
+    'edit': 'square-pen',
+    'edit-2': 'pen',
+    'edit-3': 'pen-line',
+    'file-edit': 'file-pen',
+    'filter': 'funnel',
+    'grid': 'grid-3x3',
+    'help-circle': 'circle-question-mark',
+    'loader-2': 'loader-circle',
+    'plus-circle': 'circle-plus',
+    'plus-square': 'square-plus',
+    'sliders': 'sliders-vertical',
+    'user-circle': 'circle-user',
+    'user-square': 'square-user',
+    'wand-2': 'wand-sparkles',
+    'x-circle': 'circle-x',
+}
+
+# createIcons 生成的 <svg> 的默认属性
+SVG_ATTRS = {
+    'xmlns': 'http://www.w3.org/2000/svg', 'width': '24', 'height': '24', 'viewBox': '0 0 24 24', 'fill': 'none',
+    'stroke': 'currentColor', 'stroke-width': '2', 'stroke-linecap': 'round', 'stroke-linejoin': 'round',
+}
+
+SHIM_TEMPLATE = '''(function () {
+    // 替代完整的 lucide 库：动态插入的图标改用雪碧图中的 <symbol>
+    var SPRITE = '%(sprite)s';
+    var NS = 'http://www.w3.org/2000/svg';
+    var ATTRS = %(attrs)s;
+
+    function createIcons(options) {
+        var extra = (options && options.attrs) || {};
+        document.querySelectorAll('[data-lucide]:not(svg)').forEach(function (el) {
+            var name = el.getAttribute('data-lucide');
+            var svg = document.createElementNS(NS, 'svg');
+            Object.keys(ATTRS).forEach(function (key) { svg.setAttribute(key, ATTRS[key]); });
+            Object.keys(extra).forEach(function (key) { svg.setAttribute(key, extra[key]); });
+            Array.prototype.forEach.call(el.attributes, function (attr) { svg.setAttribute(attr.name, attr.value); });
+            svg.setAttribute('class', ('lucide lucide-' + name + ' ' + (el.getAttribute('class') || '')).trim());
+            var use = document.createElementNS(NS, 'use');
+            use.setAttribute('href', SPRITE + '#' + name);
+            svg.appendChild(use);
+            el.parentNode.replaceChild(svg, el);
+        });
+    }
+
+    window.lucide = { createIcons: createIcons };
+})();
+'''
+
+SpriteResult = namedtuple('SpriteResult', ['pages', 'files', 'icons', 'replaced', 'missing'])
+
+
+def available_icons(icon_dir):
+    """图标目录中的所有图标名称，包括目标文件存在的旧图标名"""
+    try:
+        names = {name[:-4] for name in os.listdir(icon_dir) if name.endswith('.svg')}
+    except OSError:
+        return set()
+    return names | {alias for alias, target in ICON_ALIASES.items() if target in names}
+
+
+def collect_icons(pages, sources, available):
+    """
+    返回 (用到的图标, 缺失的图标)
+    data-lucide="名称" 都算用到；其它带引号的字符串只有在图标目录中存在时才算（JS 中动态使用的名称）
+    """
+    used = set()
+    for text in list(pages) + list(sources):
+        used.update(ICON_ATTR_PATTERN.findall(text))
+    missing = used - available
+    for text in list(pages) + list(sources):
+        used.update(name for name in QUOTED_NAME_PATTERN.findall(text) if name in available)
+    return used - missing, missing
+
+
+def build_sprite(icon_dir, names):
+    """把图标拼成 <symbol> 雪碧图"""
+    symbols = []
+    for name in sorted(names):
+        with open(os.path.join(icon_dir, ICON_ALIASES.get(name, name) + '.svg'), 'r', encoding='utf-8') as f:
+            match = SVG_ROOT_PATTERN.search(f.read())
+        body = re.sub(r'\s*\n\s*', '', match.group(1).strip()) if match else ''
+        symbols.append(f'<symbol id="{name}" viewBox="0 0 24 24">{body}</symbol>')
+    return '<svg xmlns="http://www.w3.org/2000/svg">\n' + '\n'.join(symbols) + '\n</svg>\n'
+
+
+def render_icon(attrs, name, sprite):
+    """与 createIcons 结果相同的 <svg>，图形内容改为引用雪碧图"""
+    merged = dict(SVG_ATTRS)
+    merged.update(attrs)
+    merged['class'] = f"lucide lucide-{name} {attrs.get('class', '')}".strip()
+    text = ' '.join(f'{key}="{value}"' for key, value in merged.items())
+    return f'<svg {text}><use href="{sprite}#{name}"></use></svg>'
+
+
+def _hashed(pattern, text):
+    return pattern.format(hash=hashlib.sha256(text.encode('utf-8')).hexdigest()[:10])
+
+
+def sprite_pages(pages, sources, icon_dir):
+    """
+    生成雪碧图和兼容脚本，改写使用 lucide CDN 的页面
+    有页面静态使用、但图标目录中没有的图标时不改写任何页面（missing 非空），避免出现空白图标
+    """
+    available = available_icons(icon_dir)
+    used, missing = collect_icons(pages.values(), sources, available)
+    if missing or not used:
+        return SpriteResult({}, {}, used, 0, missing)
+
+    sprite_text = build_sprite(icon_dir, used)
+    sprite = _hashed(SPRITE_NAME, sprite_text)
+    shim_text = SHIM_TEMPLATE % {
+        'sprite': sprite,
+        'attrs': '{' + ', '.join(f"'{key}': '{value}'" for key, value in SVG_ATTRS.items()) + '}',
+    }
+    shim = _hashed(SHIM_NAME, shim_text)
+
+    rewritten = {}
+    replaced = 0
+    for filename, content in pages.items():
+        if not CDN_SCRIPT_PATTERN.search(content):
+            continue
+        content = CDN_SCRIPT_PATTERN.sub(f'<script src="{shim}"></script>', content, count=1)
+        content, count = ICON_ELEMENT_PATTERN.subn(
+            lambda m: render_icon(parse_attrs(m.group('attrs')), m.group('name'), sprite), content)
+        rewritten[filename] = content
+        replaced += count
+    return SpriteResult(rewritten, {sprite: sprite_text, shim: shim_text}, used, replaced, set())
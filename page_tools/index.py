@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+页面索引
+一次遍历目录下所有 HTML 页面，记录每个页面是否有侧边栏、侧边栏区段和各菜单分组的字节偏移、
+当前高亮的菜单项以及侧边栏中的链接。索引保存在 .page-index.json，
+按文件大小和修改时间判断是否失效，只重新扫描有变化的页面。
+
+各脚本用 PageQuery 描述自己要处理哪些页面，由索引查出目标页面，代替各自维护的页面列表:
+    PageQuery(sections=('系统管理',))                      侧边栏中有系统管理分组的页面
+    PageQuery(href='customer-profile-templates.html')       侧边栏中有客户模板链接的页面
+    PageQuery(pages=SIDEBAR_PAGES)                          限定在配置了激活菜单的页面中
+"""
+
+import json
+import os
+import re
+from collections import namedtuple
+
+from page_tools.check import find_active_href
+from page_tools.fileio import open_mmap, write_atomic
+from page_tools.spans import Span, locate_sidebar
+
+INDEX_NAME = '.page-index.json'
+INDEX_VERSION = 1
+
+HREF_PATTERN = re.compile(rb'href="([^"#?]+)')
+
+# 在整个页面中检测的标记，命中的名称记录在索引的 markers 中
+INDEX_MARKERS = {
+    'nav-template': '<!-- 模板管理 -->'.encode('utf-8'),
+    'task-categories': b"filterCategory('hydration')",
+}
+
+# 查询条件，空条件表示不限制
+#   sections  侧边栏中必须包含的分组
+#   href      侧边栏中必须包含的链接
+#   marker    页面中必须包含的标记（INDEX_MARKERS 的名称）
+#   pages     只在这些文件名中选择（列表或以文件名为键的配置字典）
+#   partials  是否包含 _ 开头的片段文件（如 _sidebar-template.html）
+PageQuery = namedtuple('PageQuery', ['sections', 'href', 'marker', 'pages', 'partials'],
+                       defaults=[(), None, None, None, False])
+
+
+def _span(span):
+    return [span.start, span.end] if span else None
+
+
+def scan_page(filepath, st=None):
+    """扫描单个页面，返回索引记录（字节偏移）"""
+    st = st or os.stat(filepath)
+    entry = {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sidebar': False,
+        'block': None,
+        'aside': None,
+        'sections': {},
+        'active': None,
+        'hrefs': [],
+        'markers': [],
+    }
+    with open_mmap(filepath) as buffer:
+        entry['markers'] = [name for name, marker in INDEX_MARKERS.items() if buffer.find(marker) >= 0]
+        layout = locate_sidebar(buffer)
+        if layout is None:
+            return entry
+
+        aside = buffer[layout.aside.start:layout.aside.end]
+        entry.update({
+            'sidebar': True,
+            'block': _span(layout.block),
+            'aside': _span(layout.aside),
+            'sections': {name: _span(span) for name, span in layout.sections.items()},
+            'active': find_active_href(aside.decode('utf-8', errors='replace')),
+            'hrefs': list(dict.fromkeys(match.decode('utf-8') for match in HREF_PATTERN.findall(aside))),
+        })
+    return entry
+
+
+def entry_matches(filename, entry, query):
+    if query.pages is not None and filename not in query.pages:
+        return False
+    if not query.partials and filename.startswith('_'):
+        return False
+    if (query.sections or query.href) and not entry['sidebar']:
+        return False
+    if any(name not in entry['sections'] for name in query.sections):
+        return False
+    if query.href and query.href not in entry['hrefs']:
+        return False
+    if query.marker and query.marker not in entry['markers']:
+        return False
+    return True
+
+
+class PageIndex:
+    """目录下所有 HTML 页面的索引"""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.entries = {}
+        self.scanned = []
+        self.dirty = False
+
+    @property
+    def path(self):
+        return os.path.join(self.base_dir, INDEX_NAME)
+
+    def load(self):
+        """读取已保存的索引，文件不存在、损坏或版本不符时从空索引开始"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get('version') == INDEX_VERSION:
+            self.entries = data.get('pages', {})
+        return self
+
+    def refresh(self):
+        """
+        遍历一次目录：大小和修改时间没变的页面沿用旧记录，其余页面重新扫描，已删除的页面移出索引
+        重新扫描的页面记录在 self.scanned
+        """
+        entries = {}
+        self.scanned = []
+        with os.scandir(self.base_dir) as it:
+            for item in it:
+                if not item.name.endswith('.html') or not item.is_file():
+                    continue
+                st = item.stat()
+                entry = self.entries.get(item.name)
+                if not entry or entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+                    entry = scan_page(item.path, st)
+                    self.scanned.append(item.name)
+                entries[item.name] = entry
+        self.dirty = self.dirty or bool(self.scanned) or entries.keys() != self.entries.keys()
+        self.entries = dict(sorted(entries.items()))
+        return self
+
+    def save(self):
+        if self.dirty:
+            data = {'version': INDEX_VERSION, 'pages': self.entries}
+            write_atomic(self.path, json.dumps(data, ensure_ascii=False, indent=1))
+            self.dirty = False
+        return self
+
+    def update(self, filename):
+        """页面被改写后重新扫描"""
+        filepath = os.path.join(self.base_dir, filename)
+        if os.path.exists(filepath):
+            self.entries[filename] = scan_page(filepath)
+        else:
+            self.entries.pop(filename, None)
+        self.dirty = True
+
+    def get(self, filename):
+        return self.entries.get(filename)
+
+    def block(self, filename):
+        """页面侧边栏整块区段的字节偏移，索引中没有时返回 None"""
+        entry = self.entries.get(filename)
+        if entry and entry['block']:
+            return Span(*entry['block'])
+        return None
+
+    def select(self, query):
+        """按查询条件选出页面文件名；query.pages 给出时保持其顺序，否则按文件名排序"""
+        names = list(query.pages) if query.pages is not None else list(self.entries)
+        return [name for name in names if name in self.entries and entry_matches(name, self.entries[name], query)]
+
+
+def load_index(base_dir, save=True):
+    """
+    读取并刷新目录的页面索引，有变化时写回
+    save=False 时只在内存中刷新，不写任何文件（--check、--dry-run 等只读模式使用）
+    """
+    index = PageIndex(base_dir).load().refresh()
+    return index.save() if save else index
+
+
+def select_pages(base_dir, query, save=True):
+    """按查询条件从目录的页面索引中选出页面文件名"""
+    return load_index(base_dir, save).select(query)
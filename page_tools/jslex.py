@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+JavaScript 记号扫描
+内联脚本去重（dedupe.py）、脚本加载顺序分析（defer.py）和多模式替换（remap.py）共用的记号扫描器。
+处理注释、字符串、模板字符串（含 ${} 嵌套）、正则字面量和括号配对，不做完整的语法分析:
+/ 是正则还是除号只看前一个记号。
+"""
+
+import re
+from collections import namedtuple
+
+# <script> 的 type 属性中表示经典 JavaScript 脚本的值
+JS_TYPES = ('', 'text/javascript', 'application/javascript')
+
+WORD_PATTERN = re.compile(r'[A-Za-z_$][\w$]*')
+NUMBER_PATTERN = re.compile(r'[\w.]+')
+
+# 这些关键字和符号后面的 / 是正则表达式，而不是除号
+REGEX_KEYWORDS = frozenset({
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw', 'case', 'do', 'else',
+    'yield', 'await',
+})
+REGEX_AFTER = frozenset('(,=:[!&|?{};+-*%<>~^')
+BRACKETS = {'(': ')', '[': ']', '{': '}'}
+
+# kind: word / value / punct；start/end 为在脚本中的偏移；newline 表示与前一个记号之间有换行
+Token = namedtuple('Token', ['kind', 'text', 'start', 'end', 'newline'])
+
+
+def skip_string(source, i):
+    """跳过 ' 或 " 字符串，返回结束引号之后的位置；字符串没有结束时返回 -1"""
+    quote = source[i]
+    i += 1
+    while i < len(source):
+        ch = source[i]
+        if ch == '\\':
+            i += 2
+        elif ch == quote:
+            return i + 1
+        elif ch == '\n':
+            return -1
+        else:
+            i += 1
+    return -1
+
+
+def skip_template(source, i):
+    """
+    从模板字符串内部的位置 i 扫描到结束的 ` 或 ${
+    返回 (之后的位置, 是否遇到 ${, 是否跨行)，没有结束时位置为 -1
+    """
+    multiline = False
+    while i < len(source):
+        ch = source[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '`':
+            return i + 1, False, multiline
+        if ch == '$' and source.startswith('${', i):
+            return i + 2, True, multiline
+        if ch == '\n':
+            multiline = True
+        i += 1
+    return -1, False, multiline
+
+
+def skip_regex(source, i):
+    """跳过正则表达式字面量（包括标志），没有结束时返回 -1"""
+    i += 1
+    in_class = False
+    while i < len(source):
+        ch = source[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '\n':
+            return -1
+        if in_class:
+            in_class = ch != ']'
+        elif ch == '[':
+            in_class = True
+        elif ch == '/':
+            i += 1
+            while i < len(source) and (source[i].isalnum() or source[i] in '_$'):
+                i += 1
+            return i
+        i += 1
+    return -1
+
+
+def is_template_part(source, token, prev):
+    """记号是否为模板字符串的文本部分（从 ` 或 } 之后到下一个 ` 或 ${），prev 为前一个记号"""
+    return source[token.start] == '`' or (prev is not None and prev.text == '}$')
+
+
+def iter_tokens(source):
+    """
+    脚本的记号：word / value（字符串、正则、数字等字面量）/ punct
+    模板字符串中的 ${ 和对应的 } 分别为 punct '${' 和 '}$'；括号不配对或字面量没有结束时抛出 ValueError
+    """
+    stack = []
+    prev = None
+    newline = False
+    i = 0
+    n = len(source)
+    while i < n:
+        ch = source[i]
+        if ch in ' \t\r\f\v':
+            i += 1
+            continue
+        if ch == '\n':
+            newline = True
+            i += 1
+            continue
+        if source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end < 0 else end
+            continue
+        if source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            if end < 0:
+                raise ValueError('注释没有结束')
+            i = end + 2
+            continue
+
+        start = i
+        template = None
+        word = WORD_PATTERN.match(source, i)
+        if ch in '\'"':
+            i = skip_string(source, i)
+            kind, text = 'value', source[start:i]
+        elif ch == '`':
+            template = skip_template(source, i + 1)
+        elif ch == '}' and stack and stack[-1] == '${':
+            stack.pop()
+            yield Token('punct', '}$', i, i + 1, newline)
+            newline = False
+            template = skip_template(source, i + 1)
+            start = i + 1
+        elif ch == '/' and (prev is None or (prev.kind == 'punct' and prev.text[-1] in REGEX_AFTER)
+                            or (prev.kind == 'word' and prev.text in REGEX_KEYWORDS)):
+            i = skip_regex(source, i)
+            kind, text = 'value', None
+        elif word:
+            i = word.end()
+            kind, text = 'word', word.group()
+        elif ch.isdigit():
+            i = NUMBER_PATTERN.match(source, i).end()
+            kind, text = 'value', None
+        elif source.startswith('=>', i):
+            i += 2
+            kind, text = 'punct', '=>'
+        else:
+            if ch in BRACKETS:
+                stack.append(ch)
+            elif ch in ')]}':
+                if not stack or BRACKETS.get(stack.pop()) != ch:
+                    raise ValueError('括号不配对')
+            i += 1
+            kind, text = 'punct', ch
+
+        if template is not None:
+            i, opened, _ = template
+            kind, text = ('punct', '${') if opened else ('value', None)
+            if opened:
+                stack.append('${')
+        if i < 0:
+            raise ValueError('字面量没有结束')
+        prev = Token(kind, text, start, i, newline)
+        newline = False
+        yield prev
+
+    if stack:
+        raise ValueError('括号不配对')
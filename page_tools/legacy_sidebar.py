@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+旧版侧边栏（以franchisees.html为标准模板）
+通过 {ACTIVE_X} 占位符生成每个页面的侧边栏
+"""
+
+from page_tools.render import SlotTemplate, highlight_fragment
+from page_tools.scanner import find_element
+from page_tools.spans import splice
+
+# 页面配置 - 定义每个页面应该高亮哪个菜单项
+PAGE_CONFIGS = {
+    'index.html': 'INDEX',
+    'customers.html': 'CUSTOMERS',
+    'orders.html': 'ORDERS',
+    'tasks.html': 'TASKS',
+    'cases.html': 'CASES',
+    'templates.html': 'TEMPLATES',
+    'franchisees.html': 'FRANCHISEES',
+    'users.html': 'USERS',
+    'organizations.html': 'ORGANIZATIONS',
+    'settings.html': 'SETTINGS',
+}
+
+# 标准侧边栏模板
+SIDEBAR_TEMPLATE = '''        <!-- 侧边栏 -->
+        <aside id="sidebar" class="sidebar w-64 bg-white shadow-sm border-r border-gray-200 fixed md:static h-full z-40 closed md:block">
+            <div class="p-4 md:p-6 space-y-6 overflow-y-auto h-full">
+                <!-- 快速统计 -->
+                <div class="bg-gradient-to-br from-purple-50 to-pink-50 p-4 rounded-lg">
+                    <h3 class="text-sm font-medium text-purple-900 mb-3">今日概览</h3>
+                    <div class="space-y-2">
+                        <div class="flex justify-between text-sm">
+                            <span class="text-gray-600">客户总数</span>
+                            <span class="font-semibold text-purple-600" id="totalCustomers">128</span>
+                        </div>
+                        <div class="flex justify-between text-sm">
+                            <span class="text-gray-600">今日新增</span>
+                            <span class="font-semibold text-green-600" id="newCustomers">5</span>
+                        </div>
+                        <div class="flex justify-between text-sm">
+                            <span class="text-gray-600">待跟进</span>
+                            <span class="font-semibold text-orange-600" id="pendingCustomers">12</span>
+                        </div>
+                        <div class="flex justify-between text-sm">
+                            <span class="text-gray-600">本月订单</span>
+                            <span class="font-semibold text-blue-600" id="monthlyOrders">67</span>
+                        </div>
+                    </div>
+                </div>
+
+                <!-- 主导航菜单 -->
+                <div class="space-y-2">
+                    <h3 class="text-xs font-semibold text-gray-400 uppercase tracking-wider mb-3">主要功能</h3>
+                    <a href="index.html" class="flex items-center space-x-3 px-3 py-2 text-sm {ACTIVE_INDEX} rounded-lg transition-colors">
+                        <i data-lucide="layout-dashboard" class="w-4 h-4"></i>
+                        <span>数据看板</span>
+                    </a>
+                    <a href="customers.html" class="flex items-center space-x-3 px-3 py-2 text-sm {ACTIVE_CUSTOMERS} rounded-lg transition-colors">
+                        <i data-lucide="users" class="w-4 h-4"></i>
+                        <span>客户管理</span>
+                        <span class="ml-auto bg-purple-100 text-purple-800 text-xs px-2 py-0.5 rounded-full">128</span>
+                    </a>
+                    <a href="orders.html" class="flex items-center space-x-3 px-3 py-2 text-sm {ACTIVE_ORDERS} rounded-lg transition-colors">
+                        <i data-lucide="shopping-cart" class="w-4 h-4"></i>
+                        <span>订单管理</span>
+                        <span class="ml-auto bg-green-100 text-green-800 text-xs px-2 py-0.5 rounded-full">67</span>
+                    </a>
+                    <a href="tasks.html" class="flex items-center space-x-3 px-3 py-2 text-sm {ACTIVE_TASKS} rounded-lg transition-colors">
+                        <i data-lucide="check-square" class="w-4 h-4"></i>
+                        <span>任务管理</span>
+                        <span class="ml-auto bg-orange-100 text-orange-800 text-xs px-2 py-0.5 rounded-full">24</span>
+                    </a>
+                </div>
+
+                <!-- 智能服务 -->
+                <div class="space-y-2">
+                    <h3 class="text-xs font-semibold text-gray-400 uppercase tracking-wider mb-3">智能服务</h3>
+                    <a href="cases.html" class="flex items-center space-x-3 px-3 py-2 text-sm {ACTIVE_CASES} rounded-lg transition-colors">
+                        <i data-lucide="file-text" class="w-4 h-4"></i>
+                        <span>客户案例</span>
+                    </a>
+                    <a href="templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm {ACTIVE_TEMPLATES} rounded-lg transition-colors">
+                        <i data-lucide="layers" class="w-4 h-4"></i>
+                        <span>方案模板</span>
+                    </a>
+                    <a href="franchisees.html" class="flex items-center space-x-3 px-3 py-2 text-sm {ACTIVE_FRANCHISEES} rounded-lg transition-colors">
+                        <i data-lucide="store" class="w-4 h-4"></i>
+                        <span>加盟管理</span>
+                    </a>
+                    <a href="users.html" class="flex items-center space-x-3 px-3 py-2 text-sm {ACTIVE_USERS} rounded-lg transition-colors ml-4">
+                        <i data-lucide="user-cog" class="w-4 h-4"></i>
+                        <span>用户管理</span>
+                        <span class="ml-auto text-xs text-gray-500">(内部员工)</span>
+                    </a>
+                </div>
+
+                <!-- 系统管理 -->
+                <div class="space-y-2">
+                    <h3 class="text-xs font-semibold text-gray-400 uppercase tracking-wider mb-3">系统管理</h3>
+                    <a href="organizations.html" class="flex items-center space-x-3 px-3 py-2 text-sm {ACTIVE_ORGANIZATIONS} rounded-lg transition-colors">
+                        <i data-lucide="building-2" class="w-4 h-4"></i>
+                        <span>组织管理</span>
+                    </a>
+                    <a href="settings.html" class="flex items-center space-x-3 px-3 py-2 text-sm {ACTIVE_SETTINGS} rounded-lg transition-colors">
+                        <i data-lucide="settings" class="w-4 h-4"></i>
+                        <span>系统设置</span>
+                    </a>
+                </div>
+            </div>
+        </aside>'''
+
+
+# {ACTIVE_X} 占位符编译为插槽
+LEGACY_SIDEBAR = SlotTemplate(SIDEBAR_TEMPLATE, highlight_fragment(), pattern=r'\{ACTIVE_(\w+)\}')
+
+
+def get_sidebar_for_page(page_name):
+    """为指定页面生成侧边栏HTML"""
+    return LEGACY_SIDEBAR.render(PAGE_CONFIGS.get(page_name, ''))
+
+
+def replace_legacy_sidebar(content, page_name):
+    """用旧版标准侧边栏替换 <aside id="sidebar"> 元素"""
+    # 从 <aside id="sidebar" 到与之配对的 </aside>
+    aside = find_element(content, 'aside', {'id': 'sidebar'})
+    if aside is None:
+        return content, False
+    return splice(content, aside.outer, get_sidebar_for_page(page_name).strip()), True
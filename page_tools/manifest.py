@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+增量改写清单
+记录每个页面上次处理后的文件状态和内容哈希，重复执行时跳过没有变化的页面
+
+每个页面记录:
+    size / mtime_ns  文件大小和修改时间，只靠 stat 就能判断文件是否被改动
+    input            页面内容哈希
+    span             页面中侧边栏区段的哈希
+    render           该页面期望的侧边栏渲染结果哈希（涵盖菜单配置、模板和激活菜单）
+"""
+
+import hashlib
+import json
+import os
+
+from page_tools.fileio import write_atomic
+
+MANIFEST_NAME = '.sidebar-manifest.json'
+MANIFEST_VERSION = 1
+
+
+def content_hash(text):
+    """str、bytes 或 mmap 等缓冲区的 sha256"""
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return hashlib.sha256(text).hexdigest()
+
+
+def manifest_path(base_dir):
+    return os.path.join(base_dir, MANIFEST_NAME)
+
+
+def load_manifest(base_dir):
+    """读取清单，文件不存在、损坏或版本不符时返回空清单"""
+    try:
+        with open(manifest_path(base_dir), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != MANIFEST_VERSION:
+        return {}
+    return data.get('pages', {})
+
+
+def save_manifest(base_dir, pages):
+    data = {'version': MANIFEST_VERSION, 'pages': pages}
+    write_atomic(manifest_path(base_dir), json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True))
+
+
+def make_entry(st, input_hash, span_hash, render_hash):
+    return {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'input': input_hash,
+        'span': span_hash,
+        'render': render_hash,
+    }
+
+
+def stat_matches(entry, st):
+    """文件大小和修改时间都没变"""
+    return bool(entry) and entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns
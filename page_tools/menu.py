@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+侧边栏菜单树
+把侧边栏（<aside id="sidebar">，没有时为第一个 <nav>）一次解析成由分组、标题和菜单项组成的树，
+移动、插入和排序都是对树中节点列表的操作，不再对整页做字符串或正则匹配。
+
+每个节点保存自己的原始文本，lead 为它前面的空白和注释（如 "<!-- 二级菜单：用户管理和角色管理 -->"），
+序列化时按顺序拼接，没有改动的部分逐字节不变:
+    container   含有子节点的元素（<aside>、分组 <div>、<nav> 等），子节点之外的文本分为 open / tail / close
+    header      分组标题：<h3>，或只有文字（最多一个 <span>）的 <div>，如 "模板管理"
+    item        菜单链接 <a>，解析出 href、图标、名称、徽标、缩进层级和高亮状态
+    block       其余元素（快速统计等），原样保留
+分组（MenuSection）是某个标题之后、同一容器中下一个标题之前的兄弟节点，
+因此 <div class="space-y-2"><h3>系统管理</h3>...</div> 和 nav-link 风格侧边栏中平铺的标题都能按名称找到。
+
+移动和插入时节点连同它的 lead 一起移动；排序时 lead 留在原来的位置，
+分组开头的说明注释（如 "<!-- 模板管理二级菜单 -->"）不会跟着第一项走。
+"""
+
+import re
+
+from page_tools.render import ACTIVE_HIGHLIGHT, DEFAULT_HIGHLIGHT
+from page_tools.scanner import ATTRS, VOID_ELEMENTS, find_element, parse_attrs
+from page_tools.sidebar import TEMPLATE_FILE_SLOT, template_file_slot
+from page_tools.spans import Span, locate_sidebar, splice
+
+TOKEN_PATTERN = re.compile(
+    rf'<!--.*?-->|<(?P<close>/)?(?P<name>[A-Za-z][\w:-]*)(?P<attrs>{ATTRS})(?P<selfclose>/)?>',
+    re.S,
+)
+CONTAINER_TAGS = frozenset({'div', 'nav', 'aside', 'ul', 'li', 'section'})
+ICON_PATTERN = re.compile(r'data-lucide="([^"]*)"')
+LABEL_PATTERN = re.compile(r'<span>([^<]*)</span>')
+BADGE_PATTERN = re.compile(r'\s*<span class="ml-auto[^"]*">([^<]*)</span>')
+INDENT_PATTERN = re.compile(r'\bml-(\d+)\b')
+TAG_PATTERN = re.compile(r'<[^>]*>')
+SLOT_PATTERN = re.compile(TEMPLATE_FILE_SLOT)
+
+
+class _Element:
+    """第一遍扫描得到的元素区间"""
+
+    __slots__ = ('name', 'start', 'open_end', 'close_start', 'end', 'children')
+
+    def __init__(self, name, start, open_end):
+        self.name = name
+        self.start = start
+        self.open_end = open_end
+        self.close_start = self.end = open_end
+        self.children = []
+
+
+def _scan(content, start, end):
+    """一次扫描 [start, end) 中的标签，返回最外层元素；多余的结束标签忽略，没有结束的元素在 end 处结束"""
+    root = _Element('', start, start)
+    stack = [root]
+    for match in TOKEN_PATTERN.finditer(content, start, end):
+        name = match.group('name')
+        if name is None:
+            continue
+        name = name.lower()
+        if match.group('close'):
+            if any(element.name == name for element in stack[1:]):
+                while True:
+                    element = stack.pop()
+                    if element.name == name:
+                        element.close_start, element.end = match.start(), match.end()
+                        break
+                    # 没有结束标签的内层元素在这里结束
+                    element.close_start = element.end = match.start()
+            continue
+        element = _Element(name, match.start(), match.end())
+        stack[-1].children.append(element)
+        if not (match.group('selfclose') or name in VOID_ELEMENTS):
+            stack.append(element)
+    for element in stack[1:]:
+        element.close_start = element.end = end
+    return root.children[0] if root.children else None
+
+
+class MenuNode:
+    """菜单树节点；kind 为 container / header / block，菜单项见 MenuItem"""
+
+    __slots__ = ('kind', 'lead', 'open', 'children', 'tail', 'close', 'title')
+
+    def __init__(self, kind, lead, open, children=None, tail='', close='', title=None):
+        self.kind = kind
+        self.lead = lead
+        self.open = open
+        self.children = children or []
+        self.tail = tail
+        self.close = close
+        self.title = title
+
+    def serialize(self):
+        parts = []
+        self._write(parts)
+        return ''.join(parts)
+
+    def _write(self, parts):
+        parts.append(self.lead)
+        parts.append(self.open)
+        for child in self.children:
+            child._write(parts)
+        parts.append(self.tail)
+        parts.append(self.close)
+
+    def walk(self):
+        """深度优先遍历子树（包括自己）"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.kind} {self.title or ""}>'
+
+
+class MenuItem(MenuNode):
+    """菜单链接；open 为整个 <a> 元素的原始文本"""
+
+    # slot: 模板文件（_sidebar-template.html）中的高亮插槽，如 {{ACTIVE_CUSTOMERS}}，普通页面为 None
+    __slots__ = ('href', 'icon', 'label', 'badge', 'indent', 'active', 'slot')
+
+    def __init__(self, lead, text):
+        super().__init__('item', lead, text)
+        attrs = parse_attrs(text[:text.find('>') + 1])
+        classes = attrs.get('class', '').split()
+        icon = ICON_PATTERN.search(text)
+        label = LABEL_PATTERN.search(text)
+        badge = BADGE_PATTERN.search(text)
+        indent = INDENT_PATTERN.search(attrs.get('class', ''))
+        slot = SLOT_PATTERN.search(attrs.get('class', ''))
+        self.href = attrs.get('href')
+        self.icon = icon.group(1) if icon else None
+        self.label = label.group(1).strip() if label else None
+        self.badge = badge.group(1).strip() if badge else None
+        # ml-4 为一级缩进
+        self.indent = int(indent.group(1)) // 4 if indent else 0
+        self.active = set(ACTIVE_HIGHLIGHT.split()) <= set(classes)
+        self.slot = slot.group() if slot else None
+
+    def copy(self, href, icon, label, lead=None):
+        """
+        以本项的样式和缩进生成新菜单项：替换链接、图标和名称，去掉徽标和高亮
+        本项带高亮插槽时换成新链接自己的插槽，否则新项会和本项在同一个页面上一起高亮
+        """
+        text = self.open.replace(f'href="{self.href}"', f'href="{href}"', 1)
+        if self.icon is not None:
+            text = text.replace(f'data-lucide="{self.icon}"', f'data-lucide="{icon}"', 1)
+        text = LABEL_PATTERN.sub(lambda m: f'<span>{label}</span>', text, count=1)
+        text = BADGE_PATTERN.sub('', text, count=1)
+        if self.active:
+            text = text.replace(ACTIVE_HIGHLIGHT, DEFAULT_HIGHLIGHT, 1)
+        if self.slot is not None:
+            text = text.replace(self.slot, template_file_slot(href), 1)
+        item = MenuItem(self.lead if lead is None else lead, text)
+        if item.slot is not None and item.slot == self.slot and item.href != self.href:
+            raise ValueError(f'{href} 复制后与 {self.href} 共用高亮插槽 {self.slot}')
+        return item
+
+
+def _indent_lead(lead):
+    """lead 的最后一行缩进，作为新插入节点的 lead"""
+    newline = lead.rfind('\n')
+    return lead[newline:] if newline >= 0 else lead
+
+
+def _convert(content, element, lead):
+    """把元素区间转换为菜单树节点"""
+    text = content[element.start:element.end]
+    if element.name == 'a':
+        return MenuItem(lead, text)
+    if element.name == 'h3':
+        return MenuNode('header', lead, text, title=TAG_PATTERN.sub('', text).strip())
+
+    if not any(child.name in CONTAINER_TAGS or child.name in ('a', 'h3') for child in element.children):
+        spans = sum(child.name == 'span' for child in element.children)
+        title = TAG_PATTERN.sub('', text).strip()
+        if element.name == 'div' and spans <= 1 and title:
+            return MenuNode('header', lead, text, title=title)
+        return MenuNode('block', lead, text)
+
+    children = []
+    pos = element.open_end
+    for child in element.children:
+        children.append(_convert(content, child, content[pos:child.start]))
+        pos = child.end
+    return MenuNode('container', lead, content[element.start:element.open_end], children,
+                    content[pos:element.close_start], content[element.close_start:element.end])
+
+
+def parse_node(text, lead=''):
+    """
+    把一段只含一个元素的菜单标记（如新建的模板管理分组）解析成节点，用于插入到已有的菜单树中
+    元素前面的注释和缩进接在 lead 后面
+    """
+    element = _scan(text, 0, len(text))
+    if element is None:
+        raise ValueError('菜单标记中没有元素')
+    return _convert(text, element, lead + text[:element.start])
+
+
+class MenuSection:
+    """容器 parent 中 [start, end) 的兄弟节点，即标题 title 下面的内容"""
+
+    __slots__ = ('title', 'parent', 'start', 'end')
+
+    def __init__(self, title, parent, start, end):
+        self.title = title
+        self.parent = parent
+        self.start = start
+        self.end = end
+
+    @property
+    def nodes(self):
+        return self.parent.children[self.start:self.end]
+
+    def items(self):
+        """分组中直接包含的菜单项"""
+        return [node for node in self.nodes if node.kind == 'item']
+
+    def index(self, href):
+        """菜单项在 parent.children 中的位置，找不到时返回 -1"""
+        for i in range(self.start, self.end):
+            node = self.parent.children[i]
+            if node.kind == 'item' and node.href == href:
+                return i
+        return -1
+
+    def get(self, href):
+        i = self.index(href)
+        return self.parent.children[i] if i >= 0 else None
+
+    def remove(self, href):
+        """取出菜单项（连同 lead），找不到时返回 None"""
+        i = self.index(href)
+        if i < 0:
+            return None
+        self.end -= 1
+        return self.parent.children.pop(i)
+
+    def insert(self, node, after=None, before=None):
+        """把节点插到 after 之后或 before 之前（都不给时放到分组末尾）；参照项不存在时返回 False"""
+        if after is not None or before is not None:
+            anchor = self.index(after if after is not None else before)
+            if anchor < 0:
+                return False
+            position = anchor + 1 if after is not None else anchor
+        else:
+            position = self.end
+        self.parent.children.insert(position, node)
+        self.end += 1
+        return True
+
+    def insert_copy(self, anchor, href, icon, label):
+        """以 anchor 菜单项的样式在它后面插入新菜单项，返回新项；anchor 不存在时返回 None"""
+        template = self.get(anchor)
+        if template is None:
+            return None
+        item = template.copy(href, icon, label, lead=_indent_lead(template.lead))
+        self.insert(item, after=anchor)
+        return item
+
+    def move(self, href, after=None, before=None):
+        """
+        把菜单项移到 after 之后或 before 之前，已经在目标位置时不改动
+        返回是否找到两个菜单项
+        """
+        target = after if after is not None else before
+        i = self.index(href)
+        anchor = self.index(target)
+        if i < 0 or anchor < 0:
+            return False
+        if (after is not None and i == anchor + 1) or (before is not None and i == anchor - 1):
+            return True
+        node = self.remove(href)
+        return self.insert(node, after=after, before=before)
+
+    def reorder(self, hrefs):
+        """
+        把 hrefs 中的菜单项按给出的顺序放回它们原来占用的位置，其余节点不动
+        各位置的 lead 保持不变；不在分组中的 href 忽略
+        """
+        rank = {href: n for n, href in enumerate(hrefs)}
+        slots = [i for i in range(self.start, self.end)
+                 if self.parent.children[i].kind == 'item' and self.parent.children[i].href in rank]
+        nodes = sorted((self.parent.children[i] for i in slots), key=lambda node: rank[node.href])
+        leads = [self.parent.children[i].lead for i in slots]
+        for i, node, lead in zip(slots, nodes, leads):
+            node.lead = lead
+            self.parent.children[i] = node
+
+
+class MenuTree:
+    """页面中的侧边栏菜单树；span 为解析的区间，serialize() 返回改动后的整个页面"""
+
+    __slots__ = ('content', 'span', 'root')
+
+    def __init__(self, content, span, root):
+        self.content = content
+        self.span = span
+        self.root = root
+
+    @classmethod
+    def parse(cls, content):
+        """解析页面中的侧边栏，找不到 <aside id="sidebar"> 或 <nav> 时返回 None"""
+        layout = locate_sidebar(content)
+        if layout is not None:
+            span = layout.aside
+        else:
+            nav = find_element(content, 'nav')
+            if nav is None:
+                return None
+            span = nav.outer
+        element = _scan(content, span.start, span.end)
+        if element is None:
+            return None
+        return cls(content, Span(element.start, element.end), _convert(content, element, ''))
+
+    def items(self):
+        """侧边栏中的所有菜单项，按文档顺序"""
+        return [node for node in self.root.walk() if node.kind == 'item']
+
+    def find(self, href):
+        """第一个链接到 href 的菜单项，没有时返回 None"""
+        return next((item for item in self.items() if item.href == href), None)
+
+    def _section_at(self, parent, index):
+        """parent.children[index] 所在的分组：前后最近的两个标题之间"""
+        children = parent.children
+        start = next((i + 1 for i in range(index, -1, -1) if children[i].kind == 'header'), 0)
+        end = next((i for i in range(index + 1, len(children)) if children[i].kind == 'header'), len(children))
+        title = children[start - 1].title if start else None
+        return MenuSection(title, parent, start, end)
+
+    def section(self, title):
+        """按标题找分组，没有时返回 None"""
+        for node in self.root.walk():
+            for i, child in enumerate(node.children):
+                if child.kind == 'header' and child.title == title:
+                    return self._section_at(node, i)
+        return None
+
+    def section_of(self, href):
+        """链接到 href 的第一个菜单项所在的分组，没有时返回 None"""
+        for node in self.root.walk():
+            for i, child in enumerate(node.children):
+                if child.kind == 'item' and child.href == href:
+                    return self._section_at(node, i)
+        return None
+
+    def serialize(self):
+        """把菜单树写回页面；没有改动时与原页面逐字节相同"""
+        return splice(self.content, self.span, self.root.serialize())
+
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+安全的 HTML 压缩
+只做不改变页面渲染结果的处理:
+    - 删除注释（保留 <!--[if ...]> 条件注释）
+    - 文本中的连续空白压缩为一个：包含换行时保留一个换行，否则保留一个空格
+以下内容原样保留:
+    - <script>、<style>、<pre>、<textarea> 元素
+    - class 含 whitespace-pre / whitespace-pre-wrap / whitespace-pre-line 的元素（Tailwind 的 white-space: pre*）
+    - 标签本身（属性值中的空白可能有意义）
+只处理 HTML 空白字符（空格、制表、换行、换页），不动 &nbsp; 和全角空格。
+"""
+
+import re
+
+from page_tools.scanner import ATTRS, find_element, parse_attrs
+
+PRESERVED_ELEMENTS = ('script', 'style', 'pre', 'textarea')
+PRESERVED_CLASS_PREFIX = 'whitespace-pre'
+
+TOKEN_PATTERN = re.compile(
+    r'(?P<comment><!--(?P<conditional>\[if)?.*?-->)'
+    rf'|(?P<raw><(?P<raw_name>{"|".join(PRESERVED_ELEMENTS)})\b{ATTRS}>.*?</(?P=raw_name)\s*>)'
+    rf'|(?P<tag><(?P<close>/)?(?P<name>[A-Za-z][\w:-]*)(?P<attrs>{ATTRS})/?>)'
+    r'|(?P<decl><![^>]*>)',
+    re.S | re.I,
+)
+
+WHITESPACE = re.compile(r'[ \t\n\r\f]+')
+
+
+def _collapse(match):
+    return '\n' if '\n' in match.group() else ' '
+
+
+def collapse_whitespace(text):
+    return WHITESPACE.sub(_collapse, text)
+
+
+def _preserved_class(attrs_text):
+    if PRESERVED_CLASS_PREFIX not in attrs_text:
+        return None
+    classes = parse_attrs(attrs_text).get('class', '').split()
+    return next((name for name in classes if name.startswith(PRESERVED_CLASS_PREFIX)), None)
+
+
+def minify_html(content):
+    """返回压缩后的 HTML"""
+    out = []
+    text = []
+    pos = 0
+
+    def flush(end):
+        text.append(content[pos:end])
+        out.append(collapse_whitespace(''.join(text)))
+        text.clear()
+
+    for match in TOKEN_PATTERN.finditer(content):
+        if match.start() < pos:
+            # 位于已原样保留的元素内部
+            continue
+
+        if match.group('comment') and not match.group('conditional'):
+            # 注释两侧的文本合并后再压缩空白
+            text.append(content[pos:match.start()])
+            pos = match.end()
+            continue
+
+        flush(match.start())
+        end = match.end()
+        if match.group('tag') and not match.group('close'):
+            css_class = _preserved_class(match.group('attrs'))
+            if css_class:
+                element = find_element(content, match.group('name'), {'class': css_class}, start=match.start())
+                if element is not None and element.outer.start == match.start():
+                    end = element.outer.end
+        out.append(content[match.start():end])
+        pos = end
+
+    flush(len(content))
+    return ''.join(out)
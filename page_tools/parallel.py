@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+多进程执行逐页任务
+每个页面在进程池中独立处理，打印内容先在子进程中缓存，再按页面顺序输出，
+因此 --jobs N 的输出和成功/失败统计与串行执行完全一致
+"""
+
+import contextlib
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+def resolve_jobs(jobs):
+    """--jobs 0 表示使用全部CPU核心"""
+    if jobs is None or jobs < 0:
+        return 1
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _call_captured(func, args):
+    """在子进程中执行 func(*args)，返回 (打印内容, 返回值)"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        result = func(*args)
+    return buffer.getvalue(), result
+
+
+def run_pages(func, tasks, jobs=1):
+    """
+    对 tasks 中的每组参数执行 func(*args)，按 tasks 的顺序返回结果列表
+    jobs > 1 时使用进程池，func 必须是模块级函数（可以被 pickle）
+    """
+    tasks = list(tasks)
+    jobs = min(resolve_jobs(jobs), len(tasks))
+    if jobs <= 1:
+        return [func(*args) for args in tasks]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_call_captured, func, args) for args in tasks]
+        # 按提交顺序取结果，前面的页面一完成就立即输出
+        for future in futures:
+            output, result = future.result()
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            results.append(result)
+    return results
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+静态文件预压缩
+遍历整个输出目录，为页面和各阶段生成的文件（js/、css/，以及 icons 阶段的雪碧图 icons/lucide.<哈希>.svg、
+兼容脚本 js/lucide-sprite.<哈希>.js）生成最高压缩级别的 .gz 和 .deflate（zlib 格式，即 HTTP 的 deflate 编码）副本，
+服务器直接发送预压缩的字节（nginx gzip_static，api/app.js 中的预压缩中间件），不再每次请求都压缩。
+
+各文件的 SHA-256 和保留的副本记录在输出目录的 .precompress.json 中，内容没变且副本都在的文件直接跳过；
+需要压缩的文件用进程池并行处理。压缩后不比原文件小的副本不保留。
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import zlib
+
+from page_tools.fileio import commit_temp, write_temp
+from page_tools.parallel import run_pages
+
+CACHE_FILE = '.precompress.json'
+
+COMPRESS_EXTS = ('.html', '.js', '.css', '.svg', '.json', '.txt')
+
+# 扩展名 -> 压缩函数
+ENCODINGS = {
+    '.gz': lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+    '.deflate': lambda data: zlib.compress(data, 9),
+}
+
+
+def iter_sources(out_dir):
+    """输出目录中需要预压缩的文件（相对路径）"""
+    for root, dirs, names in os.walk(out_dir):
+        dirs.sort()
+        for name in sorted(names):
+            if name.endswith(COMPRESS_EXTS) and not name.startswith('.'):
+                yield os.path.relpath(os.path.join(root, name), out_dir)
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_cache(out_dir):
+    try:
+        with open(os.path.join(out_dir, CACHE_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(out_dir, cache):
+    temp_path, _ = write_temp(os.path.join(out_dir, CACHE_FILE),
+                              [json.dumps(cache, indent=1, sort_keys=True).encode('utf-8')])
+    commit_temp(temp_path, os.path.join(out_dir, CACHE_FILE))
+
+
+def compress_file(out_dir, relpath):
+    """
+    生成一个文件的所有压缩副本（在子进程中执行）
+    返回 (相对路径, 原大小, {扩展名: 压缩后大小，未保留时为 None})
+    """
+    path = os.path.join(out_dir, relpath)
+    with open(path, 'rb') as f:
+        data = f.read()
+    sizes = {}
+    for ext, compress in ENCODINGS.items():
+        packed = compress(data)
+        if len(packed) < len(data):
+            temp_path, _ = write_temp(path + ext, [packed])
+            commit_temp(temp_path, path + ext)
+            sizes[ext] = len(packed)
+        else:
+            if os.path.exists(path + ext):
+                os.remove(path + ext)
+            sizes[ext] = None
+    return relpath, len(data), sizes
+
+
+def prune_stale(out_dir, sources):
+    """删除原文件已不存在的压缩副本，返回删除的数量"""
+    removed = 0
+    for root, _, names in os.walk(out_dir):
+        for name in names:
+            base, ext = os.path.splitext(name)
+            if ext in ENCODINGS and base.endswith(COMPRESS_EXTS):
+                relpath = os.path.relpath(os.path.join(root, base), out_dir)
+                if relpath not in sources:
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+    return removed
+
+
+def precompress(out_dir, jobs=1):
+    """
+    预压缩输出目录，返回 (压缩的文件, 跳过的文件数, 删除的过期副本数)
+    压缩的文件为 compress_file 的结果列表
+    """
+    cache = load_cache(out_dir)
+    sources = list(iter_sources(out_dir))
+    digests = {relpath: file_digest(os.path.join(out_dir, relpath)) for relpath in sources}
+
+    def up_to_date(relpath):
+        entry = cache.get(relpath)
+        return entry is not None and entry['sha256'] == digests[relpath] and all(
+            os.path.exists(os.path.join(out_dir, relpath + ext)) for ext in entry['kept'])
+
+    pending = [relpath for relpath in sources if not up_to_date(relpath)]
+    results = run_pages(compress_file, [(out_dir, relpath) for relpath in pending], jobs)
+
+    cache = {relpath: cache[relpath] for relpath in set(sources).difference(pending)}
+    for relpath, _, sizes in results:
+        cache[relpath] = {
+            'sha256': digests[relpath],
+            'kept': [ext for ext, size in sizes.items() if size is not None],
+        }
+    save_cache(out_dir, cache)
+    return results, len(sources) - len(pending), prune_stale(out_dir, set(sources))
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+页面改写的逐页性能剖析（--profile）
+每个页面记录各阶段的墙钟时间和 CPU 时间、读写字节数，以及改写过程中 re 模块函数的调用和匹配次数，
+汇总为 JSON 报告并打印最慢的页面。--cprofile 可以对单个页面额外输出 cProfile 统计。
+"""
+
+import contextlib
+import cProfile
+import json
+import platform
+import pstats
+import re
+import sys
+import time
+
+# 默认报告文件
+PROFILE_REPORT = 'page-profile.json'
+CPROFILE_OUTPUT = 'page-profile.prof'
+
+# 统计匹配次数的 re 模块函数
+REGEX_FUNCTIONS = ('search', 'match', 'fullmatch', 'sub', 'subn', 'findall', 'finditer')
+
+
+class PageProfile:
+    """单个页面的剖析记录"""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.phases = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.regex = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.phases.setdefault(name, [0.0, 0.0])
+            totals[0] += time.perf_counter() - wall
+            totals[1] += time.process_time() - cpu
+
+    def add_read(self, size):
+        self.bytes_read += size
+
+    def add_written(self, size):
+        self.bytes_written += size
+
+    def add_regex(self, pattern, matches):
+        key = pattern if isinstance(pattern, str) else getattr(pattern, 'pattern', str(pattern))
+        if len(key) > 60:
+            key = key[:57] + '...'
+        counts = self.regex.setdefault(key, {'calls': 0, 'matches': 0})
+        counts['calls'] += 1
+        counts['matches'] += matches
+
+    def to_dict(self):
+        return {
+            'filepath': self.filepath,
+            'wall_ms': round(sum(wall for wall, _ in self.phases.values()) * 1000, 4),
+            'cpu_ms': round(sum(cpu for _, cpu in self.phases.values()) * 1000, 4),
+            'phases': {
+                name: {'wall_ms': round(wall * 1000, 4), 'cpu_ms': round(cpu * 1000, 4)}
+                for name, (wall, cpu) in self.phases.items()
+            },
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'regex': self.regex,
+        }
+
+
+class NullProfile:
+    """不剖析时使用，所有记录都是空操作"""
+
+    def phase(self, name):
+        return contextlib.nullcontext()
+
+    def add_read(self, size):
+        pass
+
+    def add_written(self, size):
+        pass
+
+    def add_regex(self, pattern, matches):
+        pass
+
+
+NULL_PROFILE = NullProfile()
+
+
+def _counting(profile, name, originals):
+    """包装 re 模块函数，记录调用次数和匹配（替换）次数"""
+    func = originals[name]
+
+    def wrapper(pattern, *args, **kwargs):
+        if name == 'sub':
+            # 用原始的 subn 取得替换次数，结果与 re.sub 相同
+            result, matches = originals['subn'](pattern, *args, **kwargs)
+            profile.add_regex(pattern, matches)
+            return result
+        result = func(pattern, *args, **kwargs)
+        if name == 'subn':
+            matches = result[1]
+        elif name == 'findall':
+            matches = len(result)
+        elif name == 'finditer':
+            result = list(result)
+            matches = len(result)
+            result = iter(result)
+        else:
+            matches = 1 if result is not None else 0
+        profile.add_regex(pattern, matches)
+        return result
+    return wrapper
+
+
+@contextlib.contextmanager
+def count_regex(profile):
+    """
+    在 with 块内统计 re.search / re.sub 等模块函数的调用和匹配次数
+    只统计通过 re 模块函数发起的匹配，预编译 pattern 对象的方法不在统计范围内
+    """
+    if isinstance(profile, NullProfile):
+        yield
+        return
+
+    originals = {name: getattr(re, name) for name in REGEX_FUNCTIONS}
+    try:
+        for name in originals:
+            setattr(re, name, _counting(profile, name, originals))
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(re, name, func)
+
+
+def run_cprofile(func, args, output):
+    """在 cProfile 下执行 func(*args)，统计写入 output，返回 func 的返回值"""
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        profiler.dump_stats(output)
+
+
+def print_cprofile(output, limit=15):
+    print(f"\ncProfile 统计 ({output})，按累计时间排序:")
+    pstats.Stats(output, stream=sys.stdout).sort_stats('cumulative').print_stats(limit)
+
+
+def summarize(pages):
+    """按阶段汇总所有页面的耗时和字节数"""
+    phases = {}
+    for page in pages:
+        for name, values in page['phases'].items():
+            totals = phases.setdefault(name, {'wall_ms': 0.0, 'cpu_ms': 0.0})
+            totals['wall_ms'] += values['wall_ms']
+            totals['cpu_ms'] += values['cpu_ms']
+    return {
+        'pages': len(pages),
+        'wall_ms': round(sum(page['wall_ms'] for page in pages), 4),
+        'cpu_ms': round(sum(page['cpu_ms'] for page in pages), 4),
+        'bytes_read': sum(page['bytes_read'] for page in pages),
+        'bytes_written': sum(page['bytes_written'] for page in pages),
+        'phases': {name: {key: round(value, 4) for key, value in totals.items()} for name, totals in phases.items()},
+    }
+
+
+def write_report(output, pages, command):
+    """写出 JSON 报告，返回汇总数据"""
+    summary = summarize(pages)
+    data = {
+        'command': command,
+        'python': platform.python_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'summary': summary,
+        'pages': sorted(pages, key=lambda page: page['wall_ms'], reverse=True),
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def print_profile_summary(pages, summary, output, limit=5):
+    """打印各阶段合计和最慢的几个页面"""
+    print()
+    print('=' * 60)
+    print(f"性能剖析: {summary['pages']} 个页面, 墙钟 {summary['wall_ms']:.2f} ms, CPU {summary['cpu_ms']:.2f} ms, "
+          f"读 {summary['bytes_read']} 字节, 写 {summary['bytes_written']} 字节")
+    for name, totals in sorted(summary['phases'].items(), key=lambda item: item[1]['wall_ms'], reverse=True):
+        print(f"  {name:<30}{totals['wall_ms']:>10.2f} ms{totals['cpu_ms']:>10.2f} ms CPU")
+    print('-' * 60)
+    print('最慢的页面:')
+    for page in sorted(pages, key=lambda page: page['wall_ms'], reverse=True)[:limit]:
+        slowest = max(page['phases'].items(), key=lambda item: item[1]['wall_ms'], default=('-', {'wall_ms': 0}))
+        matches = sum(counts['matches'] for counts in page['regex'].values())
+        print(f"  {page['wall_ms']:>8.2f} ms  {page['filepath']} "
+              f"(最慢阶段 {slowest[0]} {slowest[1]['wall_ms']:.2f} ms, 正则匹配 {matches} 次)")
+    print(f'[OK] 剖析报告已保存: {output}')
+    print('=' * 60)
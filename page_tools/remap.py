@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+多模式替换
+把一组 旧文本 -> 新文本 的映射编译成一个 Aho-Corasick 自动机，对页面只扫描一遍就找出所有键的出现位置，
+按"最左最长、互不重叠"选出匹配后一次拼接出新内容。替换结果不会再被其它键匹配（不会链式替换），
+每个键的替换次数单独统计。
+
+每组映射可以限定出现的上下文（RemapRule.contexts）:
+    text        HTML 文本节点
+    attribute   标签的属性值（不含引号）
+    quoted      <script> 中的字符串和模板字符串内容（不含引号）
+    code        <script>/<style> 中字符串以外的代码
+    any         不限制（默认，不需要分析页面结构）
+注释、标签名和属性名不属于以上任何上下文，只有 any 会匹配。whole 为 True 时匹配的前后必须是同一种引号，
+即整个字符串或属性值等于键，如 'hydration' 和 value="hydration" 命中，而 filter-hydration 不命中。
+"""
+
+import bisect
+import re
+from collections import Counter, namedtuple
+
+from page_tools.jslex import JS_TYPES, iter_tokens
+from page_tools.scanner import ATTR_PATTERN, ATTRS, parse_attrs
+
+CONTEXTS = ('text', 'attribute', 'quoted', 'code', 'any')
+QUOTES = '\'"`'
+
+# mapping: 旧文本 -> 新文本；contexts: 允许的上下文；whole: 是否要求前后是同一种引号
+RemapRule = namedtuple('RemapRule', ['mapping', 'contexts', 'whole'], defaults=[('any',), False])
+
+HTML_PATTERN = re.compile(
+    r'(?P<comment><!--.*?-->)'
+    rf'|<(?P<raw>script|style)\b(?P<raw_attrs>{ATTRS})>(?P<body>.*?)</(?P=raw)\s*>'
+    rf'|</?[A-Za-z][\w:-]*(?P<attrs>{ATTRS})/?>',
+    re.S | re.I,
+)
+ATTR_VALUE_PATTERN = re.compile(ATTR_PATTERN)
+
+
+class Automaton:
+    """Aho-Corasick 自动机：goto 为各状态的转移，fail 为失败链接，output 为在该状态结束的最长键"""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.goto = [{}]
+        self.output = [None]
+        for index, key in enumerate(self.keys):
+            if not key:
+                raise ValueError('替换的键不能为空')
+            state = 0
+            for ch in key:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.output.append(None)
+                state = nxt
+            self.output[state] = index
+
+        # 按层次计算失败链接；link 指向失败链上最近的、有键结束的状态，用来列出所有在此结束的键
+        self.fail = [0] * len(self.goto)
+        self.link = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                fail = self.fail[state]
+                while fail and ch not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[nxt] = self.goto[fail].get(ch, 0)
+                target = self.fail[nxt]
+                self.link[nxt] = target if self.output[target] is not None else self.link[target]
+                queue.append(nxt)
+
+    def iter_matches(self, text):
+        """一遍扫描，按结束位置顺序生成 (起点, 终点, 键序号)，包括互相重叠的匹配"""
+        goto, fail, output, link = self.goto, self.fail, self.output, self.link
+        root = goto[0]
+        state = 0
+        for i, ch in enumerate(text):
+            if not state and ch not in root:
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            node = state if output[state] is not None else link[state]
+            while node:
+                index = output[node]
+                yield i + 1 - len(self.keys[index]), i + 1, index
+                node = link[node]
+
+
+def _script_regions(content, start, end):
+    """脚本中字符串内容的区间 [(起点, 终点)]；无法分词时整段按代码处理"""
+    source = content[start:end]
+    regions = []
+    after_template = False
+    try:
+        for token in iter_tokens(source):
+            if token.kind == 'value' and source[token.start] in '\'"':
+                regions.append((token.start + 1, token.end - 1))
+            elif token.kind == 'value' and (after_template or source[token.start] == '`'):
+                regions.append((token.start + (not after_template), token.end - 1))
+            elif token.text == '${' and (after_template or source[token.start] == '`'):
+                regions.append((token.start + (not after_template), token.end - 2))
+            after_template = token.text == '}$'
+    except ValueError:
+        return []
+    return [(start + s, start + e) for s, e in regions if e > s]
+
+
+def classify_contexts(content):
+    """把页面分成上下文区间，返回按起点排序的 [(起点, 终点, 上下文)]；注释、标签名等不在任何区间中"""
+    regions = []
+
+    def add_attrs(offset, text):
+        for match in ATTR_VALUE_PATTERN.finditer(text):
+            for group in (2, 3, 4):
+                if match.group(group):
+                    regions.append((offset + match.start(group), offset + match.end(group), 'attribute'))
+
+    pos = 0
+    for match in HTML_PATTERN.finditer(content):
+        if match.start() > pos:
+            regions.append((pos, match.start(), 'text'))
+        pos = match.end()
+        if match.group('comment'):
+            continue
+        if not match.group('raw'):
+            add_attrs(match.start('attrs'), match.group('attrs'))
+            continue
+
+        add_attrs(match.start('raw_attrs'), match.group('raw_attrs'))
+        start, end = match.span('body')
+        strings = []
+        if match.group('raw').lower() == 'script' \
+                and parse_attrs(match.group('raw_attrs')).get('type', '').lower() in JS_TYPES:
+            strings = _script_regions(content, start, end)
+        for s, e in strings:
+            if s > start:
+                regions.append((start, s, 'code'))
+            regions.append((s, e, 'quoted'))
+            start = e
+        if end > start:
+            regions.append((start, end, 'code'))
+    if len(content) > pos:
+        regions.append((pos, len(content), 'text'))
+    return regions
+
+
+class Remapper:
+    """
+    把若干组映射编译成一个自动机；同一个键只能出现在一组映射中
+    remap(content) 返回 (新内容, Counter{键: 替换次数})
+    """
+
+    def __init__(self, rules):
+        self.rules = [rule if isinstance(rule, RemapRule) else RemapRule(*rule) for rule in rules]
+        keys = []
+        self.replacements = []
+        self.key_rules = []
+        seen = set()
+        for rule in self.rules:
+            unknown = set(rule.contexts) - set(CONTEXTS)
+            if unknown:
+                raise ValueError(f"未知的上下文: {', '.join(sorted(unknown))}（可用: {', '.join(CONTEXTS)}）")
+            for old, new in rule.mapping.items():
+                if old in seen:
+                    raise ValueError(f'重复的键: {old!r}')
+                seen.add(old)
+                keys.append(old)
+                self.replacements.append(new)
+                self.key_rules.append(rule)
+        self.automaton = Automaton(keys)
+        self.needs_contexts = any('any' not in rule.contexts for rule in self.rules)
+
+    def find(self, content):
+        """选出要替换的匹配：按起点排序、互不重叠，同一起点取最长；返回 [(起点, 终点, 键序号)]"""
+        regions = classify_contexts(content) if self.needs_contexts else []
+        starts = [start for start, _, _ in regions]
+
+        def allowed(start, end, rule):
+            if rule.whole and not (0 < start and end < len(content)
+                                   and content[start - 1] == content[end] and content[end] in QUOTES):
+                return False
+            if 'any' in rule.contexts:
+                return True
+            index = bisect.bisect_right(starts, start) - 1
+            return index >= 0 and end <= regions[index][1] and regions[index][2] in rule.contexts
+
+        longest = {}
+        for start, end, index in self.automaton.iter_matches(content):
+            if end > longest.get(start, (start,))[0] and allowed(start, end, self.key_rules[index]):
+                longest[start] = (end, index)
+
+        matches = []
+        pos = 0
+        for start in sorted(longest):
+            if start >= pos:
+                end, index = longest[start]
+                matches.append((start, end, index))
+                pos = end
+        return matches
+
+    def remap(self, content):
+        counts = Counter()
+        parts = []
+        pos = 0
+        for start, end, index in self.find(content):
+            parts.append(content[pos:start])
+            parts.append(self.replacements[index])
+            counts[self.automaton.keys[index]] += 1
+            pos = end
+        if not parts:
+            return content, counts
+        parts.append(content[pos:])
+        return ''.join(parts), counts
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+预编译的插槽模板
+模板只解析一次，拆成静态片段和插槽；每个插槽的激活/普通两种片段在编译时渲染并缓存。
+渲染一个页面只需换上激活插槽的片段再做一次 join。
+个别页面自己调整过的布局登记为变体（with_variants），渲染该页面时再换上对应的静态片段。
+
+同一种编译形式用于:
+    标准侧边栏骨架         {index}、{customers} ...
+    旧版侧边栏模板         {ACTIVE_INDEX}、{ACTIVE_CUSTOMERS} ...
+    智能服务分组模板       {cases_highlight}、{users_highlight} ...
+"""
+
+import copy
+import re
+
+# 默认插槽写法：{name}
+SLOT_PATTERN = r'\{(\w+)\}'
+
+# 高亮类名
+ACTIVE_HIGHLIGHT = 'text-blue-600 bg-blue-50 font-medium'
+DEFAULT_HIGHLIGHT = 'text-gray-700 hover:bg-gray-50'
+
+
+def highlight_fragment(active_value=ACTIVE_HIGHLIGHT, inactive_value=DEFAULT_HIGHLIGHT):
+    """插槽内容只是高亮类名时使用的片段函数"""
+    def fragment(name, active):
+        return active_value if active else inactive_value
+    return fragment
+
+
+class SlotTemplate:
+    """静态片段 + 插槽，fragment(name, active) 返回插槽内容"""
+
+    def __init__(self, text, fragment, pattern=SLOT_PATTERN):
+        # 带一个分组的 split 得到 [静态, 插槽名, 静态, 插槽名, ..., 静态]
+        pieces = re.split(pattern, text)
+        self.slots = {}
+        for index in range(1, len(pieces), 2):
+            self.slots.setdefault(pieces[index], []).append(index)
+
+        self.active_fragments = {name: fragment(name, True) for name in self.slots}
+        inactive_fragments = {name: fragment(name, False) for name in self.slots}
+
+        # 默认所有插槽都是普通片段
+        self.parts = pieces
+        for name, indexes in self.slots.items():
+            for index in indexes:
+                self.parts[index] = inactive_fragments[name]
+        self.default = ''.join(self.parts)
+        # 激活名 -> {静态片段序号: 替换后的片段}
+        self.variants = {}
+
+    def with_variants(self, variants):
+        """
+        返回新模板，variants 为 {激活名: [(原文, 替换文本), ...]}
+        渲染该激活名时，含有原文的静态片段换成替换后的片段；原文不能跨越片段边界，找不到时抛出 ValueError
+        """
+        template = copy.copy(self)
+        template.variants = dict(self.variants)
+        slot_indexes = {index for indexes in self.slots.values() for index in indexes}
+        for active, replacements in variants.items():
+            parts = dict(template.variants.get(active, {}))
+            for old, new in replacements:
+                index = next((i for i, part in enumerate(self.parts)
+                              if i not in slot_indexes and old in parts.get(i, part)), None)
+                if index is None:
+                    raise ValueError(f'{active} 的布局变体在模板中找不到: {old!r}')
+                parts[index] = parts.get(index, self.parts[index]).replace(old, new)
+            template.variants[active] = parts
+        return template
+
+    def map(self, func):
+        """
+        返回新模板，所有静态片段和插槽片段都经过 func(text) 处理
+        func 只能替换单个片段内部的内容，不能跨越片段边界
+        """
+        template = copy.copy(self)
+        template.parts = [func(part) for part in self.parts]
+        template.active_fragments = {name: func(text) for name, text in self.active_fragments.items()}
+        template.variants = {active: {index: func(text) for index, text in parts.items()}
+                             for active, parts in self.variants.items()}
+        template.default = ''.join(template.parts)
+        return template
+
+    def render(self, active=None):
+        """渲染模板，active 为需要高亮的插槽名（同时套用该名字的布局变体）"""
+        indexes = self.slots.get(active)
+        variant = self.variants.get(active)
+        if not indexes and not variant:
+            return self.default
+
+        parts = self.parts.copy()
+        if variant:
+            for index, text in variant.items():
+                parts[index] = text
+        for index in indexes or ():
+            parts[index] = self.active_fragments[active]
+        return ''.join(parts)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+HTML 结构扫描
+一次顺序扫描页面中的标签，按标签名和属性找出元素，并通过嵌套深度找到与之配对的结束标签，
+返回元素的精确区间；区间之外的内容原样保留。
+
+只对关心的标签名分词，其余内容由正则整体跳过，因此扫描全部页面也只需几十毫秒:
+    注释 <!-- ... -->          整体跳过，注释里的标签不算数
+    <script> / <style> 内容     整体跳过，脚本字符串里的 '<a href="...">' 不会被误认
+    void 元素（<input> 等）和自闭合标签没有结束标签
+
+content 可以是 str、bytes 或 mmap，返回的偏移与 content 的类型一致（字符或字节），与 page_tools/spans.py 相同。
+"""
+
+import functools
+import re
+from collections import namedtuple
+
+from page_tools.spans import Span
+
+# name: 小写标签名；attrs: 属性字典（值已去掉引号，没有值的属性为 ''）
+# outer: 开始标签到结束标签的整个元素；inner: 开始标签之后到结束标签之前的内容，void 元素为空区间
+Element = namedtuple('Element', ['name', 'attrs', 'outer', 'inner'])
+
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr',
+})
+
+# 属性值可以带引号，引号内的 > 不结束标签
+ATTRS = r'''(?:[^>"']|"[^"]*"|'[^']*')*?'''
+
+ATTR_PATTERN = r'''([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?'''
+
+
+@functools.lru_cache(maxsize=32)
+def _patterns(names, binary):
+    """按标签名编译分词正则；names 为 None 时匹配所有标签"""
+    name = r'[A-Za-z][\w:-]*' if names is None else '|'.join(re.escape(n) for n in names)
+    text = (
+        r'<!--.*?-->'
+        rf'|<(?P<raw>script|style)\b{ATTRS}>.*?</(?P=raw)\s*>'
+        rf'|<(?P<close>/)?(?P<name>{name})(?=[\s/>])(?P<attrs>{ATTRS})(?P<selfclose>/)?>'
+    )
+    if binary:
+        return re.compile(text.encode('ascii'), re.S | re.I), re.compile(ATTR_PATTERN.encode('ascii'))
+    return re.compile(text, re.S | re.I), re.compile(ATTR_PATTERN)
+
+
+def _decode(value):
+    return value.decode('utf-8', errors='replace') if isinstance(value, bytes) else value
+
+
+def parse_attrs(text, pattern=None):
+    """解析开始标签中的属性文本，返回 {属性名(小写): 值}"""
+    pattern = pattern or _patterns(None, isinstance(text, bytes))[1]
+    attrs = {}
+    for match in pattern.finditer(text):
+        name = _decode(match.group(1)).lower()
+        value = next((v for v in match.groups()[1:] if v is not None), '')
+        attrs.setdefault(name, _decode(value))
+    return attrs
+
+
+def _matches(attrs, required):
+    """required 中值为 None 的属性只要求存在；class 按空格分隔的类名判断包含"""
+    for name, value in required.items():
+        if name not in attrs:
+            return False
+        if value is None:
+            continue
+        if name == 'class':
+            if not set(value.split()) <= set(attrs['class'].split()):
+                return False
+        elif attrs[name] != value:
+            return False
+    return True
+
+
+def find_elements(content, name, attrs=None, start=0, end=None):
+    """
+    按文档顺序（开始标签的位置）返回所有标签名为 name、属性满足 attrs 的元素
+    例如 find_elements(content, 'a', {'href': 'customer-profile-templates.html'})
+    嵌套的同名元素按深度配对；多余的结束标签忽略，没有结束标签的元素不返回
+    """
+    name = name.lower()
+    required = attrs or {}
+    tag_pattern, attr_pattern = _patterns((name,), not isinstance(content, str))
+    end = len(content) if end is None else end
+
+    # 已打开的同名元素: [开始位置, 开始标签结束位置, 属性（不匹配时为 None）]
+    stack = []
+    open_matches = 0
+    # 外层匹配元素还没结束时，先收下已结束的内层匹配元素，保证按开始位置输出
+    pending = []
+
+    for match in tag_pattern.finditer(content, start, end):
+        if match.group('name') is None:
+            continue
+
+        if match.group('close'):
+            if not stack:
+                continue
+            tag_start, open_end, tag_attrs = stack.pop()
+            if tag_attrs is None:
+                continue
+            open_matches -= 1
+            element = Element(name, tag_attrs, Span(tag_start, match.end()), Span(open_end, match.start()))
+            if open_matches:
+                pending.append(element)
+            else:
+                yield element
+                yield from sorted(pending, key=lambda e: e.outer.start)
+                pending = []
+            continue
+
+        tag_attrs = parse_attrs(match.group('attrs'), attr_pattern)
+        matched = _matches(tag_attrs, required)
+        if match.group('selfclose') or name in VOID_ELEMENTS:
+            if matched:
+                element = Element(name, tag_attrs, Span(match.start(), match.end()), Span(match.end(), match.end()))
+                if open_matches:
+                    pending.append(element)
+                else:
+                    yield element
+            continue
+
+        stack.append((match.start(), match.end(), tag_attrs if matched else None))
+        if matched:
+            open_matches += 1
+
+
+def find_element(content, name, attrs=None, start=0, end=None):
+    """返回第一个满足条件的元素，找不到时返回 None"""
+    return next(find_elements(content, name, attrs, start, end), None)
+
+
+def replace_elements(content, elements, replace):
+    """
+    用 replace(element) 的返回值替换每个元素，元素之间和之外的内容原样保留
+    elements 必须按位置排列且互不重叠
+    """
+    parts = []
+    pos = 0
+    for element in elements:
+        parts.append(content[pos:element.outer.start])
+        parts.append(replace(element))
+        pos = element.outer.end
+    parts.append(content[pos:])
+    return content[:0].join(parts)
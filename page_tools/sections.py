@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+侧边栏分组级别的调整
+模板管理排序、组织管理位置、任务模板链接、模板管理归集、智能服务二级菜单
+每个函数只处理内存中的页面内容，返回 (新内容, 是否匹配)
+各调整的目标页面用 PageQuery 描述，由页面索引查出
+"""
+
+from page_tools.index import PageQuery
+from page_tools.menu import MenuTree, parse_node
+from page_tools.render import SlotTemplate, highlight_fragment
+from page_tools.spans import locate_sidebar, section_block, splice
+
+# ---------------------------------------------------------------------------
+# 模板管理菜单顺序：客户模板 → 诊断模板 → 方案模板 → 任务模板
+# ---------------------------------------------------------------------------
+
+# 侧边栏中有系统管理分组的页面
+TEMPLATE_MENU_TARGETS = PageQuery(sections=('系统管理',))
+
+# 模板管理菜单按业务流程的顺序：(链接, 图标, 名称)，缺少的菜单项以同组的菜单项为样式补上
+TEMPLATE_MENU_ORDER = (
+    ('customer-profile-templates.html', 'user-square', '客户模板'),
+    ('diagnosis-templates.html', 'stethoscope', '诊断模板'),
+    ('templates.html', 'file-text', '方案模板'),
+    ('task-templates.html', 'list-checks', '任务模板'),
+)
+
+
+def _order_template_menu(section):
+    """按 TEMPLATE_MENU_ORDER 重排模板管理分组，缺少的菜单项以前一项为样式补上"""
+    previous = section.items()[0].href
+    for href, icon, label in TEMPLATE_MENU_ORDER:
+        if section.index(href) < 0:
+            section.insert_copy(previous, href, icon, label)
+        previous = href
+    section.reorder([href for href, _, _ in TEMPLATE_MENU_ORDER])
+
+
+def _group_system_templates(section):
+    """把系统管理中平铺的模板链接换成模板管理分组（放在第一个模板链接的位置），没有模板链接时返回 False"""
+    hrefs = {href for href, _, _ in TEMPLATE_MENU_ORDER}
+    items = [item for item in section.items() if item.href in hrefs]
+    if not items:
+        return False
+    section.parent.children[section.index(items[0].href)] = _template_group(items[0].lead)
+    for item in items[1:]:
+        section.remove(item.href)
+    return True
+
+
+def apply_template_menu(content):
+    """
+    按业务流程整理系统管理分组：模板管理（客户模板 → 诊断模板 → 方案模板 → 任务模板）→ 系统设置 → 组织管理
+    在菜单树上移动和补齐菜单项，已有菜单项的高亮、插槽和缩进保持不变；
+    系统管理下还没有模板管理分组时，先把其中平铺的模板链接归集成分组
+    """
+    tree = MenuTree.parse(content)
+    system = tree and tree.section('系统管理')
+    if system is None:
+        return content, False
+
+    if tree.section('模板管理') is None and not _group_system_templates(system):
+        return content, False
+    templates = tree.section('模板管理')
+    if not templates.items():
+        return content, False
+
+    _order_template_menu(templates)
+    tree.section('系统管理').move('organizations.html', after='settings.html')
+    return tree.serialize(), True
+
+
+# ---------------------------------------------------------------------------
+# nav-link 风格侧边栏的模板管理菜单顺序
+# ---------------------------------------------------------------------------
+
+# 带有 <!-- 模板管理 --> 标题注释的页面
+NAV_TEMPLATE_TARGETS = PageQuery(marker='nav-template')
+
+def apply_nav_template_menu(content):
+    """按业务流程重排 nav-link 风格侧边栏中的模板管理菜单"""
+    tree = MenuTree.parse(content)
+    section = tree and tree.section('模板管理')
+    if section is None or not section.items():
+        return content, False
+
+    _order_template_menu(section)
+    return tree.serialize(), True
+
+
+# ---------------------------------------------------------------------------
+# 组织管理移到系统设置下面
+# ---------------------------------------------------------------------------
+
+# 侧边栏中有系统管理分组的页面，包括 _sidebar-template.html
+ORG_ORDER_TARGETS = PageQuery(sections=('系统管理',), partials=True)
+
+# 旧的系统管理部分（组织管理在前），page_tools/bench.py 用它生成旧版页面
+OLD_SYSTEM_SECTION = '''                <!-- 系统管理 -->
+                <div class="space-y-2">
+                    <h3 class="text-xs font-semibold text-gray-400 uppercase tracking-wider mb-3">系统管理</h3>
+                    <a href="organizations.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors">
+                        <i data-lucide="building-2" class="w-4 h-4"></i>
+                        <span>组织管理</span>
+
+                    </a>
+                    <!-- 模板管理（一级菜单） -->
+                    <div class="space-y-1">
+                        <div class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 font-medium">
+                            <i data-lucide="folder-open" class="w-4 h-4"></i>
+                            <span>模板管理</span>
+                        </div>
+                        <!-- 模板管理二级菜单 -->
+                        <a href="templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors ml-4">
+                            <i data-lucide="layers" class="w-4 h-4"></i>
+                            <span>方案模板</span>
+                        </a>
+                        <a href="customer-profile-templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors ml-4">
+                            <i data-lucide="file-edit" class="w-4 h-4"></i>
+                            <span>客户模板</span>
+                        </a>
+                        <a href="task-templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors ml-4">
+                            <i data-lucide="list-checks" class="w-4 h-4"></i>
+                            <span>任务模板</span>
+                        </a>
+                    </div>
+                    <a href="settings.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors">
+                        <i data-lucide="settings" class="w-4 h-4"></i>
+                        <span>系统设置</span>
+
+                    </a>
+                </div>'''
+
+
+def move_organizations_last(content):
+    """将系统管理中的组织管理移到系统设置下面，已经在下面时原样返回"""
+    tree = MenuTree.parse(content)
+    section = tree and tree.section('系统管理')
+    if section is None or not section.move('organizations.html', after='settings.html'):
+        return content, False
+    return tree.serialize(), True
+
+
+# ---------------------------------------------------------------------------
+# 在客户模板后面添加任务模板链接
+# ---------------------------------------------------------------------------
+
+# 侧边栏中有客户模板链接的页面
+TASK_LINK_TARGETS = PageQuery(href='customer-profile-templates.html')
+
+
+def insert_task_template_link(content):
+    """在客户模板链接后面插入任务模板链接（沿用客户模板的样式和缩进），已包含时原样返回"""
+    tree = MenuTree.parse(content)
+    if tree is None:
+        return content, False
+    if tree.find('task-templates.html') is not None:
+        return content, True
+
+    section = tree.section_of('customer-profile-templates.html')
+    if section is None:
+        return content, False
+    section.insert_copy('customer-profile-templates.html', 'task-templates.html', 'list-checks', '任务模板')
+    return tree.serialize(), True
+
+
+# ---------------------------------------------------------------------------
+# 将"方案模板"和"客户模板"归集到"系统管理 > 模板管理"下
+# ---------------------------------------------------------------------------
+
+# 标准结构（智能服务 + 系统管理）的侧边栏
+TEMPLATE_GROUP_TARGETS = PageQuery(sections=('智能服务', '系统管理'))
+
+
+# 新建的模板管理分组（方案模板、客户模板），替换系统管理中原来的资料模板链接
+TEMPLATE_GROUP = '''<!-- 模板管理（一级菜单） -->
+                    <div class="space-y-1">
+                        <div class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 font-medium">
+                            <i data-lucide="folder-open" class="w-4 h-4"></i>
+                            <span>模板管理</span>
+                        </div>
+                        <!-- 模板管理二级菜单 -->
+                        <a href="templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors ml-4">
+                            <i data-lucide="layers" class="w-4 h-4"></i>
+                            <span>方案模板</span>
+                        </a>
+                        <a href="customer-profile-templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors ml-4">
+                            <i data-lucide="file-edit" class="w-4 h-4"></i>
+                            <span>客户模板</span>
+                        </a>
+                    </div>'''
+
+
+def _template_group(lead):
+    """新的模板管理分组节点，lead 为它所替换的菜单项的 lead"""
+    return parse_node(TEMPLATE_GROUP, lead)
+
+
+def _following(section, href):
+    """分组中紧跟在 href 后面的菜单项的链接，href 不在分组中或后面不是菜单项时返回 None"""
+    i = section.index(href)
+    if i < 0 or i + 1 >= section.end:
+        return None
+    node = section.parent.children[i + 1]
+    return node.href if node.kind == 'item' else None
+
+
+def group_template_menus(content):
+    """把方案模板移出智能服务，并在系统管理下建立模板管理分组"""
+    # 已经更新过
+    if '资料模板' not in content and '模板管理' in content:
+        return content, True
+
+    tree = MenuTree.parse(content)
+    if tree is None:
+        return content, False
+
+    # 第一步：移除智能服务中客户案例和加盟管理之间的方案模板
+    removed = False
+    service = tree.section_of('cases.html')
+    if service is not None:
+        following = _following(service, 'cases.html')
+        if following == 'templates.html' and _following(service, 'templates.html') == 'franchisees.html':
+            service.remove('templates.html')
+            following = 'franchisees.html'
+        removed = following == 'franchisees.html'
+
+    # 第二步：组织管理和系统设置之间的资料模板换成模板管理分组
+    grouped = False
+    system = tree.section_of('organizations.html')
+    if system is not None and _following(system, 'organizations.html') == 'customer-profile-templates.html' \
+            and _following(system, 'customer-profile-templates.html') == 'settings.html':
+        i = system.index('customer-profile-templates.html')
+        system.parent.children[i] = _template_group(system.parent.children[i].lead)
+        grouped = True
+
+    if not (removed or grouped):
+        return content, False
+    return tree.serialize(), True
+
+
+# ---------------------------------------------------------------------------
+# 用户管理和角色管理作为加盟管理的二级菜单
+# ---------------------------------------------------------------------------
+
+# 标准结构（智能服务 + 系统管理）的侧边栏，SERVICE_ACTIVE 之外的页面不高亮
+SERVICE_SECTION_TARGETS = PageQuery(sections=('智能服务', '系统管理'))
+
+# 定义新的侧边栏菜单HTML - 智能服务部分
+SERVICE_SECTION_TEMPLATE = '''                <!-- 智能服务 -->
+                <div class="space-y-2">
+                    <h3 class="text-xs font-semibold text-gray-400 uppercase tracking-wider mb-3">智能服务</h3>
+                    <a href="cases.html" class="flex items-center space-x-3 px-3 py-2 text-sm {cases_highlight} rounded-lg transition-colors">
+                        <i data-lucide="file-text" class="w-4 h-4"></i>
+                        <span>客户案例</span>
+                    </a>
+                    <a href="templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm {templates_highlight} rounded-lg transition-colors">
+                        <i data-lucide="layers" class="w-4 h-4"></i>
+                        <span>方案模板</span>
+                    </a>
+                    <a href="franchisees.html" class="flex items-center space-x-3 px-3 py-2 text-sm {franchisees_highlight} rounded-lg transition-colors">
+                        <i data-lucide="store" class="w-4 h-4"></i>
+                        <span>加盟管理</span>
+                    </a>
+                    <!-- 二级菜单：用户管理和角色管理 -->
+                    <a href="users.html" class="flex items-center space-x-3 px-3 py-2 text-sm {users_highlight} rounded-lg transition-colors ml-4">
+                        <i data-lucide="user-cog" class="w-4 h-4"></i>
+                        <span>用户管理</span>
+                        <span class="ml-auto text-xs text-gray-500">(内部员工)</span>
+                    </a>
+                    <a href="roles.html" class="flex items-center space-x-3 px-3 py-2 text-sm {roles_highlight} rounded-lg transition-colors ml-4">
+                        <i data-lucide="shield" class="w-4 h-4"></i>
+                        <span>角色管理</span>
+                    </a>
+                </div>'''
+
+# 页面 -> 需要高亮的菜单
+SERVICE_ACTIVE = {
+    'cases.html': 'cases',
+    'templates.html': 'templates',
+    'franchisees.html': 'franchisees',
+    'users.html': 'users',
+    'roles.html': 'roles',
+}
+
+# {x_highlight} 占位符编译为插槽
+SERVICE_SECTION = SlotTemplate(SERVICE_SECTION_TEMPLATE, highlight_fragment(), pattern=r'\{(\w+)_highlight\}')
+
+
+def update_service_section(content, filename):
+    """按页面高亮重新生成智能服务部分（连同 <!-- 智能服务 --> 注释整块替换）"""
+    layout = locate_sidebar(content)
+    if layout is None or '智能服务' not in layout.sections:
+        return content, False
+
+    new_section = SERVICE_SECTION.render(SERVICE_ACTIVE.get(filename))
+
+    block = section_block(content, layout.sections['智能服务'])
+    return splice(content, block, new_section), True
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+共享侧边栏
+把标准侧边栏编译成一个按内容哈希命名的脚本 js/sidebar.<哈希>.js，浏览器可以长期缓存；
+每个页面只保留一行桩代码，由脚本在桩的位置插入侧边栏，并按 data-sidebar-active 高亮当前菜单:
+
+        <!-- 侧边栏 -->
+        <script src="js/sidebar.0123456789.js" data-sidebar-active="customers"></script>
+
+脚本里保存的是 SlotTemplate 编译后的静态片段、插槽片段和页面布局变体，插入的 HTML 与内联渲染的结果逐字节相同。
+桩代码与内联侧边栏占据同一个替换区段（见 spans.locate_sidebar_block），两种模式可以来回切换。
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+
+from page_tools.fileio import write_atomic
+
+SHARED_DIR = 'js'
+SHARED_NAME = 'sidebar.{hash}.js'
+SHARED_PATTERN = re.compile(r'^sidebar\.[0-9a-f]{10}\.js$')
+
+STUB_TEMPLATE = '''        <!-- 侧边栏 -->
+        <script src="{src}" data-sidebar-active="{active}"></script>'''
+
+SCRIPT_TEMPLATE = '''/* 共享侧边栏，由 update-sidebars-unified.py --shared 生成，请勿手动修改 */
+(function () {{
+    var script = document.currentScript;
+    var active = script.getAttribute('data-sidebar-active');
+    var parts = {parts};
+    var slots = {slots};
+    var fragments = {fragments};
+    var variants = {variants}[active] || {{}};
+    Object.keys(variants).forEach(function (index) {{
+        parts[index] = variants[index];
+    }});
+    (slots[active] || []).forEach(function (index) {{
+        parts[index] = fragments[active];
+    }});
+    script.insertAdjacentHTML('beforebegin', parts.join(''));
+}})();
+'''
+
+# name: 脚本文件名；src: 页面中引用的相对路径；text: 脚本内容
+SharedScript = namedtuple('SharedScript', ['name', 'src', 'text'])
+
+
+def build_shared_script(template):
+    """把编译好的侧边栏模板（SlotTemplate）生成为共享脚本"""
+    text = SCRIPT_TEMPLATE.format(
+        parts=json.dumps(template.parts, ensure_ascii=False),
+        slots=json.dumps(template.slots, ensure_ascii=False),
+        fragments=json.dumps(template.active_fragments, ensure_ascii=False),
+        variants=json.dumps(template.variants, ensure_ascii=False),
+    )
+    name = SHARED_NAME.format(hash=hashlib.sha256(text.encode('utf-8')).hexdigest()[:10])
+    return SharedScript(name, f'{SHARED_DIR}/{name}', text)
+
+
+def render_stub(src, active_page):
+    """页面中代替侧边栏的桩代码"""
+    return STUB_TEMPLATE.format(src=src, active=active_page)
+
+
+def shared_script_path(base_dir, shared):
+    return os.path.join(base_dir, SHARED_DIR, shared.name)
+
+
+def write_shared_script(base_dir, shared):
+    """把共享脚本写到 base_dir/js/ 下，内容相同时不重写；返回是否写入"""
+    if shared_script_matches(base_dir, shared):
+        return False
+    path = shared_script_path(base_dir, shared)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path, shared.text)
+    return True
+
+
+def shared_script_matches(base_dir, shared):
+    try:
+        with open(shared_script_path(base_dir, shared), 'r', encoding='utf-8') as f:
+            return f.read() == shared.text
+    except OSError:
+        return False
+
+
+def prune_shared_scripts(base_dir, keep=None):
+    """删除 base_dir/js/ 下不再被引用的旧共享脚本，返回删除的文件名"""
+    directory = os.path.join(base_dir, SHARED_DIR)
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    removed = [name for name in sorted(names) if SHARED_PATTERN.match(name) and name != keep]
+    for name in removed:
+        os.remove(os.path.join(directory, name))
+    return removed
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+标准侧边栏渲染
+按照 roles.html 的标准侧边栏结构生成侧边栏HTML，并提供整块替换页面侧边栏的纯函数
+"""
+
+import functools
+import re
+
+from page_tools.render import SlotTemplate, highlight_fragment
+from page_tools.spans import locate_sidebar_block, splice
+
+# 需要套用标准侧边栏的页面及其激活菜单
+SIDEBAR_PAGES = {
+    'index.html': 'index',
+    'customers.html': 'customers',
+    'orders.html': 'orders',
+    'tasks.html': 'tasks',
+    'cases.html': 'cases',
+    'templates.html': 'templates',
+    'franchisees.html': 'franchisees',
+    'users.html': 'users',
+    'roles.html': 'roles',
+    'organizations.html': 'organizations',
+    'customer-profile-templates.html': 'profile_templates',
+    'settings.html': 'settings',
+}
+
+
+# 菜单项配置
+MENUS = {
+    'index': {'label': '数据看板', 'icon': 'layout-dashboard', 'href': 'index.html', 'badge': ''},
+    'customers': {'label': '客户管理', 'icon': 'users', 'href': 'customers.html', 'badge': '128', 'badge_color': 'bg-purple-100 text-purple-800'},
+    'orders': {'label': '订单管理', 'icon': 'shopping-cart', 'href': 'orders.html', 'badge': '67', 'badge_color': 'bg-green-100 text-green-800'},
+    'tasks': {'label': '任务管理', 'icon': 'check-square', 'href': 'tasks.html', 'badge': '24', 'badge_color': 'bg-orange-100 text-orange-800'},
+    'cases': {'label': '客户案例', 'icon': 'file-text', 'href': 'cases.html', 'badge': ''},
+    'templates': {'label': '方案模板', 'icon': 'layers', 'href': 'templates.html', 'badge': '', 'group': True},
+    'franchisees': {'label': '加盟管理', 'icon': 'store', 'href': 'franchisees.html', 'badge': ''},
+    'users': {'label': '用户管理', 'icon': 'user-cog', 'href': 'users.html', 'badge': '', 'sub': True, 'note': '(内部员工)'},
+    'roles': {'label': '角色管理', 'icon': 'shield', 'href': 'roles.html', 'badge': '', 'sub': True},
+    'organizations': {'label': '组织管理', 'icon': 'building-2', 'href': 'organizations.html', 'badge': ''},
+    'profile_templates': {'label': '客户模板', 'icon': 'user-square', 'href': 'customer-profile-templates.html', 'badge': '', 'group': True},
+    'diagnosis_templates': {'label': '诊断模板', 'icon': 'stethoscope', 'href': 'diagnosis-templates.html', 'badge': '', 'group': True},
+    'task_templates': {'label': '任务模板', 'icon': 'list-checks', 'href': 'task-templates.html', 'badge': '', 'group': True},
+    'settings': {'label': '系统设置', 'icon': 'settings', 'href': 'settings.html', 'badge': ''},
+}
+
+ACTIVE_MENU_CLASS = 'flex items-center space-x-3 px-3 py-2 text-sm text-blue-600 bg-blue-50 font-medium rounded-lg transition-colors'
+MENU_CLASS = 'flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors'
+DEFAULT_BADGE_COLOR = 'bg-gray-100 text-gray-800'
+
+# 侧边栏后面的移动端遮罩层，属于替换区段的一部分
+SIDEBAR_OVERLAY = '''        <!-- 遮罩层 (移动端) -->
+        <div id="sidebar-overlay" class="hidden md:hidden fixed inset-0 bg-black bg-opacity-50 z-30" onclick="toggleSidebar()"></div>'''
+
+# 标准侧边栏骨架（从roles.html提取），{key} 为菜单项插槽
+SIDEBAR_SKELETON = '''        <!-- 侧边栏 -->
+        <aside id="sidebar" class="sidebar w-64 bg-white shadow-sm border-r border-gray-200 fixed md:static h-full z-40 closed md:block">
+            <div class="p-4 md:p-6 space-y-6 overflow-y-auto h-full">
+                <!-- 快速统计 -->
+                <div class="bg-gradient-to-br from-purple-50 to-pink-50 p-4 rounded-lg">
+                    <h3 class="text-sm font-medium text-purple-900 mb-3">今日概览</h3>
+                    <div class="space-y-2">
+                        <div class="flex justify-between text-sm">
+                            <span class="text-gray-600">客户总数</span>
+                            <span class="font-semibold text-purple-600" id="totalCustomers">128</span>
+                        </div>
+                        <div class="flex justify-between text-sm">
+                            <span class="text-gray-600">今日新增</span>
+                            <span class="font-semibold text-green-600" id="newCustomers">5</span>
+                        </div>
+                        <div class="flex justify-between text-sm">
+                            <span class="text-gray-600">待跟进</span>
+                            <span class="font-semibold text-orange-600" id="pendingCustomers">12</span>
+                        </div>
+                        <div class="flex justify-between text-sm">
+                            <span class="text-gray-600">本月订单</span>
+                            <span class="font-semibold text-blue-600" id="monthlyOrders">67</span>
+                        </div>
+                    </div>
+                </div>
+
+                <!-- 主导航菜单 -->
+                <div class="space-y-2">
+                    <h3 class="text-xs font-semibold text-gray-400 uppercase tracking-wider mb-3">主要功能</h3>
+{index}
+{customers}
+{orders}
+{tasks}
+                </div>
+
+                <!-- 智能服务 -->
+                <div class="space-y-2">
+                    <h3 class="text-xs font-semibold text-gray-400 uppercase tracking-wider mb-3">智能服务</h3>
+{cases}
+{franchisees}
+                    <!-- 二级菜单：用户管理和角色管理 -->
+{users}
+{roles}
+                </div>
+
+                <!-- 系统管理 -->
+                <div class="space-y-2">
+                    <h3 class="text-xs font-semibold text-gray-400 uppercase tracking-wider mb-3">系统管理</h3>
+                    <!-- 模板管理（一级菜单） -->
+                    <div class="space-y-1">
+                        <div class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 font-medium">
+                            <i data-lucide="folder-open" class="w-4 h-4"></i>
+                            <span>模板管理</span>
+                        </div>
+                        <!-- 模板管理二级菜单 - 按业务流程排序 -->
+{profile_templates}
+{diagnosis_templates}
+{templates}
+{task_templates}
+                    </div>
+{settings}
+{organizations}
+                </div>
+            </div>
+        </aside>
+
+''' + SIDEBAR_OVERLAY
+
+
+def render_menu_item(key, active):
+    """渲染单个菜单项"""
+    info = MENUS[key]
+    menu_class = ACTIVE_MENU_CLASS if active else MENU_CLASS
+    # 如果是子菜单，添加ml-4缩进
+    if info.get('sub') or info.get('group'):
+        menu_class += ' ml-4'
+
+    # 模板管理分组中的二级菜单多缩进一级，没有角标
+    if info.get('group'):
+        return f'''                        <a href="{info['href']}" class="{menu_class}">
+                            <i data-lucide="{info['icon']}" class="w-4 h-4"></i>
+                            <span>{info['label']}</span>
+                        </a>'''
+
+    # 没有角标和备注时不输出只有缩进的空行
+    badge_html = ''
+    if info['badge']:
+        badge_color = info.get('badge_color', DEFAULT_BADGE_COLOR)
+        badge_html = f'<span class="ml-auto {badge_color} text-xs px-2 py-0.5 rounded-full">{info["badge"]}</span>'
+
+    note_html = ''
+    if info.get('note'):
+        note_html = f'<span class="ml-auto text-xs text-gray-500">{info["note"]}</span>'
+
+    extra_html = f'\n                        {badge_html}{note_html}' if badge_html or note_html else ''
+    return f'''                    <a href="{info['href']}" class="{menu_class}">
+                        <i data-lucide="{info['icon']}" class="w-4 h-4"></i>
+                        <span>{info['label']}</span>{extra_html}
+                    </a>'''
+
+
+# 侧边栏模板文件及其插槽写法 {{ACTIVE_CUSTOMERS}}；与激活菜单名不一致的插槽单独列出
+TEMPLATE_FILE = '_sidebar-template.html'
+TEMPLATE_FILE_SLOT = r'\{\{ACTIVE_(\w+)\}\}'
+TEMPLATE_FILE_SLOTS = {'profile_templates': 'CUSTOMER_TEMPLATES'}
+
+
+
+def template_file_slot(href):
+    """模板文件中链接到 href 的菜单项的高亮插槽，如 customers.html -> {{ACTIVE_CUSTOMERS}}"""
+    page = next((page for filename, page in SIDEBAR_PAGES.items() if filename == href), None)
+    if page is not None:
+        name = TEMPLATE_FILE_SLOTS.get(page, page.upper())
+    else:
+        # 没有标准侧边栏的页面按文件名命名，如 task-templates.html -> TASK_TEMPLATES，渲染时总是普通样式
+        name = re.sub(r'\W', '_', href.rsplit('.', 1)[0]).upper()
+    return '{{ACTIVE_' + name + '}}'
+
+
+# 页面自己调整过的移动端布局（固定顶栏下侧边栏和遮罩层的位置）：激活菜单 -> [(骨架中的写法, 页面的写法)]
+SIDEBAR_LAYOUTS = {
+    'index': [
+        ('fixed md:static h-full z-40 closed md:block">',
+         'fixed md:static z-40 closed md:block" style="top: 64px; height: calc(100vh - 64px);">'),
+        ('<div class="p-4 md:p-6 space-y-6 overflow-y-auto h-full">',
+         '<div class="p-4 md:p-6 space-y-4 overflow-y-auto h-full pb-8">'),
+        ('class="hidden md:hidden fixed inset-0 bg-black bg-opacity-50 z-30"',
+         'class="hidden md:hidden fixed bg-black bg-opacity-50 z-30" style="top: 64px; left: 0; right: 0; bottom: 0;"'),
+    ],
+    'tasks': [
+        ('fixed md:static h-full z-40 closed md:block">',
+         'fixed md:static top-0 md:top-auto bottom-0 md:bottom-auto h-screen md:h-full z-40 closed md:block">'),
+        ('<div class="p-4 md:p-6 space-y-6 overflow-y-auto h-full">',
+         '<div class="p-4 md:p-6 pt-20 md:pt-6 space-y-4 md:space-y-6 overflow-y-auto h-full pb-6">'),
+    ],
+}
+
+# 骨架只编译一次，每个菜单项的激活/普通两种片段预先渲染，页面的布局变体也一并编译
+SIDEBAR = SlotTemplate(SIDEBAR_SKELETON, render_menu_item).with_variants(SIDEBAR_LAYOUTS)
+
+# 菜单角标对应的统计项（见 page_tools/stats.py），今日概览的数字按元素 id 对应
+STAT_BADGES = {'customers': 'totalCustomers', 'orders': 'monthlyOrders', 'tasks': 'openTasks'}
+OVERVIEW_VALUE = r'(id="{name}">)[^<]*(<)'
+BADGE_VALUE = r'(<a href="{href}"(?:(?!</a>).)*?rounded-full">)[^<]*(</span>)'
+
+
+def apply_stats(text, stats):
+    """把统计快照写进今日概览的数字和菜单角标，stats 为 {统计项: 数量}"""
+    for name, value in stats.items():
+        text = re.sub(OVERVIEW_VALUE.format(name=re.escape(name)), rf'\g<1>{value}\g<2>', text)
+    for key, name in STAT_BADGES.items():
+        if name in stats:
+            pattern = BADGE_VALUE.format(href=re.escape(MENUS[key]['href']))
+            text = re.sub(pattern, rf'\g<1>{stats[name]}\g<2>', text, flags=re.S)
+    return text
+
+
+@functools.lru_cache(maxsize=8)
+def _stats_sidebar(stats_items):
+    return SIDEBAR.map(functools.partial(apply_stats, stats=dict(stats_items)))
+
+
+def sidebar_template(stats=None):
+    """编译好的标准侧边栏模板；stats 为统计快照时使用快照中的数字"""
+    if stats:
+        return _stats_sidebar(tuple(sorted(stats.items())))
+    return SIDEBAR
+
+
+def get_sidebar_template(active_page, stats=None):
+    """
+    生成侧边栏HTML，根据active_page参数高亮当前页面
+    active_page可选值: index, customers, orders, tasks, cases, templates, franchisees, users, roles, organizations, profile_templates, settings
+    stats 为统计快照时，今日概览和菜单角标使用快照中的数字
+    """
+    return sidebar_template(stats).render(active_page)
+
+
+def load_template_file(filepath=TEMPLATE_FILE, stats=None):
+    """
+    编译侧边栏模板文件（默认 _sidebar-template.html），返回 render(active_page) 函数
+    模板文件只包含 <aside>，渲染结果会补上遮罩层，与 get_sidebar_template 的区段范围一致
+    stats 为统计快照时，今日概览和菜单角标使用快照中的数字
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if stats:
+        # 模板文件的插槽只是高亮类名，编译前替换数字即可
+        text = apply_stats(text, stats)
+    template = SlotTemplate(text.rstrip() + '\n\n' + SIDEBAR_OVERLAY, highlight_fragment(), pattern=TEMPLATE_FILE_SLOT)
+
+    def render(active_page):
+        return template.render(TEMPLATE_FILE_SLOTS.get(active_page, str(active_page).upper()))
+    return render
+
+
+def replace_sidebar(content, active_page):
+    """
+    用标准侧边栏替换页面中的侧边栏（共享模式的桩代码也会换回内联侧边栏）
+    返回 (新内容, 是否找到侧边栏)
+    """
+    # 从 <!-- 侧边栏 --> 或 <aside 开始，到 <!-- 遮罩层 --> 后面的 </div> 结束
+    block = locate_sidebar_block(content)
+    if block is None:
+        return content, False
+    return splice(content, block, get_sidebar_template(active_page)), True
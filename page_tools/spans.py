@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+侧边栏区段定位
+只用标记查找和偏移扫描定位侧边栏、遮罩层和各菜单分组，不使用 DOTALL 懒惰正则，
+最坏情况也是线性时间。
+
+content 可以是 str、bytes 或 mmap：传入 str 时返回字符偏移，传入 bytes/mmap 时返回字节偏移。
+"""
+
+from collections import namedtuple
+
+# 半开区间 [start, end)
+Span = namedtuple('Span', ['start', 'end'])
+
+# block: 与旧正则等价的整块替换区间（前导空白 + <!-- 侧边栏 --> + <aside> ... 遮罩层 </div>），没有遮罩层时为 None
+# aside: <aside id="sidebar"> 元素
+# overlay: <!-- 遮罩层 (移动端) --> 注释到遮罩层 </div>，没有时为 None
+# sections: 分组名称 -> 分组 <div> 元素
+SidebarLayout = namedtuple('SidebarLayout', ['block', 'aside', 'overlay', 'sections'])
+
+ASIDE_OPEN = '<aside id="sidebar"'
+ASIDE_CLOSE = '</aside>'
+SIDEBAR_COMMENT = '<!-- 侧边栏 -->'
+OVERLAY_COMMENT = '<!-- 遮罩层 (移动端) -->'
+SHARED_STUB_ATTR = 'data-sidebar-active="'
+SCRIPT_OPEN = '<script'
+SCRIPT_CLOSE = '</script>'
+DIV_OPEN = '<div'
+DIV_CLOSE = '</div>'
+
+# 分组名称 -> (标题标记, 向外跳过的 <div> 层数)
+# 模板管理的标题本身是一个 <div>，分组是它外面一层的 <div class="space-y-1">
+SECTION_MARKERS = {
+    '主要功能': ('>主要功能</h3>', 0),
+    '智能服务': ('>智能服务</h3>', 0),
+    '系统管理': ('>系统管理</h3>', 0),
+    '模板管理': ('<span>模板管理</span>', 1),
+}
+
+
+def _token(content, text):
+    """按 content 的类型返回标记（str 或 UTF-8 字节）"""
+    return text if isinstance(content, str) else text.encode('utf-8')
+
+
+def skip_space_back(content, pos, limit=0, chars=None):
+    """从 pos 向前跳过空白，返回第一个空白字符的位置"""
+    while pos > limit:
+        ch = content[pos - 1:pos]
+        if chars is None:
+            if not ch.isspace():
+                break
+        elif ch not in chars:
+            break
+        pos -= 1
+    return pos
+
+
+def _ends_with(content, pos, token):
+    start = pos - len(token)
+    return start >= 0 and content[start:pos] == token
+
+
+def leading_comment_start(content, pos, limit=0):
+    """
+    返回 pos 之前紧邻的 HTML 注释（连同该行缩进）的起点
+    例如分组 <div> 前面的 "<!-- 系统管理 -->"；没有注释时返回 pos
+    """
+    end = skip_space_back(content, pos, limit)
+    if not _ends_with(content, end, _token(content, '-->')):
+        return pos
+    start = content.rfind(_token(content, '<!--'), limit, end)
+    if start < 0:
+        return pos
+    return skip_space_back(content, start, limit, chars=_token(content, ' \t'))
+
+
+def _locate_sections(content, aside):
+    """一次扫描 aside 内的 <div>，找出每个分组标题所在的分组 <div>"""
+    markers = []
+    for name, (marker, levels) in SECTION_MARKERS.items():
+        pos = content.find(_token(content, marker), aside.start, aside.end)
+        if pos >= 0:
+            markers.append((pos, name, levels))
+    if not markers:
+        return {}
+    markers.sort()
+
+    open_tok = _token(content, DIV_OPEN)
+    close_tok = _token(content, DIV_CLOSE)
+    sections = {}
+    opened = {}
+    stack = []
+    index = 0
+    pos = aside.start
+    next_open = content.find(open_tok, pos, aside.end)
+    next_close = content.find(close_tok, pos, aside.end)
+
+    while next_close >= 0:
+        event = next_open if 0 <= next_open < next_close else next_close
+        # 在越过标题之前记下当时所在的 <div>
+        while index < len(markers) and markers[index][0] < event:
+            _, name, levels = markers[index]
+            if len(stack) > levels:
+                opened[stack[-1 - levels]] = name
+            index += 1
+
+        if event == next_open:
+            stack.append(next_open)
+            pos = next_open + len(open_tok)
+            next_open = content.find(open_tok, pos, aside.end)
+        else:
+            close_end = next_close + len(close_tok)
+            if stack:
+                start = stack.pop()
+                if start in opened:
+                    sections[opened.pop(start)] = Span(start, close_end)
+            pos = close_end
+            next_close = content.find(close_tok, pos, aside.end)
+
+    return {name: sections[name] for name in SECTION_MARKERS if name in sections}
+
+
+def _block_start(content, pos):
+    """向前吞掉空白和 <!-- 侧边栏 --> 注释，与旧正则的匹配起点一致"""
+    comment_tok = _token(content, SIDEBAR_COMMENT)
+    start = skip_space_back(content, pos)
+    while _ends_with(content, start, comment_tok):
+        start = skip_space_back(content, start - len(comment_tok))
+    return start
+
+
+def locate_sidebar(content):
+    """
+    定位页面中的侧边栏
+    找不到 <aside id="sidebar"> 时返回 None
+    """
+    aside_start = content.find(_token(content, ASIDE_OPEN))
+    if aside_start < 0:
+        return None
+
+    close_tok = _token(content, ASIDE_CLOSE)
+    aside_close = content.find(close_tok, aside_start)
+    if aside_close < 0:
+        return None
+    aside = Span(aside_start, aside_close + len(close_tok))
+
+    # 遮罩层：注释后面的第一个 </div>
+    overlay = None
+    block = None
+    overlay_tok = _token(content, OVERLAY_COMMENT)
+    overlay_start = content.find(overlay_tok, aside_start)
+    if overlay_start >= 0:
+        div_close = content.find(_token(content, DIV_CLOSE), overlay_start + len(overlay_tok))
+        if div_close >= 0:
+            overlay = Span(overlay_start, div_close + len(DIV_CLOSE))
+
+            block = Span(_block_start(content, aside_start), overlay.end)
+
+    return SidebarLayout(block, aside, overlay, _locate_sections(content, aside))
+
+
+def locate_shared_stub(content):
+    """
+    共享侧边栏模式下页面中的桩代码区段（见 page_tools/shared_sidebar.py），
+    与内联侧边栏的整块区段起点规则相同；没有桩代码时返回 None
+    """
+    attr = content.find(_token(content, SHARED_STUB_ATTR))
+    if attr < 0:
+        return None
+    script_start = content.rfind(_token(content, SCRIPT_OPEN), 0, attr)
+    script_close = content.find(_token(content, SCRIPT_CLOSE), attr)
+    if script_start < 0 or script_close < 0:
+        return None
+    return Span(_block_start(content, script_start), script_close + len(SCRIPT_CLOSE))
+
+
+def locate_sidebar_block(content):
+    """侧边栏的替换区段：内联侧边栏的整块区段，或者共享模式的桩代码；都没有时返回 None"""
+    layout = locate_sidebar(content)
+    if layout is not None and layout.block is not None:
+        return layout.block
+    return locate_shared_stub(content)
+
+
+def block_looks_valid(content, span):
+    """
+    粗略确认保存下来的区段偏移仍然指向侧边栏整块：区段在内容范围内、以 </div> 结尾且包含 <aside id="sidebar"
+    用于页面索引给出的偏移，不满足时应重新定位
+    """
+    return (
+        0 <= span.start < span.end <= len(content)
+        and _ends_with(content, span.end, _token(content, DIV_CLOSE))
+        and content.find(_token(content, ASIDE_OPEN), span.start, span.end) >= 0
+    )
+
+
+def section_block(content, span):
+    """分组区间向前扩展到它的注释和缩进，例如 "    <!-- 智能服务 -->\\n    <div ...>...</div>" """
+    return Span(leading_comment_start(content, span.start), span.end)
+
+
+def splice(content, span, replacement):
+    """用 replacement 替换 span 区间"""
+    return content[:span.start] + replacement + content[span.end:]
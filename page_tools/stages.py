@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+内置构建阶段
+按 build-pages.py 命令行给出的顺序执行；默认顺序见 DEFAULT_STAGES
+"""
+
+import os
+
+from page_tools.assets import load_graph
+from page_tools.build import ASSET_DIRS, BuildError, register_stage
+from page_tools.dedupe import dedupe_pages
+from page_tools.defer import defer_page, positional_violations
+from page_tools.fingerprint import fingerprint_pages
+from page_tools.icons import ICON_DIR, available_icons, sprite_pages
+from page_tools.minify import minify_html
+from page_tools.precompress import precompress
+from page_tools.sidebar import MENUS, TEMPLATE_FILE, get_sidebar_template, load_template_file
+from page_tools.tailwind import purge_pages
+
+DEFAULT_STAGES = ['tailwind', 'icons', 'dedupe', 'defer', 'fingerprint', 'minify', 'precompress']
+
+
+@register_stage('dedupe', '多个页面相同的内联脚本、样式和顶层函数提取到带哈希的共享文件')
+def dedupe_stage(build):
+    pages, files, stats = dedupe_pages(build.pages)
+    build.pages.update(pages)
+    build.files.update(files)
+    removed = sum(s.removed for s in stats.values())
+    shared = sum(len(text.encode('utf-8')) for text in files.values())
+    blocks = sum(s.blocks for s in stats.values())
+    functions = sum(s.functions for s in stats.values())
+    return (f"提取 {blocks} 个整块、{functions} 个函数到 {len(files)} 个共享文件，"
+            f"页面减少 {removed} 字节，共享文件 {shared} 字节，去重 {removed - shared} 字节")
+
+
+@register_stage('minify', '删除注释、压缩空白（保留 script/style/pre/textarea）')
+def minify_stage(build):
+    before = sum(len(content.encode('utf-8')) for content in build.pages.values())
+    for filename, content in build.pages.items():
+        build.pages[filename] = minify_html(content)
+    after = sum(len(content.encode('utf-8')) for content in build.pages.values())
+    return f"{before} → {after} 字节"
+
+
+@register_stage('precompress', '为输出目录中的页面、js/、css/ 和 icons/（含图标雪碧图和兼容脚本）生成最高级别的 .gz 和 .deflate 副本（并行，跳过未变化的文件）',
+                output=True)
+def precompress_stage(build):
+    results, skipped, pruned = precompress(build.out_dir, build.jobs)
+    before = sum(size for _, size, _ in results)
+    after = sum(sizes['.gz'] or size for _, size, sizes in results)
+    summary = f"压缩 {len(results)} 个文件，跳过未变化的 {skipped} 个"
+    if results:
+        summary += f"，gzip {before} → {after} 字节"
+    if pruned:
+        summary += f"，删除过期副本 {pruned} 个"
+    return summary
+
+
+def _read_tree(base_dir, directory, ext):
+    """读入目录下某类文件的内容"""
+    texts = []
+    for root, _, names in os.walk(os.path.join(base_dir, directory)):
+        for name in sorted(names):
+            if name.endswith(ext):
+                with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                    texts.append(f.read())
+    return texts
+
+
+@register_stage('tailwind', '按页面、js/ 模块和侧边栏模板实际用到的类生成 Tailwind 子集样式表，替换 CDN 运行时')
+def tailwind_stage(build):
+    sources = _read_tree(build.base_dir, 'js', '.js')
+    sources.extend(text for text in build.files.values() if isinstance(text, str))
+    sources.extend(get_sidebar_template(active_page) for active_page in MENUS)
+    template_file = os.path.join(build.base_dir, TEMPLATE_FILE)
+    if os.path.exists(template_file):
+        sources.append(load_template_file(template_file)(None))
+    result = purge_pages(build.pages, sources, _read_tree(build.base_dir, 'css', '.css'))
+    if not result.pages:
+        return "没有页面使用 Tailwind CDN"
+
+    build.pages.update(result.pages)
+    build.files[result.name] = result.css
+    if result.unknown:
+        print(f"[WARN] 以下类名不是 Tailwind 工具类，也没有样式定义: {' '.join(sorted(result.unknown))}")
+    return (f"{len(result.pages)} 个页面改用 {result.name}，"
+            f"{len(result.used)} 个工具类，{len(result.css.encode('utf-8'))} 字节")
+
+
+@register_stage('icons', '用本地 lucide 图标生成雪碧图，静态图标改为 <svg><use>，替换 lucide CDN 运行时')
+def icons_stage(build):
+    icon_dir = os.path.join(build.base_dir, ICON_DIR)
+    if not available_icons(icon_dir):
+        raise BuildError(f"没有找到图标目录 {ICON_DIR}（见 vendor/lucide-static/README.md）")
+
+    sources = _read_tree(build.base_dir, 'js', '.js')
+    sources.extend(get_sidebar_template(active_page) for active_page in MENUS)
+    result = sprite_pages(build.pages, sources, icon_dir)
+    if result.missing:
+        raise BuildError(f"图标目录中缺少: {' '.join(sorted(result.missing))}（旧图标名需要登记在 ICON_ALIASES 中）")
+
+    build.pages.update(result.pages)
+    build.files.update(result.files)
+    return f"{len(result.pages)} 个页面，雪碧图 {len(result.icons)} 个图标，静态替换 {result.replaced} 处"
+
+
+@register_stage('fingerprint', 'js/、css/ 资源生成带内容哈希的副本和 asset-manifest.json，页面引用改为哈希文件名')
+def fingerprint_stage(build):
+    result = fingerprint_pages(build.pages, build.base_dir, ASSET_DIRS, build.files)
+    build.pages.update(result.pages)
+    build.files.update(result.files)
+    return f"{len(result.manifest)} 个资源，{len(result.pages)} 个页面中改写引用 {result.rewritten} 处"
+
+
+@register_stage('defer', '分析各页面启动时需要同步执行的脚本，其余改为 defer/async，并加 preload/prefetch 提示')
+def defer_stage(build):
+    # 构建只写输出目录，资源引用图不写回源目录
+    graph = load_graph(build.base_dir, save=False)
+
+    def read_script(relpath):
+        content = build.files.get(relpath)
+        if content is not None:
+            return content if isinstance(content, str) else content.decode('utf-8', errors='replace')
+        path = os.path.join(build.base_dir, relpath)
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+    def dynamic(relpath):
+        return [(ref.target, graph.targets(ref.target)) for ref in graph.references(relpath)
+                if '*' in ref.target and ref.kind in ('script', 'import')]
+
+    total_before = total_after = changed = 0
+    for filename, content in build.pages.items():
+        result = defer_page(content, read_script, dynamic)
+        total_before += result.before
+        total_after += result.after
+        if result.content is None:
+            continue
+        for tag in positional_violations(result.content):
+            print(f"[ERROR] {filename}: 依赖执行位置的脚本不能改为 defer/async: {tag}")
+        build.pages[filename] = result.content
+        changed += 1
+        print(f"    {filename}: 阻塞脚本 {result.before} → {result.after} 字节"
+              f"（defer {result.modes.count('defer')}，async {result.modes.count('async')}，"
+              f"preload {len(result.preload)}，prefetch {len(result.prefetch)}）")
+    return f"{changed} 个页面，阻塞加载的本地脚本 {total_before} → {total_after} 字节"
@@ -0,0 +1,1094 @@
+# -*- coding: utf-8 -*-
+"""
+静态 Tailwind 子集样式表
+页面通过 https://cdn.tailwindcss.com 在浏览器中运行 Tailwind JIT 编译器，每次加载都重新生成 CSS。
+这里在构建时收集页面、js/ 模块和标准侧边栏模板中出现的类名，按 Tailwind v3 默认主题（页面没有自定义配置）
+生成只包含这些工具类的样式表，内容与 CDN 生成的规则一致:
+    - Preflight 基础样式和 --tw-* 变量默认值
+    - 间距、尺寸、颜色（含 /透明度 修饰和 bg-opacity-* 等）、flex/grid、排版、边框、阴影、ring、过渡、动画等工具类
+    - [...] 任意值
+    - 变体: sm/md/lg/xl/2xl 响应式、hover/focus/disabled 等伪类、group-*/peer-*、before/after/placeholder 伪元素
+    - 规则按 Tailwind 的插件顺序和变体顺序排列，同一元素上相互覆盖的类结果不变
+
+收集类名的方式与 Tailwind 的内容扫描相同：文本中所有可能是类名的片段都算候选，不是工具类的自动忽略。
+JS 中用模板字符串拼出的类名（如 bg-${color}-100）把 ${...} 展开为调色板中的所有颜色。
+"""
+
+import hashlib
+import re
+from collections import namedtuple
+
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px', '2xl': '1536px'}
+
+SPACING = {
+    '0': '0px', 'px': '1px', '0.5': '0.125rem', '1': '0.25rem', '1.5': '0.375rem', '2': '0.5rem',
+    '2.5': '0.625rem', '3': '0.75rem', '3.5': '0.875rem', '4': '1rem', '5': '1.25rem', '6': '1.5rem',
+    '7': '1.75rem', '8': '2rem', '9': '2.25rem', '10': '2.5rem', '11': '2.75rem', '12': '3rem', '14': '3.5rem',
+    '16': '4rem', '20': '5rem', '24': '6rem', '28': '7rem', '32': '8rem', '36': '9rem', '40': '10rem',
+    '44': '11rem', '48': '12rem', '52': '13rem', '56': '14rem', '60': '15rem', '64': '16rem', '72': '18rem',
+    '80': '20rem', '96': '24rem',
+}
+
+FRACTIONS = {
+    '1/2': '50%', '1/3': '33.333333%', '2/3': '66.666667%', '1/4': '25%', '2/4': '50%', '3/4': '75%',
+    '1/5': '20%', '2/5': '40%', '3/5': '60%', '4/5': '80%', '1/6': '16.666667%', '5/6': '83.333333%',
+    'full': '100%',
+}
+
+PALETTE = {
+    'gray': ['#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af', '#6b7280', '#4b5563', '#374151', '#1f2937', '#111827', '#030712'],
+    'red': ['#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171', '#ef4444', '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d', '#450a0a'],
+    'orange': ['#fff7ed', '#ffedd5', '#fed7aa', '#fdba74', '#fb923c', '#f97316', '#ea580c', '#c2410c', '#9a3412', '#7c2d12', '#431407'],
+    'amber': ['#fffbeb', '#fef3c7', '#fde68a', '#fcd34d', '#fbbf24', '#f59e0b', '#d97706', '#b45309', '#92400e', '#78350f', '#451a03'],
+    'yellow': ['#fefce8', '#fef9c3', '#fef08a', '#fde047', '#facc15', '#eab308', '#ca8a04', '#a16207', '#854d0e', '#713f12', '#422006'],
+    'green': ['#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80', '#22c55e', '#16a34a', '#15803d', '#166534', '#14532d', '#052e16'],
+    'emerald': ['#ecfdf5', '#d1fae5', '#a7f3d0', '#6ee7b7', '#34d399', '#10b981', '#059669', '#047857', '#065f46', '#064e3b', '#022c22'],
+    'teal': ['#f0fdfa', '#ccfbf1', '#99f6e4', '#5eead4', '#2dd4bf', '#14b8a6', '#0d9488', '#0f766e', '#115e59', '#134e4a', '#042f2e'],
+    'cyan': ['#ecfeff', '#cffafe', '#a5f3fc', '#67e8f9', '#22d3ee', '#06b6d4', '#0891b2', '#0e7490', '#155e75', '#164e63', '#083344'],
+    'blue': ['#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa', '#3b82f6', '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a', '#172554'],
+    'indigo': ['#eef2ff', '#e0e7ff', '#c7d2fe', '#a5b4fc', '#818cf8', '#6366f1', '#4f46e5', '#4338ca', '#3730a3', '#312e81', '#1e1b4b'],
+    'purple': ['#faf5ff', '#f3e8ff', '#e9d5ff', '#d8b4fe', '#c084fc', '#a855f7', '#9333ea', '#7e22ce', '#6b21a8', '#581c87', '#3b0764'],
+    'pink': ['#fdf2f8', '#fce7f3', '#fbcfe8', '#f9a8d4', '#f472b6', '#ec4899', '#db2777', '#be185d', '#9d174d', '#831843', '#500724'],
+}
+SHADES = ['50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950']
+
+# 名称 -> 十六进制颜色或 CSS 关键字
+COLORS = {'inherit': 'inherit', 'current': 'currentColor', 'transparent': 'transparent', 'black': '#000', 'white': '#fff'}
+for _name, _values in PALETTE.items():
+    COLORS.update((f'{_name}-{shade}', value) for shade, value in zip(SHADES, _values))
+
+OPACITY = {str(n): str(n / 100).rstrip('0').rstrip('.') if n else '0' for n in range(0, 101, 5)}
+
+FONT_SANS = ('ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", '
+             '"Noto Color Emoji"')
+FONT_MONO = 'ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace'
+
+PREFLIGHT = f'''*,::before,::after{{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb}}
+::before,::after{{--tw-content:''}}
+html,:host{{line-height:1.5;-webkit-text-size-adjust:100%;-moz-tab-size:4;tab-size:4;font-family:{FONT_SANS};font-feature-settings:normal;font-variation-settings:normal;-webkit-tap-highlight-color:transparent}}
+body{{margin:0;line-height:inherit}}
+hr{{height:0;color:inherit;border-top-width:1px}}
+abbr:where([title]){{-webkit-text-decoration:underline dotted;text-decoration:underline dotted}}
+h1,h2,h3,h4,h5,h6{{font-size:inherit;font-weight:inherit}}
+a{{color:inherit;text-decoration:inherit}}
+b,strong{{font-weight:bolder}}
+code,kbd,samp,pre{{font-family:{FONT_MONO};font-feature-settings:normal;font-variation-settings:normal;font-size:1em}}
+small{{font-size:80%}}
+sub,sup{{font-size:75%;line-height:0;position:relative;vertical-align:baseline}}
+sub{{bottom:-0.25em}}
+sup{{top:-0.5em}}
+table{{text-indent:0;border-color:inherit;border-collapse:collapse}}
+button,input,optgroup,select,textarea{{font-family:inherit;font-feature-settings:inherit;font-variation-settings:inherit;font-size:100%;font-weight:inherit;line-height:inherit;letter-spacing:inherit;color:inherit;margin:0;padding:0}}
+button,select{{text-transform:none}}
+button,input:where([type='button']),input:where([type='reset']),input:where([type='submit']){{-webkit-appearance:button;background-color:transparent;background-image:none}}
+:-moz-focusring{{outline:auto}}
+:-moz-ui-invalid{{box-shadow:none}}
+progress{{vertical-align:baseline}}
+::-webkit-inner-spin-button,::-webkit-outer-spin-button{{height:auto}}
+[type='search']{{-webkit-appearance:textfield;outline-offset:-2px}}
+::-webkit-search-decoration{{-webkit-appearance:none}}
+::-webkit-file-upload-button{{-webkit-appearance:button;font:inherit}}
+summary{{display:list-item}}
+blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{{margin:0}}
+fieldset{{margin:0;padding:0}}
+legend{{padding:0}}
+ol,ul,menu{{list-style:none;margin:0;padding:0}}
+dialog{{padding:0}}
+textarea{{resize:vertical}}
+input::placeholder,textarea::placeholder{{opacity:1;color:#9ca3af}}
+button,[role="button"]{{cursor:pointer}}
+:disabled{{cursor:default}}
+img,svg,video,canvas,audio,iframe,embed,object{{display:block;vertical-align:middle}}
+img,video{{max-width:100%;height:auto}}
+[hidden]:where(:not([hidden="until-found"])){{display:none}}
+'''
+
+_TW_DEFAULTS = (
+    '--tw-border-spacing-x:0;--tw-border-spacing-y:0;--tw-translate-x:0;--tw-translate-y:0;--tw-rotate:0;'
+    '--tw-skew-x:0;--tw-skew-y:0;--tw-scale-x:1;--tw-scale-y:1;--tw-pan-x: ;--tw-pan-y: ;--tw-pinch-zoom: ;'
+    '--tw-scroll-snap-strictness:proximity;--tw-gradient-from-position: ;--tw-gradient-via-position: ;'
+    '--tw-gradient-to-position: ;--tw-ordinal: ;--tw-slashed-zero: ;--tw-numeric-figure: ;--tw-numeric-spacing: ;'
+    '--tw-numeric-fraction: ;--tw-ring-inset: ;--tw-ring-offset-width:0px;--tw-ring-offset-color:#fff;'
+    '--tw-ring-color:rgb(59 130 246 / 0.5);--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 #0000;'
+    '--tw-shadow:0 0 #0000;--tw-shadow-colored:0 0 #0000;--tw-blur: ;--tw-brightness: ;--tw-contrast: ;'
+    '--tw-grayscale: ;--tw-hue-rotate: ;--tw-invert: ;--tw-saturate: ;--tw-sepia: ;--tw-drop-shadow: ;'
+    '--tw-backdrop-blur: ;--tw-backdrop-brightness: ;--tw-backdrop-contrast: ;--tw-backdrop-grayscale: ;'
+    '--tw-backdrop-hue-rotate: ;--tw-backdrop-invert: ;--tw-backdrop-opacity: ;--tw-backdrop-saturate: ;'
+    '--tw-backdrop-sepia: ;--tw-contain-size: ;--tw-contain-layout: ;--tw-contain-paint: ;--tw-contain-style: '
+)
+DEFAULTS = f'*,::before,::after{{{_TW_DEFAULTS}}}\n::backdrop{{{_TW_DEFAULTS}}}\n'
+
+TRANSFORM = ('translate(var(--tw-translate-x), var(--tw-translate-y)) rotate(var(--tw-rotate)) '
+             'skewX(var(--tw-skew-x)) skewY(var(--tw-skew-y)) scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))')
+BACKDROP_FILTER = ('var(--tw-backdrop-blur) var(--tw-backdrop-brightness) var(--tw-backdrop-contrast) '
+                   'var(--tw-backdrop-grayscale) var(--tw-backdrop-hue-rotate) var(--tw-backdrop-invert) '
+                   'var(--tw-backdrop-opacity) var(--tw-backdrop-saturate) var(--tw-backdrop-sepia)')
+FILTER = ('var(--tw-blur) var(--tw-brightness) var(--tw-contrast) var(--tw-grayscale) var(--tw-hue-rotate) '
+          'var(--tw-invert) var(--tw-saturate) var(--tw-sepia) var(--tw-drop-shadow)')
+BOX_SHADOW = 'var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)'
+EASE_IN_OUT = 'cubic-bezier(0.4, 0, 0.2, 1)'
+
+KEYFRAMES = {
+    'spin': '@keyframes spin{to{transform:rotate(360deg)}}',
+    'ping': '@keyframes ping{75%,100%{transform:scale(2);opacity:0}}',
+    'pulse': '@keyframes pulse{50%{opacity:.5}}',
+    'bounce': ('@keyframes bounce{0%,100%{transform:translateY(-25%);animation-timing-function:cubic-bezier(0.8,0,1,1)}'
+               '50%{transform:none;animation-timing-function:cubic-bezier(0,0,0.2,1)}}'),
+}
+ANIMATIONS = {
+    'none': 'none', 'spin': 'spin 1s linear infinite', 'ping': 'ping 1s cubic-bezier(0, 0, 0.2, 1) infinite',
+    'pulse': 'pulse 2s cubic-bezier(0.4, 0, 0.6, 1) infinite', 'bounce': 'bounce 1s infinite',
+}
+
+SHADOWS = {
+    'sm': ('0 1px 2px 0 rgb(0 0 0 / 0.05)', '0 1px 2px 0 var(--tw-shadow-color)'),
+    '': ('0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+         '0 1px 3px 0 var(--tw-shadow-color), 0 1px 2px -1px var(--tw-shadow-color)'),
+    'md': ('0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+           '0 4px 6px -1px var(--tw-shadow-color), 0 2px 4px -2px var(--tw-shadow-color)'),
+    'lg': ('0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+           '0 10px 15px -3px var(--tw-shadow-color), 0 4px 6px -4px var(--tw-shadow-color)'),
+    'xl': ('0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+           '0 20px 25px -5px var(--tw-shadow-color), 0 8px 10px -6px var(--tw-shadow-color)'),
+    '2xl': ('0 25px 50px -12px rgb(0 0 0 / 0.25)', '0 25px 50px -12px var(--tw-shadow-color)'),
+    'inner': ('inset 0 2px 4px 0 rgb(0 0 0 / 0.05)', 'inset 0 2px 4px 0 var(--tw-shadow-color)'),
+    'none': ('0 0 #0000', '0 0 #0000'),
+}
+
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'), '6xl': ('3.75rem', '1'),
+    '7xl': ('4.5rem', '1'), '8xl': ('6rem', '1'), '9xl': ('8rem', '1'),
+}
+FONT_WEIGHTS = {
+    'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500', 'semibold': '600',
+    'bold': '700', 'extrabold': '800', 'black': '900',
+}
+RADII = {
+    'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem', 'xl': '0.75rem',
+    '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px',
+}
+RADIUS_SIDES = {
+    '': ('border-radius',), 't': ('border-top-left-radius', 'border-top-right-radius'),
+    'r': ('border-top-right-radius', 'border-bottom-right-radius'),
+    'b': ('border-bottom-right-radius', 'border-bottom-left-radius'),
+    'l': ('border-top-left-radius', 'border-bottom-left-radius'),
+    'tl': ('border-top-left-radius',), 'tr': ('border-top-right-radius',),
+    'br': ('border-bottom-right-radius',), 'bl': ('border-bottom-left-radius',),
+}
+BORDER_SIDES = {
+    '': ('border-width',), 'x': ('border-left-width', 'border-right-width'),
+    'y': ('border-top-width', 'border-bottom-width'), 't': ('border-top-width',), 'r': ('border-right-width',),
+    'b': ('border-bottom-width',), 'l': ('border-left-width',),
+}
+BOX_SIDES = {
+    '': ('',), 'x': ('-left', '-right'), 'y': ('-top', '-bottom'), 't': ('-top',), 'r': ('-right',),
+    'b': ('-bottom',), 'l': ('-left',),
+}
+MAX_WIDTHS = {
+    '0': '0rem', 'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+    '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem',
+    'full': '100%', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content', 'prose': '65ch',
+}
+MAX_WIDTHS.update((f'screen-{name}', value) for name, value in SCREENS.items())
+SIZE_KEYWORDS = {'auto': 'auto', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'}
+LEADING = {
+    'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2',
+    '3': '.75rem', '4': '1rem', '5': '1.25rem', '6': '1.5rem', '7': '1.75rem', '8': '2rem', '9': '2.25rem',
+    '10': '2.5rem',
+}
+TRACKING = {
+    'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em', 'wide': '0.025em', 'wider': '0.05em',
+    'widest': '0.1em',
+}
+TRANSITIONS = {
+    '': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, '
+        'transform, filter, backdrop-filter',
+    'all': 'all', 'colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+    'opacity': 'opacity', 'shadow': 'box-shadow', 'transform': 'transform',
+}
+BLUR = {'none': '', 'sm': 'blur(4px)', '': 'blur(8px)', 'md': 'blur(12px)', 'lg': 'blur(16px)', 'xl': 'blur(24px)',
+        '2xl': 'blur(40px)', '3xl': 'blur(64px)'}
+SCALES = {n: str(int(n) / 100) for n in ('0', '50', '75', '90', '95', '100', '105', '110', '125', '150')}
+DURATIONS = ('0', '75', '100', '150', '200', '300', '500', '700', '1000')
+EASES = {'linear': 'linear', 'in': 'cubic-bezier(0.4, 0, 1, 1)', 'out': 'cubic-bezier(0, 0, 0.2, 1)',
+         'in-out': EASE_IN_OUT}
+DISPLAYS = (
+    'block', 'inline-block', 'inline', 'flex', 'inline-flex', 'table', 'inline-table', 'table-caption',
+    'table-cell', 'table-column', 'table-column-group', 'table-footer-group', 'table-header-group',
+    'table-row-group', 'table-row', 'flow-root', 'grid', 'inline-grid', 'contents', 'list-item', 'hidden',
+)
+
+# 伪类变体，顺序即 Tailwind 的变体顺序
+PSEUDO_CLASSES = [
+    'first', 'last', 'only', 'odd', 'even', 'first-of-type', 'last-of-type', 'only-of-type', 'visited', 'target',
+    'open', 'default', 'checked', 'indeterminate', 'placeholder-shown', 'autofill', 'optional', 'required', 'valid',
+    'invalid', 'in-range', 'out-of-range', 'read-only', 'empty', 'focus-within', 'hover', 'focus', 'focus-visible',
+    'active', 'enabled', 'disabled',
+]
+PSEUDO_SELECTORS = {
+    'first': ':first-child', 'last': ':last-child', 'only': ':only-child', 'odd': ':nth-child(odd)',
+    'even': ':nth-child(even)', 'open': '[open]',
+}
+PSEUDO_ELEMENTS = {'before': '::before', 'after': '::after', 'placeholder': '::placeholder', 'marker': '::marker',
+                   'selection': '::selection', 'file': '::file-selector-button'}
+
+# 变体 -> 排序序号：伪元素 < 伪类 < group-* < peer-*，响应式单独处理
+VARIANT_ORDER = {name: i for i, name in enumerate(PSEUDO_ELEMENTS)}
+for _prefix in ('', 'group-', 'peer-'):
+    VARIANT_ORDER.update((_prefix + name, len(VARIANT_ORDER)) for name in PSEUDO_CLASSES)
+
+CHILDREN = ' > :not([hidden]) ~ :not([hidden])'
+
+# 生成的一条规则：sort_key 用于排序，selector 中的 & 代表类选择器
+Rule = namedtuple('Rule', ['sort_key', 'media', 'selector', 'declarations'])
+
+
+def escape_class(name):
+    """类名转为 CSS 选择器中的转义形式"""
+    escaped = re.sub(r'([^A-Za-z0-9_-])', r'\\\1', name)
+    if escaped[:1].isdigit():
+        escaped = f'\\{ord(escaped[0]):x} ' + escaped[1:]
+    return escaped
+
+
+def arbitrary(value):
+    """[...] 任意值：下划线表示空格"""
+    if len(value) > 2 and value[0] == '[' and value[-1] == ']':
+        return value[1:-1].replace('_', ' ')
+    return None
+
+
+def _hex_rgb(value):
+    value = value.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(ch * 2 for ch in value)
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def color_declarations(value, prop, opacity_var=None, template='{}'):
+    """
+    颜色类的声明列表；value 可带 /透明度 修饰（如 white/20）
+    opacity_var 为 --tw-bg-opacity 等变量名时，不带修饰的颜色写成 rgb(r g b / var(...))，可被 bg-opacity-* 等调整
+    """
+    name, _, alpha = value.partition('/')
+    color = COLORS.get(name)
+    if color is None:
+        color = arbitrary(name)
+        if color is None:
+            return None
+    if alpha:
+        alpha = OPACITY.get(alpha) or arbitrary(alpha)
+        if alpha is None:
+            return None
+    if not color.startswith('#'):
+        return [(prop, template.format(color))]
+    r, g, b = _hex_rgb(color)
+    if alpha:
+        return [(prop, template.format(f'rgb({r} {g} {b} / {alpha})'))]
+    if opacity_var:
+        return [(opacity_var, '1'), (prop, template.format(f'rgb({r} {g} {b} / var({opacity_var}))'))]
+    return [(prop, template.format(color))]
+
+
+def spacing(value, negative=False, extra=None):
+    """间距类的值：默认间距比例、extra 中的附加值或任意值；negative 时取负"""
+    result = SPACING.get(value) or (extra or {}).get(value) or arbitrary(value)
+    if result is None:
+        return None
+    if negative:
+        if result in ('0px', 'auto'):
+            return result
+        return f'calc({result} * -1)' if value.startswith('[') else f'-{result}'
+    return result
+
+
+# 工具类处理函数：(正则, 函数(match, negative) -> [(属性, 值)] 或 [(子选择器, [(属性, 值)])]、是否允许负值)
+UTILITIES = []
+
+
+def utility(pattern, negative=False):
+    """按 Tailwind 插件顺序注册工具类；注册顺序即规则排序顺序"""
+    def decorator(func):
+        UTILITIES.append((re.compile(pattern), func, negative))
+        return func
+    return decorator
+
+
+def static(mapping):
+    """固定声明的工具类：{类名: 声明字符串}"""
+    def handler(match, negative):
+        text = mapping[match.group(0)]
+        return [tuple(part.split(':', 1)) for part in text.split(';')]
+    utility('(?:' + '|'.join(re.escape(name) for name in sorted(mapping, key=len, reverse=True)) + ')$')(handler)
+
+
+@utility(r'container$')
+def _container(match, negative):
+    return [('width', '100%')] + [
+        (f'@media (min-width: {width})', [('max-width', width)]) for width in SCREENS.values()]
+
+
+static({
+    'sr-only': 'position:absolute;width:1px;height:1px;padding:0;margin:-1px;overflow:hidden;clip:rect(0, 0, 0, 0);'
+               'white-space:nowrap;border-width:0',
+    'not-sr-only': 'position:static;width:auto;height:auto;padding:0;margin:0;overflow:visible;clip:auto;'
+                   'white-space:normal',
+})
+static({'pointer-events-none': 'pointer-events:none', 'pointer-events-auto': 'pointer-events:auto'})
+static({'visible': 'visibility:visible', 'invisible': 'visibility:hidden', 'collapse': 'visibility:collapse'})
+static({name: f'position:{name}' for name in ('static', 'fixed', 'absolute', 'relative', 'sticky')})
+
+
+def _inset(match, negative):
+    value = spacing(match.group(2), negative, dict(FRACTIONS, auto='auto'))
+    if value is None:
+        return None
+    props = {'inset': ('inset',), 'inset-x': ('left', 'right'), 'inset-y': ('top', 'bottom')}.get(
+        match.group(1), (match.group(1),))
+    return [(prop, value) for prop in props]
+
+
+# 同一插件中先注册整体、再注册单边，如 border border-t-0 时单边的规则在后面
+for _pattern in (r'(inset)-(.+)$', r'(inset-[xy])-(.+)$', r'(top|right|bottom|left)-(.+)$'):
+    utility(_pattern, negative=True)(_inset)
+
+
+@utility(r'z-(\d+|auto|\[.+\])$', negative=True)
+def _z_index(match, negative):
+    value = arbitrary(match.group(1)) or match.group(1)
+    return [('z-index', f'-{value}' if negative else value)]
+
+
+@utility(r'order-(\d+|first|last|none)$')
+def _order(match, negative):
+    value = {'first': '-9999', 'last': '9999', 'none': '0'}.get(match.group(1), match.group(1))
+    return [('order', value)]
+
+
+@utility(r'col-span-(\d+|full)$')
+def _col_span(match, negative):
+    value = match.group(1)
+    return [('grid-column', '1 / -1' if value == 'full' else f'span {value} / span {value}')]
+
+
+@utility(r'row-span-(\d+|full)$')
+def _row_span(match, negative):
+    value = match.group(1)
+    return [('grid-row', '1 / -1' if value == 'full' else f'span {value} / span {value}')]
+
+
+@utility(r'm()-(.+)$', negative=True)
+def _margin(match, negative):
+    return _box('margin', match, negative)
+
+
+@utility(r'm([xy])-(.+)$', negative=True)
+def _margin_axis(match, negative):
+    return _box('margin', match, negative)
+
+
+@utility(r'm([trbl])-(.+)$', negative=True)
+def _margin_side(match, negative):
+    return _box('margin', match, negative)
+
+
+def _box(prop, match, negative):
+    value = spacing(match.group(2), negative, {'auto': 'auto'} if prop == 'margin' else None)
+    if value is None:
+        return None
+    return [(prop + side, value) for side in BOX_SIDES[match.group(1)]]
+
+
+static({'box-border': 'box-sizing:border-box', 'box-content': 'box-sizing:content-box'})
+
+
+@utility(r'line-clamp-(\d+|none)$')
+def _line_clamp(match, negative):
+    if match.group(1) == 'none':
+        return [('overflow', 'visible'), ('display', 'block'), ('-webkit-box-orient', 'horizontal'),
+                ('-webkit-line-clamp', 'none')]
+    return [('overflow', 'hidden'), ('display', '-webkit-box'), ('-webkit-box-orient', 'vertical'),
+            ('-webkit-line-clamp', match.group(1))]
+
+
+static({name: 'display:' + ('none' if name == 'hidden' else name) for name in DISPLAYS})
+
+
+def _size(prop, extra):
+    def handler(match, negative):
+        value = spacing(match.group(1), False, extra)
+        return None if value is None else [(prop, value)]
+    return handler
+
+
+utility(r'h-(.+)$')(_size('height', dict(FRACTIONS, screen='100vh', svh='100svh', lvh='100lvh', dvh='100dvh',
+                                          **SIZE_KEYWORDS)))
+utility(r'max-h-(.+)$')(_size('max-height', dict(none='none', full='100%', screen='100vh', svh='100svh',
+                                                  lvh='100lvh', dvh='100dvh', **SIZE_KEYWORDS)))
+utility(r'min-h-(.+)$')(_size('min-height', dict(full='100%', screen='100vh', svh='100svh', lvh='100lvh',
+                                                  dvh='100dvh', **SIZE_KEYWORDS)))
+utility(r'w-(.+)$')(_size('width', dict(FRACTIONS, screen='100vw', svw='100svw', lvw='100lvw', dvw='100dvw',
+                                         **SIZE_KEYWORDS)))
+utility(r'min-w-(.+)$')(_size('min-width', dict(full='100%', **SIZE_KEYWORDS)))
+
+
+@utility(r'max-w-(.+)$')
+def _max_width(match, negative):
+    value = MAX_WIDTHS.get(match.group(1)) or arbitrary(match.group(1))
+    return None if value is None else [('max-width', value)]
+
+
+static({'flex-1': 'flex:1 1 0%', 'flex-auto': 'flex:1 1 auto', 'flex-initial': 'flex:0 1 auto', 'flex-none': 'flex:none'})
+static({'flex-shrink': 'flex-shrink:1', 'flex-shrink-0': 'flex-shrink:0', 'shrink': 'flex-shrink:1',
+        'shrink-0': 'flex-shrink:0'})
+static({'flex-grow': 'flex-grow:1', 'flex-grow-0': 'flex-grow:0', 'grow': 'flex-grow:1', 'grow-0': 'flex-grow:0'})
+
+
+@utility(r'translate-([xy])-(.+)$', negative=True)
+def _translate(match, negative):
+    value = spacing(match.group(2), negative, FRACTIONS)
+    if value is None:
+        return None
+    return [(f'--tw-translate-{match.group(1)}', value), ('transform', TRANSFORM)]
+
+
+@utility(r'rotate-(\d+|\[.+\])$', negative=True)
+def _rotate(match, negative):
+    value = arbitrary(match.group(1)) or f'{match.group(1)}deg'
+    return [('--tw-rotate', f'-{value}' if negative else value), ('transform', TRANSFORM)]
+
+
+@utility(r'scale(-[xy])?-(\d+)$')
+def _scale(match, negative):
+    value = SCALES.get(match.group(2))
+    if value is None:
+        return None
+    axes = [match.group(1)[1]] if match.group(1) else ['x', 'y']
+    return [(f'--tw-scale-{axis}', value) for axis in axes] + [('transform', TRANSFORM)]
+
+
+static({'transform': f'transform:{TRANSFORM}', 'transform-cpu': f'transform:{TRANSFORM}',
+        'transform-gpu': 'transform:' + TRANSFORM.replace('translate(', 'translate3d(').replace(
+            'var(--tw-translate-y))', 'var(--tw-translate-y), 0)'),
+        'transform-none': 'transform:none'})
+
+
+@utility(r'animate-(none|spin|ping|pulse|bounce)$')
+def _animate(match, negative):
+    return [('animation', ANIMATIONS[match.group(1)])]
+
+
+@utility(r'cursor-([a-z-]+)$')
+def _cursor(match, negative):
+    cursors = ('auto', 'default', 'pointer', 'wait', 'text', 'move', 'help', 'not-allowed', 'none', 'progress',
+               'cell', 'crosshair', 'grab', 'grabbing', 'zoom-in', 'zoom-out')
+    return [('cursor', match.group(1))] if match.group(1) in cursors else None
+
+
+static({'select-none': 'user-select:none', 'select-text': 'user-select:text', 'select-all': 'user-select:all',
+        'select-auto': 'user-select:auto'})
+static({'resize-none': 'resize:none', 'resize-y': 'resize:vertical', 'resize-x': 'resize:horizontal',
+        'resize': 'resize:both'})
+static({'list-inside': 'list-style-position:inside', 'list-outside': 'list-style-position:outside'})
+static({'list-none': 'list-style-type:none', 'list-disc': 'list-style-type:disc',
+        'list-decimal': 'list-style-type:decimal'})
+static({'appearance-none': 'appearance:none'})
+
+
+@utility(r'grid-cols-(\d+|none|\[.+\])$')
+def _grid_cols(match, negative):
+    value = match.group(1)
+    if value.isdigit():
+        value = f'repeat({value}, minmax(0, 1fr))'
+    return [('grid-template-columns', arbitrary(value) or value)]
+
+
+@utility(r'grid-rows-(\d+|none)$')
+def _grid_rows(match, negative):
+    value = match.group(1)
+    return [('grid-template-rows', f'repeat({value}, minmax(0, 1fr))' if value.isdigit() else value)]
+
+
+static({'flex-row': 'flex-direction:row', 'flex-row-reverse': 'flex-direction:row-reverse',
+        'flex-col': 'flex-direction:column', 'flex-col-reverse': 'flex-direction:column-reverse'})
+static({'flex-wrap': 'flex-wrap:wrap', 'flex-wrap-reverse': 'flex-wrap:wrap-reverse', 'flex-nowrap': 'flex-wrap:nowrap'})
+static({f'content-{name}': f'align-content:{value}' for name, value in (
+    ('center', 'center'), ('start', 'flex-start'), ('end', 'flex-end'), ('between', 'space-between'),
+    ('around', 'space-around'), ('evenly', 'space-evenly'))})
+static({f'items-{name}': f'align-items:{value}' for name, value in (
+    ('start', 'flex-start'), ('end', 'flex-end'), ('center', 'center'), ('baseline', 'baseline'),
+    ('stretch', 'stretch'))})
+static({f'justify-{name}': f'justify-content:{value}' for name, value in (
+    ('normal', 'normal'), ('start', 'flex-start'), ('end', 'flex-end'), ('center', 'center'),
+    ('between', 'space-between'), ('around', 'space-around'), ('evenly', 'space-evenly'), ('stretch', 'stretch'))})
+
+
+@utility(r'gap(-[xy])?-(.+)$')
+def _gap(match, negative):
+    value = spacing(match.group(2))
+    if value is None:
+        return None
+    prop = {'': 'gap', '-x': 'column-gap', '-y': 'row-gap'}[match.group(1) or '']
+    return [(prop, value)]
+
+
+@utility(r'space-([xy])-(.+)$', negative=True)
+def _space(match, negative):
+    axis = match.group(1)
+    if match.group(2) == 'reverse':
+        return [(CHILDREN, [(f'--tw-space-{axis}-reverse', '1')])]
+    value = spacing(match.group(2), negative)
+    if value is None:
+        return None
+    start, end = ('left', 'right') if axis == 'x' else ('top', 'bottom')
+    return [(CHILDREN, [
+        (f'--tw-space-{axis}-reverse', '0'),
+        (f'margin-{end}', f'calc({value} * var(--tw-space-{axis}-reverse))'),
+        (f'margin-{start}', f'calc({value} * calc(1 - var(--tw-space-{axis}-reverse)))'),
+    ])]
+
+
+@utility(r'divide-([xy])(?:-(\d+))?$')
+def _divide_width(match, negative):
+    axis = match.group(1)
+    width = f'{match.group(2) or 1}px'
+    start, end = ('left', 'right') if axis == 'x' else ('top', 'bottom')
+    return [(CHILDREN, [
+        (f'--tw-divide-{axis}-reverse', '0'),
+        (f'border-{end}-width', f'calc({width} * var(--tw-divide-{axis}-reverse))'),
+        (f'border-{start}-width', f'calc({width} * calc(1 - var(--tw-divide-{axis}-reverse)))'),
+    ])]
+
+
+@utility(r'divide-(solid|dashed|dotted|double|none)$')
+def _divide_style(match, negative):
+    return [(CHILDREN, [('border-style', match.group(1))])]
+
+
+@utility(r'divide-(.+)$')
+def _divide_color(match, negative):
+    declarations = color_declarations(match.group(1), 'border-color', '--tw-divide-opacity')
+    return declarations and [(CHILDREN, declarations)]
+
+
+static({f'self-{name}': f'align-self:{value}' for name, value in (
+    ('auto', 'auto'), ('start', 'flex-start'), ('end', 'flex-end'), ('center', 'center'),
+    ('stretch', 'stretch'), ('baseline', 'baseline'))})
+
+
+def _overflow(match, negative):
+    return [('overflow' + match.group(1), match.group(2))]
+
+
+for _pattern in (r'overflow()-(auto|hidden|clip|visible|scroll)$', r'overflow(-[xy])-(auto|hidden|clip|visible|scroll)$'):
+    utility(_pattern)(_overflow)
+
+
+static({'truncate': 'overflow:hidden;text-overflow:ellipsis;white-space:nowrap',
+        'text-ellipsis': 'text-overflow:ellipsis', 'text-clip': 'text-overflow:clip'})
+static({f'whitespace-{name}': f'white-space:{name}' for name in (
+    'normal', 'nowrap', 'pre', 'pre-line', 'pre-wrap', 'break-spaces')})
+static({'break-normal': 'overflow-wrap:normal;word-break:normal', 'break-words': 'overflow-wrap:break-word',
+        'break-all': 'word-break:break-all', 'break-keep': 'word-break:keep-all'})
+
+
+def _rounded(match, negative):
+    size = match.group(2) or ''
+    value = RADII.get(size) or arbitrary(size)
+    if value is None:
+        return None
+    return [(prop, value) for prop in RADIUS_SIDES[match.group(1)]]
+
+
+for _sides in ('()', '-(t|r|b|l)', '-(tl|tr|br|bl)'):
+    utility(rf'rounded{_sides}(?:-(none|sm|md|lg|xl|2xl|3xl|full|\[.+\]))?$')(_rounded)
+
+
+def _border_width(match, negative):
+    width = match.group(2)
+    value = '1px' if width is None else (arbitrary(width) or f'{width}px')
+    return [(prop, value) for prop in BORDER_SIDES[match.group(1)]]
+
+
+for _sides in ('()', '-([xy])', '-([trbl])'):
+    utility(rf'border{_sides}(?:-(\d+|\[\d.*\]))?$')(_border_width)
+
+
+static({f'border-{name}': f'border-style:{name}' for name in ('solid', 'dashed', 'dotted', 'double', 'hidden', 'none')})
+
+
+def _border_color(match, negative):
+    side = match.group(1)
+    if side:
+        props = [f'border{edge}-color' for edge in BOX_SIDES[side]]
+        result = []
+        for prop in props:
+            declarations = color_declarations(match.group(2), prop, '--tw-border-opacity')
+            if declarations is None:
+                return None
+            result.extend(d for d in declarations if d not in result)
+        return result
+    return color_declarations(match.group(2), 'border-color', '--tw-border-opacity')
+
+
+for _sides in ('()', '-([xy])', '-([trbl])'):
+    utility(rf'border{_sides}-(.+)$')(_border_color)
+
+
+@utility(r'border-opacity-(\d+)$')
+def _border_opacity(match, negative):
+    value = OPACITY.get(match.group(1))
+    return value and [('--tw-border-opacity', value)]
+
+
+@utility(r'bg-(.+)$')
+def _bg_color(match, negative):
+    return color_declarations(match.group(1), 'background-color', '--tw-bg-opacity')
+
+
+@utility(r'bg-opacity-(\d+)$')
+def _bg_opacity(match, negative):
+    value = OPACITY.get(match.group(1))
+    return value and [('--tw-bg-opacity', value)]
+
+
+@utility(r'bg-gradient-to-(t|tr|r|br|b|bl|l|tl)$')
+def _bg_gradient(match, negative):
+    direction = {'t': 'top', 'tr': 'top right', 'r': 'right', 'br': 'bottom right', 'b': 'bottom',
+                 'bl': 'bottom left', 'l': 'left', 'tl': 'top left'}[match.group(1)]
+    return [('background-image', f'linear-gradient(to {direction}, var(--tw-gradient-stops))')]
+
+
+static({'bg-none': 'background-image:none'})
+
+
+@utility(r'(from|via|to)-(.+)$')
+def _gradient_stop(match, negative):
+    declarations = color_declarations(match.group(2), 'color')
+    if declarations is None:
+        return None
+    color = declarations[-1][1]
+    if color.startswith('#'):
+        r, g, b = _hex_rgb(color)
+        transparent = f'rgb({r} {g} {b} / 0)'
+    else:
+        transparent = 'rgb(255 255 255 / 0)' if color != 'transparent' else 'transparent'
+    stop = match.group(1)
+    if stop == 'from':
+        return [('--tw-gradient-from', f'{color} var(--tw-gradient-from-position)'),
+                ('--tw-gradient-to', f'{transparent} var(--tw-gradient-to-position)'),
+                ('--tw-gradient-stops', 'var(--tw-gradient-from), var(--tw-gradient-to)')]
+    if stop == 'via':
+        return [('--tw-gradient-to', f'{transparent}  var(--tw-gradient-to-position)'),
+                ('--tw-gradient-stops',
+                 f'var(--tw-gradient-from), {color} var(--tw-gradient-via-position), var(--tw-gradient-to)')]
+    return [('--tw-gradient-to', f'{color} var(--tw-gradient-to-position)')]
+
+
+static({'bg-cover': 'background-size:cover', 'bg-contain': 'background-size:contain',
+        'bg-center': 'background-position:center', 'bg-no-repeat': 'background-repeat:no-repeat'})
+static({'object-cover': 'object-fit:cover', 'object-contain': 'object-fit:contain'})
+
+
+@utility(r'p()-(.+)$')
+def _padding(match, negative):
+    return _box('padding', match, negative)
+
+
+@utility(r'p([xy])-(.+)$')
+def _padding_axis(match, negative):
+    return _box('padding', match, negative)
+
+
+@utility(r'p([trbl])-(.+)$')
+def _padding_side(match, negative):
+    return _box('padding', match, negative)
+
+
+static({f'text-{name}': f'text-align:{name}' for name in ('left', 'center', 'right', 'justify', 'start', 'end')})
+static({f'align-{name}': f'vertical-align:{name}' for name in ('baseline', 'top', 'middle', 'bottom', 'text-top',
+                                                                'text-bottom', 'sub', 'super')})
+static({'font-sans': f'font-family:{FONT_SANS}',
+        'font-serif': 'font-family:ui-serif, Georgia, Cambria, "Times New Roman", Times, serif',
+        'font-mono': f'font-family:{FONT_MONO}'})
+
+
+@utility(r'text-(xs|sm|base|lg|[2-9]?xl)$')
+def _font_size(match, negative):
+    size, line_height = FONT_SIZES[match.group(1)]
+    return [('font-size', size), ('line-height', line_height)]
+
+
+@utility(r'font-(thin|extralight|light|normal|medium|semibold|bold|extrabold|black)$')
+def _font_weight(match, negative):
+    return [('font-weight', FONT_WEIGHTS[match.group(1)])]
+
+
+static({'uppercase': 'text-transform:uppercase', 'lowercase': 'text-transform:lowercase',
+        'capitalize': 'text-transform:capitalize', 'normal-case': 'text-transform:none'})
+static({'italic': 'font-style:italic', 'not-italic': 'font-style:normal'})
+
+
+@utility(r'leading-(.+)$')
+def _leading(match, negative):
+    value = LEADING.get(match.group(1)) or arbitrary(match.group(1))
+    return value and [('line-height', value)]
+
+
+@utility(r'tracking-(.+)$', negative=True)
+def _tracking(match, negative):
+    value = TRACKING.get(match.group(1)) or arbitrary(match.group(1))
+    if value and negative:
+        value = f'calc({value} * -1)'
+    return value and [('letter-spacing', value)]
+
+
+@utility(r'text-(.+)$')
+def _text_color(match, negative):
+    return color_declarations(match.group(1), 'color', '--tw-text-opacity')
+
+
+@utility(r'text-opacity-(\d+)$')
+def _text_opacity(match, negative):
+    value = OPACITY.get(match.group(1))
+    return value and [('--tw-text-opacity', value)]
+
+
+static({'underline': 'text-decoration-line:underline', 'overline': 'text-decoration-line:overline',
+        'line-through': 'text-decoration-line:line-through', 'no-underline': 'text-decoration-line:none'})
+
+
+@utility(r'placeholder-(.+)$')
+def _placeholder_color(match, negative):
+    declarations = color_declarations(match.group(1), 'color', '--tw-placeholder-opacity')
+    return declarations and [('::placeholder', declarations)]
+
+
+@utility(r'opacity-(\d+|\[.+\])$')
+def _opacity(match, negative):
+    value = OPACITY.get(match.group(1)) or arbitrary(match.group(1))
+    return value and [('opacity', value)]
+
+
+@utility(r'shadow(?:-(sm|md|lg|xl|2xl|inner|none))?$')
+def _shadow(match, negative):
+    shadow, colored = SHADOWS[match.group(1) or '']
+    return [('--tw-shadow', shadow), ('--tw-shadow-colored', colored), ('box-shadow', BOX_SHADOW)]
+
+
+static({'outline-none': 'outline:2px solid transparent;outline-offset:2px', 'outline': 'outline-style:solid',
+        'outline-dashed': 'outline-style:dashed'})
+
+
+@utility(r'ring(?:-(\d+))?$')
+def _ring_width(match, negative):
+    width = f'{match.group(1) or 3}px'
+    return [
+        ('--tw-ring-offset-shadow',
+         'var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color)'),
+        ('--tw-ring-shadow',
+         f'var(--tw-ring-inset) 0 0 0 calc({width} + var(--tw-ring-offset-width)) var(--tw-ring-color)'),
+        ('box-shadow', 'var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)'),
+    ]
+
+
+static({'ring-inset': '--tw-ring-inset:inset'})
+
+
+@utility(r'ring-offset-(\d+)$')
+def _ring_offset_width(match, negative):
+    return [('--tw-ring-offset-width', f'{match.group(1)}px')]
+
+
+@utility(r'ring-offset-(.+)$')
+def _ring_offset_color(match, negative):
+    return color_declarations(match.group(1), '--tw-ring-offset-color')
+
+
+@utility(r'ring-(.+)$')
+def _ring_color(match, negative):
+    return color_declarations(match.group(1), '--tw-ring-color', '--tw-ring-opacity')
+
+
+@utility(r'ring-opacity-(\d+)$')
+def _ring_opacity(match, negative):
+    value = OPACITY.get(match.group(1))
+    return value and [('--tw-ring-opacity', value)]
+
+
+@utility(r'blur(?:-(none|sm|md|lg|xl|2xl|3xl))?$')
+def _blur(match, negative):
+    return [('--tw-blur', BLUR[match.group(1) or '']), ('filter', FILTER)]
+
+
+static({'filter': f'filter:{FILTER}', 'filter-none': 'filter:none'})
+
+
+@utility(r'backdrop-blur(?:-(none|sm|md|lg|xl|2xl|3xl))?$')
+def _backdrop_blur(match, negative):
+    return [('--tw-backdrop-blur', BLUR[match.group(1) or '']), ('-webkit-backdrop-filter', BACKDROP_FILTER),
+            ('backdrop-filter', BACKDROP_FILTER)]
+
+
+@utility(r'transition(?:-(all|colors|opacity|shadow|transform|none))?$')
+def _transition(match, negative):
+    name = match.group(1) or ''
+    if name == 'none':
+        return [('transition-property', 'none')]
+    return [('transition-property', TRANSITIONS[name]), ('transition-timing-function', EASE_IN_OUT),
+            ('transition-duration', '150ms')]
+
+
+@utility(r'delay-(\d+)$')
+def _delay(match, negative):
+    return [('transition-delay', f'{match.group(1)}ms')] if match.group(1) in DURATIONS else None
+
+
+@utility(r'duration-(\d+)$')
+def _duration(match, negative):
+    return [('transition-duration', f'{match.group(1)}ms')] if match.group(1) in DURATIONS else None
+
+
+@utility(r'ease-(linear|in|out|in-out)$')
+def _ease(match, negative):
+    return [('transition-timing-function', EASES[match.group(1)])]
+
+
+@utility(r'content-(none|\[.+\])$')
+def _content(match, negative):
+    value = 'none' if match.group(1) == 'none' else arbitrary(match.group(1))
+    return [('--tw-content', value), ('content', 'var(--tw-content)')]
+
+
+def split_variants(candidate):
+    """按 : 拆分变体（[...] 中的 : 不算）"""
+    parts = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(candidate):
+        if ch == '[':
+            depth += 1
+        elif ch == ']':
+            depth -= 1
+        elif ch == ':' and depth == 0:
+            parts.append(candidate[start:i])
+            start = i + 1
+    parts.append(candidate[start:])
+    return parts[:-1], parts[-1]
+
+
+def _declarations_text(declarations, important):
+    suffix = ' !important' if important else ''
+    return ';'.join(f'{prop}:{value}{suffix}' for prop, value in declarations)
+
+
+def _value_rank(value):
+    """同一插件内按主题中的取值顺序排序：先按间距比例和颜色顺序，其它按名称"""
+    for scale in (SPACING, COLORS, OPACITY, FONT_SIZES, RADII, SHADOWS):
+        if value in scale:
+            return list(scale).index(value)
+    return len(SPACING) + len(COLORS)
+
+
+# 所有工具类正则合成一个，先快速排除大部分不是工具类的候选
+_ANY_UTILITY = re.compile('|'.join(f'(?:{pattern.pattern})' for pattern, _, _ in UTILITIES))
+
+
+def generate_rules(candidate):
+    """一个候选类名生成的规则列表（不是 Tailwind 工具类时为空列表）"""
+    variants, name = split_variants(candidate)
+    if not _ANY_UTILITY.match(name.lstrip('!-')):
+        return []
+    important = name.startswith('!')
+    name = name.lstrip('!')
+    negative = name.startswith('-')
+    name = name.lstrip('-') if negative else name
+
+    media = None
+    screen_rank = 0
+    variant_ranks = []
+    prefix = ''
+    pseudo_classes = ''
+    pseudo_element = ''
+    for variant in variants:
+        if variant in SCREENS:
+            if media:
+                return []
+            media = f'@media (min-width: {SCREENS[variant]})'
+            screen_rank = list(SCREENS).index(variant) + 1
+            continue
+        if variant not in VARIANT_ORDER:
+            return []
+        variant_ranks.append(VARIANT_ORDER[variant])
+        if variant in PSEUDO_ELEMENTS:
+            pseudo_element = PSEUDO_ELEMENTS[variant]
+            continue
+        base = variant.split('-', 1)[1] if variant.startswith(('group-', 'peer-')) else variant
+        selector = PSEUDO_SELECTORS.get(base, ':' + base)
+        if variant.startswith('group-'):
+            prefix = f'.group{selector} ' + prefix
+        elif variant.startswith('peer-'):
+            prefix = f'.peer{selector} ~ ' + prefix
+        else:
+            pseudo_classes += selector
+
+    for index, (pattern, handler, allow_negative) in enumerate(UTILITIES):
+        if negative and not allow_negative:
+            continue
+        match = pattern.match(name)
+        if not match:
+            continue
+        declarations = handler(match, negative)
+        if not declarations:
+            continue
+
+        value = match.group(match.lastindex) if match.lastindex else ''
+        sort_key = (screen_rank, tuple(sorted(variant_ranks, reverse=True)), index, _value_rank(value), candidate)
+        selector = prefix + '.' + escape_class(candidate) + pseudo_classes
+        plain = [d for d in declarations if not isinstance(d[1], list)]
+        nested = [d for d in declarations if isinstance(d[1], list)]
+        if pseudo_element in ('::before', '::after') and plain and ('content', 'var(--tw-content)') not in plain:
+            # before/after 变体的规则都要带上 content，伪元素才会生成
+            plain.append(('content', 'var(--tw-content)'))
+
+        rules = []
+        if plain:
+            rules.append(Rule(sort_key, media, selector + pseudo_element, _declarations_text(plain, important)))
+        for child, child_declarations in nested:
+            if child.startswith('@media'):
+                rules.append(Rule(sort_key, child, selector + pseudo_element,
+                                  _declarations_text(child_declarations, important)))
+            else:
+                rules.append(Rule(sort_key, media, selector + child + pseudo_element,
+                                  _declarations_text(child_declarations, important)))
+        return rules
+    return []
+
+
+def expand_templates(text):
+    """
+    展开 JS 模板字符串拼出的类名：bg-${color}-100 -> bg-red-100、bg-blue-100 ...
+    只展开 ${...} 正好占据颜色名位置的情况
+    """
+    candidates = set()
+    for match in re.finditer(r'([\w:-]*-)\$\{[^}`]*\}(-\d{2,3}(?:/\d+)?)', text):
+        for color in PALETTE:
+            candidates.add(f'{match.group(1)}{color}{match.group(2)}')
+    return candidates
+
+
+CANDIDATE_PATTERN = re.compile(r'''[^\s"'`<>=;{}(),\\]+''')
+CLASS_ATTR_PATTERN = re.compile(r'''\bclass\s*=\s*(?:"([^"]*)"|'([^']*)')''', re.I)
+
+
+def collect_candidates(texts):
+    """从页面、脚本等文本中收集候选类名"""
+    candidates = set()
+    for text in texts:
+        candidates.update(CANDIDATE_PATTERN.findall(text))
+        for match in CLASS_ATTR_PATTERN.finditer(text):
+            candidates.update((match.group(1) or match.group(2) or '').split())
+        candidates.update(expand_templates(text))
+    return candidates
+
+
+def class_attribute_names(texts):
+    """class 属性中出现的所有类名，用于报告无法生成的类名"""
+    names = set()
+    for text in texts:
+        for match in CLASS_ATTR_PATTERN.finditer(text):
+            names.update(name for name in (match.group(1) or match.group(2) or '').split() if '${' not in name
+                         and '{' not in name)
+    return names
+
+
+def build_stylesheet(candidates):
+    """
+    生成样式表，返回 (CSS 文本, 生成了规则的类名集合)
+    """
+    rules = []
+    used = set()
+    keyframes = set()
+    for candidate in candidates:
+        generated = generate_rules(candidate)
+        if generated:
+            used.add(candidate)
+            rules.extend(generated)
+            name = split_variants(candidate)[1]
+            if name.startswith('animate-') and name[8:] in KEYFRAMES:
+                keyframes.add(name[8:])
+    rules.sort(key=lambda rule: rule.sort_key)
+
+    lines = [PREFLIGHT.rstrip('\n'), DEFAULTS.rstrip('\n')]
+    lines.extend(KEYFRAMES[name] for name in KEYFRAMES if name in keyframes)
+    medias = {}
+    for rule in rules:
+        if rule.media:
+            medias.setdefault(rule.media, []).append(rule)
+        else:
+            lines.append(f'{rule.selector}{{{rule.declarations}}}')
+    # 响应式规则放在最后，按断点从小到大
+    for media in sorted(medias, key=lambda m: int(re.search(r'(\d+)px', m).group(1))):
+        body = ''.join(f'{rule.selector}{{{rule.declarations}}}' for rule in medias[media])
+        lines.append(f'{media}{{{body}}}')
+    return '\n'.join(lines) + '\n', used
+
+
+CDN_SCRIPT_PATTERN = re.compile(r'[ \t]*<script\s+src="https://cdn\.tailwindcss\.com[^"]*"\s*>\s*</script>[ \t]*\n?')
+STYLESHEET_NAME = 'css/tailwind.{hash}.css'
+SELECTOR_CLASS_PATTERN = re.compile(r'\.(-?[A-Za-z_][\w-]*)')
+STYLE_PATTERN = re.compile(r'<style\b[^>]*>(.*?)</style\s*>', re.S | re.I)
+PLAIN_CLASS_PATTERN = re.compile(r'[\w:/.\[\]!%-]+$')
+
+# 只用作 group-* / peer-* 变体标记、本身没有样式的类
+MARKER_CLASSES = {'group', 'peer'}
+
+PurgeResult = namedtuple('PurgeResult', ['pages', 'name', 'css', 'used', 'unknown'])
+
+
+def stylesheet_classes(texts):
+    """页面 <style> 和样式文件中选择器用到的类名（自定义类）"""
+    classes = set()
+    for text in texts:
+        for body in STYLE_PATTERN.findall(text) or [text]:
+            classes.update(SELECTOR_CLASS_PATTERN.findall(body))
+    return classes
+
+
+def purge_pages(pages, sources, stylesheets):
+    """
+    为页面生成 Tailwind 子集样式表，并把 CDN 脚本换成样式表链接
+    sources 为其它需要扫描类名的文本（js/ 模块、侧边栏模板等），stylesheets 为样式文件内容
+    链接插在 </head> 之前：CDN 运行时生成的 <style> 同样追加在 head 末尾，与页面自身样式的层叠顺序不变
+    返回 PurgeResult，unknown 为 class 属性中像工具类、但既无法生成也没有样式定义的类名
+    """
+    texts = list(pages.values()) + list(sources)
+    css, used = build_stylesheet(collect_candidates(texts))
+    name = shared_stylesheet_name(css)
+
+    rewritten = {}
+    for filename, content in pages.items():
+        if not CDN_SCRIPT_PATTERN.search(content):
+            continue
+        content = CDN_SCRIPT_PATTERN.sub('', content, count=1)
+        head_end = content.find('</head>')
+        if head_end < 0:
+            continue
+        line_start = content.rfind('\n', 0, head_end) + 1
+        indent = content[line_start:head_end] if not content[line_start:head_end].strip() else ''
+        link = f'{indent}    <link rel="stylesheet" href="{name}">\n'
+        rewritten[filename] = content[:line_start] + link + content[line_start:]
+
+    # 只报告看起来像工具类（与已生成的工具类前缀相同）、却没有生成规则也没有样式定义的类名，通常是拼写错误
+    heads = {split_variants(cls)[1].lstrip('!-').split('-')[0] for cls in used}
+    defined = stylesheet_classes(texts + list(stylesheets)) | MARKER_CLASSES
+    unknown = {cls for cls in class_attribute_names(pages.values())
+               if PLAIN_CLASS_PATTERN.match(cls) and cls not in used and cls not in defined
+               and split_variants(cls)[1].lstrip('!-').split('-')[0] in heads}
+    return PurgeResult(rewritten, name, css, used, unknown)
+
+
+def shared_stylesheet_name(css):
+    return STYLESHEET_NAME.format(hash=hashlib.sha256(css.encode('utf-8')).hexdigest()[:10])
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+内置页面变换
+把原来各个一次性脚本的改写逻辑注册到改写引擎中，可以按任意顺序串联执行
+"""
+
+from page_tools.categories import CATEGORY_TARGETS, remap_task_categories
+from page_tools.engine import register_transform
+from page_tools.index import PageQuery
+from page_tools.legacy_sidebar import PAGE_CONFIGS, replace_legacy_sidebar
+from page_tools.sections import (
+    NAV_TEMPLATE_TARGETS, ORG_ORDER_TARGETS, SERVICE_SECTION_TARGETS, TASK_LINK_TARGETS,
+    TEMPLATE_GROUP_TARGETS, TEMPLATE_MENU_TARGETS, apply_nav_template_menu, apply_template_menu,
+    group_template_menus, insert_task_template_link, move_organizations_last, update_service_section,
+)
+from page_tools.sidebar import SIDEBAR_PAGES, replace_sidebar
+
+
+@register_transform('sidebar', PageQuery(pages=SIDEBAR_PAGES), '标准侧边栏整块替换 (update-sidebars-unified.py)')
+def sidebar_replace(content, filename):
+    return replace_sidebar(content, SIDEBAR_PAGES.get(filename, ''))
+
+
+@register_transform('legacy-sidebar', PageQuery(pages=PAGE_CONFIGS), '旧版侧边栏整块替换 (update-sidebars.py)')
+def legacy_sidebar_replace(content, filename):
+    return replace_legacy_sidebar(content, filename)
+
+
+@register_transform('service-section', SERVICE_SECTION_TARGETS, '智能服务二级菜单 (update-sidebars-menu.py)')
+def service_section(content, filename):
+    return update_service_section(content, filename)
+
+
+@register_transform('template-group', TEMPLATE_GROUP_TARGETS, '模板管理归集到系统管理 (update-sidebar-menu.py)')
+def template_group(content, filename):
+    return group_template_menus(content)
+
+
+@register_transform('task-template-link', TASK_LINK_TARGETS, '插入任务模板链接 (update-sidebar-add-task-templates.py)')
+def task_template_link(content, filename):
+    return insert_task_template_link(content)
+
+
+@register_transform('org-order', ORG_ORDER_TARGETS, '组织管理移到系统设置下面 (update-sidebar-order.py)')
+def org_order(content, filename):
+    return move_organizations_last(content)
+
+
+@register_transform('template-order', TEMPLATE_MENU_TARGETS, '模板管理按业务流程排序 (update-all-sidebars.py)')
+def template_order(content, filename):
+    return apply_template_menu(content)
+
+
+@register_transform('nav-template-order', NAV_TEMPLATE_TARGETS, 'nav-link 侧边栏模板管理排序 (update-sidebar-template-order.py)')
+def nav_template_order(content, filename):
+    return apply_nav_template_menu(content)
+
+
+@register_transform('task-categories', CATEGORY_TARGETS, '任务模板分类迁移 (fix-task-templates.py)')
+def task_categories(content, filename):
+    return remap_task_categories(content)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+文件变化监听
+Linux 下通过 ctypes 调用 inotify 监听文件所在目录；inotify 不可用时退回到定时 stat 轮询。
+两种监听器接口相同: poll(timeout) 返回这段时间内发生变化的文件绝对路径集合。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+# inotify 事件掩码（见 <sys/inotify.h>）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# 编辑器保存和原子替换（写临时文件后 rename）都会落在这几类事件上
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct('iIII')
+
+# 默认防抖时间和轮询间隔（秒）
+DEBOUNCE = 0.1
+POLL_INTERVAL = 0.2
+
+
+class InotifyWatcher:
+    """基于 inotify 的监听器，监听文件所在目录，按文件名过滤"""
+
+    name = 'inotify'
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 失败')
+
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.dirs = {}
+        for directory in sorted({os.path.dirname(path) for path in self.paths}):
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(errno, f'inotify_add_watch 失败: {directory}')
+            self.dirs[wd] = directory
+
+    def poll(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        pos = 0
+        while pos < len(data):
+            wd, _, _, length = EVENT_HEADER.unpack_from(data, pos)
+            pos += EVENT_HEADER.size
+            name = os.fsdecode(data[pos:pos + length].rstrip(b'\0'))
+            pos += length
+            path = os.path.join(self.dirs.get(wd, ''), name)
+            if path in self.paths:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """定时 stat 轮询，比较文件大小和修改时间"""
+
+    name = 'polling'
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.interval = interval
+        self.snapshot = {path: self._stat(path) for path in self.paths}
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def poll(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                current = self._stat(path)
+                if current != self.snapshot[path]:
+                    self.snapshot[path] = current
+                    changed.add(path)
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+def create_watcher(paths, polling=False, interval=POLL_INTERVAL):
+    """优先使用 inotify，不可用（非 Linux、句柄数超限等）时使用轮询"""
+    if not polling and hasattr(select, 'select') and os.name == 'posix':
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths, interval)
+
+
+def wait_for_changes(watcher, debounce=DEBOUNCE):
+    """
+    阻塞直到有文件变化，并把 debounce 秒内连续发生的变化合并为一批
+    返回 (变化的文件集合, 第一次检测到变化的时刻 time.perf_counter())
+    """
+    changed = set()
+    while not changed:
+        changed = watcher.poll(1.0)
+    first_seen = time.perf_counter()
+
+    while True:
+        more = watcher.poll(debounce)
+        if not more:
+            return changed, first_seen
+        changed |= more
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+页面体积分析
+把每个页面的字节分到以下几类，找出页面为什么这么大:
+    sidebar     侧边栏整块（与改写脚本相同的区段定位：内联侧边栏整块或共享模式的桩代码）
+    script      内联 <script> 元素（外部脚本的 <script src> 标签算作 markup）
+    style       内联 <style> 元素
+    comments    HTML 注释
+    whitespace  标签之间含换行的空白（缩进和换行，minify 阶段可以去掉的部分）
+    markup      其余的标签和文本
+侧边栏区段内的内容都算作 sidebar。另外按行统计与其它页面重复的字节（去掉首尾空白后相同、长度不少于
+DUPLICATE_MIN_LINE 的行，不含缩进），也按所在分类汇总，用来估计抽取共享文件能省下多少。
+
+预算配置（JSON）:
+    {
+        "default": {"total": "100 KB"},
+        "pages": {"customer-detail.html": {"total": "250 KB", "script": "160 KB"}}
+    }
+键为 total、duplicate 或分类名，值为字节数或带 KB/MB 的字符串；页面的配置覆盖 default 中的同名键。
+"""
+
+import bisect
+import json
+import re
+from collections import namedtuple
+
+from page_tools.scanner import ATTRS
+from page_tools.spans import locate_sidebar_block
+
+CATEGORIES = ('script', 'style', 'sidebar', 'comments', 'whitespace', 'markup')
+BUDGET_KEYS = ('total', 'duplicate') + CATEGORIES
+DUPLICATE_MIN_LINE = 16
+
+TOKEN_PATTERN = re.compile(
+    rb'(?P<comments><!--.*?-->)'
+    rb'|(?P<raw><(?P<name>script|style)\b(?P<attrs>' + ATTRS.encode('ascii') + rb')>(?P<body>.*?)</(?P=name)\s*>)'
+    rb'|(?P<whitespace>[ \t\r\f]*\n[ \t\r\n\f]*)',
+    re.S | re.I,
+)
+SRC_PATTERN = re.compile(rb'\bsrc\s*=', re.I)
+SIZE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(B|KB|K|MB|M)?\s*$', re.I)
+SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 * 1024, 'MB': 1024 * 1024}
+
+# categories: 分类 -> 字节数；duplicate: 与其它页面重复的字节数；duplicate_by: 分类 -> 其中重复的字节数
+PageBreakdown = namedtuple('PageBreakdown', ['page', 'total', 'categories', 'duplicate', 'duplicate_by'])
+
+# key: total / duplicate / 分类名；actual 超过 budget
+BudgetViolation = namedtuple('BudgetViolation', ['page', 'key', 'actual', 'budget'])
+
+
+def classify(data):
+    """把页面字节分类，返回按起点排序的 [(起点, 终点, 分类)]，覆盖整个页面"""
+    regions = []
+    sidebar = locate_sidebar_block(data)
+    if sidebar is None:
+        outside = [(0, len(data))]
+    else:
+        outside = [(0, sidebar.start), (sidebar.end, len(data))]
+        regions.append((sidebar.start, sidebar.end, 'sidebar'))
+
+    for start, end in outside:
+        pos = start
+        for match in TOKEN_PATTERN.finditer(data, start, end):
+            if match.group('comments'):
+                category = 'comments'
+            elif match.group('raw'):
+                category = match.group('name').lower().decode('ascii')
+                if category == 'script' and not match.group('body').strip() \
+                        and SRC_PATTERN.search(match.group('attrs')):
+                    category = 'markup'
+            else:
+                category = 'whitespace'
+            if match.start() > pos:
+                regions.append((pos, match.start(), 'markup'))
+            regions.append((match.start(), match.end(), category))
+            pos = match.end()
+        if end > pos:
+            regions.append((pos, end, 'markup'))
+    regions.sort()
+    return regions
+
+
+def _lines(data):
+    """(行起点, 去掉首尾空白后的内容)"""
+    pos = 0
+    for line in data.split(b'\n'):
+        yield pos, line.strip()
+        pos += len(line) + 1
+
+
+def analyze_pages(pages):
+    """pages: 文件名 -> 页面字节；返回 [PageBreakdown]，顺序与 pages 相同"""
+    regions = {page: classify(data) for page, data in pages.items()}
+
+    owners = {}
+    for page, data in pages.items():
+        for _, text in _lines(data):
+            if len(text) >= DUPLICATE_MIN_LINE:
+                owners.setdefault(text, set()).add(page)
+
+    result = []
+    for page, data in pages.items():
+        categories = dict.fromkeys(CATEGORIES, 0)
+        for start, end, category in regions[page]:
+            categories[category] += end - start
+
+        starts = [start for start, _, _ in regions[page]]
+        duplicate_by = dict.fromkeys(CATEGORIES, 0)
+        for pos, text in _lines(data):
+            if len(text) >= DUPLICATE_MIN_LINE and len(owners[text]) > 1:
+                # 只算去掉缩进后的内容，按第一个非空白字符所在的分类汇总
+                index = bisect.bisect_right(starts, data.index(text, pos)) - 1
+                duplicate_by[regions[page][index][2]] += len(text)
+        result.append(PageBreakdown(page, len(data), categories, sum(duplicate_by.values()), duplicate_by))
+    return result
+
+
+def parse_size(value):
+    """字节数：整数，或 "120 KB" / "1.5MB" 这样的字符串"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    match = SIZE_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f'无法识别的大小: {value!r}')
+    return int(float(match.group(1)) * SIZE_UNITS[(match.group(2) or '').upper()])
+
+
+def load_budgets(path):
+    """
+    读取预算配置，返回 (默认预算, {页面: 预算})，预算为 {键: 字节数}
+    文件格式或键名不对时抛出 ValueError
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ValueError(f'{path} 不是有效的 JSON: {e}') from e
+
+    def parse(section, name):
+        unknown = set(section) - set(BUDGET_KEYS)
+        if unknown:
+            raise ValueError(f"{name} 中有未知的预算项: {', '.join(sorted(unknown))}"
+                             f"（可用: {', '.join(BUDGET_KEYS)}）")
+        return {key: parse_size(value) for key, value in section.items()}
+
+    default = parse(data.get('default', {}), 'default')
+    pages = {page: parse(section, page) for page, section in data.get('pages', {}).items()}
+    return default, pages
+
+
+def check_budgets(breakdowns, default, pages):
+    """返回超出预算的项 [BudgetViolation]"""
+    violations = []
+    for item in breakdowns:
+        budget = dict(default)
+        budget.update(pages.get(item.page, {}))
+        for key in BUDGET_KEYS:
+            if key not in budget:
+                continue
+            actual = {'total': item.total, 'duplicate': item.duplicate}.get(key, item.categories.get(key))
+            if actual > budget[key]:
+                violations.append(BudgetViolation(item.page, key, actual, budget[key]))
+    return violations
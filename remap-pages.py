@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按映射文件批量替换页面中的文本
+映射中的所有键编译成一个自动机，每个页面只扫描一遍，替换结果不会被其它键再次替换，按键统计替换次数
+
+映射文件（JSON）为 {"旧文本": "新文本", ...}，或分组给出上下文:
+    [
+        {"mapping": {"hydration": "customer_follow_up"}, "contexts": ["quoted", "attribute"], "whole": true},
+        {"mapping": {"补水保湿": "客户跟进"}, "contexts": ["text", "attribute", "quoted"]}
+    ]
+上下文见 page_tools/remap.py: text / attribute / quoted / code / any
+
+用法:
+    python remap-pages.py labels.json --dry-run
+    python remap-pages.py labels.json --context text attribute --pages customers.html orders.html
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+
+from page_tools.fileio import write_atomic
+from page_tools.index import PageQuery, select_pages
+from page_tools.remap import CONTEXTS, Remapper, RemapRule
+
+
+def load_rules(path, contexts, whole):
+    """读取映射文件；平铺的映射使用命令行给出的上下文"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return [RemapRule(data, tuple(contexts), whole)]
+    return [RemapRule(item['mapping'], tuple(item.get('contexts', ('any',))), item.get('whole', False))
+            for item in data]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='按映射文件批量替换页面中的文本')
+    parser.add_argument('mapping', help='映射文件（JSON）')
+    parser.add_argument('--context', nargs='+', choices=CONTEXTS, default=['any'],
+                        help='平铺映射允许的上下文（默认 any）')
+    parser.add_argument('--whole', action='store_true', help='平铺映射只替换整个字符串或属性值')
+    parser.add_argument('--pages', nargs='+', help='只处理指定页面（默认所有页面）')
+    parser.add_argument('--dry-run', action='store_true', help='只统计替换次数，不写回文件')
+    args = parser.parse_args()
+
+    try:
+        remapper = Remapper(load_rules(args.mapping, args.context, args.whole))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"[ERROR] 无法读取映射文件 {args.mapping}: {e}")
+        return 1
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    pages = args.pages or select_pages(base_dir, PageQuery(), save=not args.dry_run)
+
+    totals = Counter()
+    updated = 0
+    for page in pages:
+        file_path = os.path.join(base_dir, page)
+        if not os.path.exists(file_path):
+            print(f"[WARN] {page} - 文件不存在")
+            continue
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        new_content, counts = remapper.remap(content)
+        if not counts:
+            continue
+
+        totals.update(counts)
+        updated += 1
+        if not args.dry_run:
+            write_atomic(file_path, new_content)
+        print(f"[OK] {page} - 替换 {sum(counts.values())} 处")
+
+    print("=" * 60)
+    print(f"页面: 处理 {len(pages)}, {'需要修改' if args.dry_run else '已修改'} {updated}")
+    for key in remapper.automaton.keys:
+        print(f"  {totals[key]:>6}  {key}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
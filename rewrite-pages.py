@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单次遍历批量改写页面
+每个页面只读一次，按顺序执行指定的变换，有变化时只写一次
+
+用法:
+    python rewrite-pages.py --list
+    python rewrite-pages.py sidebar template-order task-template-link
+    python rewrite-pages.py sidebar --pages index.html customers.html --dry-run
+    python rewrite-pages.py sidebar service-section --dry-run --profile --cprofile customers.html
+"""
+
+import argparse
+import os
+import sys
+
+from page_tools.engine import TRANSFORMS, PageRewriteEngine, get_transforms
+from page_tools.profiling import CPROFILE_OUTPUT, PROFILE_REPORT, print_cprofile, print_profile_summary, write_report
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='单次遍历批量改写页面')
+    parser.add_argument('transforms', nargs='*', help='按顺序执行的变换名称')
+    parser.add_argument('--pages', nargs='+', help='只处理指定页面（默认使用各变换自己的页面列表）')
+    parser.add_argument('--dry-run', action='store_true', help='只统计命中情况，不写回文件')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='并行进程数，0 表示使用全部CPU核心')
+    parser.add_argument('--list', action='store_true', help='列出所有可用的变换')
+    parser.add_argument('--profile', action='store_true', help='记录每个页面各阶段的耗时、读写字节数和正则匹配次数')
+    parser.add_argument('--profile-output', default=PROFILE_REPORT, help=f'剖析报告 JSON 文件（默认 {PROFILE_REPORT}）')
+    parser.add_argument('--cprofile', metavar='PAGE', help=f'对指定页面输出 cProfile 统计到 {CPROFILE_OUTPUT}')
+    args = parser.parse_args()
+
+    if args.list or not args.transforms:
+        get_transforms([])
+        print('可用的变换:')
+        for name, transform in TRANSFORMS.items():
+            print(f'  {name:<22}{transform.description}')
+        return 0
+
+    try:
+        transforms = get_transforms(args.transforms)
+    except KeyError as e:
+        print(f'[ERROR] {e.args[0]}')
+        return 1
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    engine = PageRewriteEngine(transforms, base_dir)
+
+    print('=' * 60)
+    print(f"开始批量改写页面: {' → '.join(t.name for t in transforms)}")
+    print('=' * 60)
+
+    results = engine.run(args.pages, dry_run=args.dry_run, jobs=args.jobs, profile=args.profile,
+                         cprofile=args.cprofile, cprofile_output=os.path.abspath(CPROFILE_OUTPUT))
+    engine.print_summary(results, dry_run=args.dry_run)
+
+    if args.profile:
+        pages = [r.profile for r in results if r.profile]
+        summary = write_report(args.profile_output, pages, sys.argv)
+        print_profile_summary(pages, summary, args.profile_output)
+    if args.cprofile:
+        if any(r.filename == args.cprofile and r.status != 'missing' for r in results):
+            print_cprofile(CPROFILE_OUTPUT)
+        else:
+            print(f'[WARN] {args.cprofile} 不在本次处理的页面中，未生成 cProfile 统计')
+
+    return 1 if any(r.status == 'error' for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+测试公共设置
+page_tools 不是安装包，测试从仓库根目录导入；页面夹具复制到临时目录，测试不会改动或在仓库中留下缓存文件
+"""
+
+import glob
+import os
+import shutil
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+def repo_path(*parts):
+    return os.path.join(REPO_DIR, *parts)
+
+
+def read_repo_file(name):
+    with open(repo_path(name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def sidebar_pages():
+    """仓库中带 <aside id="sidebar"> 的页面文件名（不含 _ 开头的片段文件）"""
+    names = []
+    for path in sorted(glob.glob(repo_path('[!_]*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            if '<aside id="sidebar"' in f.read():
+                names.append(os.path.basename(path))
+    return names
+
+
+@pytest.fixture
+def site(tmp_path):
+    """复制到临时目录的几个真实页面，返回目录路径"""
+    for name in ('customers.html', 'templates.html', 'settings.html', 'test.html'):
+        shutil.copy(repo_path(name), tmp_path / name)
+    return tmp_path
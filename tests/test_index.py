@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""页面索引和增量改写清单：按大小和修改时间失效，只重新扫描有变化的页面"""
+
+import json
+import os
+
+from page_tools.index import INDEX_NAME, PageIndex, PageQuery, load_index, select_pages
+from page_tools.manifest import (
+    MANIFEST_NAME, content_hash, load_manifest, make_entry, save_manifest, stat_matches,
+)
+
+
+def test_index_rescans_only_changed_pages(site):
+    index = load_index(str(site))
+    assert sorted(index.scanned) == ['customers.html', 'settings.html', 'templates.html', 'test.html']
+    assert (site / INDEX_NAME).exists()
+
+    index = load_index(str(site))
+    assert index.scanned == []
+
+    page = site / 'templates.html'
+    st = page.stat()
+    os.utime(page, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    (site / 'test.html').unlink()
+    (site / 'new.html').write_text('<html></html>', encoding='utf-8')
+    index = load_index(str(site))
+    assert sorted(index.scanned) == ['new.html', 'templates.html']
+    assert 'test.html' not in index.entries
+
+
+def test_index_records_sidebar_offsets(site):
+    index = load_index(str(site), save=False)
+    data = (site / 'customers.html').read_bytes()
+    entry = index.get('customers.html')
+    block = index.block('customers.html')
+    assert entry['sidebar'] and entry['active'] == 'customers.html'
+    assert data[block.start:block.end].lstrip().startswith('<!-- 侧边栏 -->'.encode('utf-8'))
+    assert data[slice(*entry['sections']['系统管理'])].startswith(b'<div')
+    assert index.get('test.html')['sidebar'] is False
+
+
+def test_index_queries(site):
+    assert select_pages(str(site), PageQuery(sections=('系统管理',)), save=False) == [
+        'customers.html', 'settings.html', 'templates.html']
+    assert select_pages(str(site), PageQuery(href='task-templates.html', pages=['templates.html', 'test.html']),
+                        save=False) == ['templates.html']
+
+
+def test_read_only_index_writes_nothing(site):
+    load_index(str(site), save=False)
+    assert not (site / INDEX_NAME).exists()
+
+
+def test_corrupt_or_old_index_is_rebuilt(site):
+    (site / INDEX_NAME).write_text('{not json', encoding='utf-8')
+    assert len(load_index(str(site)).scanned) == 4
+
+    data = json.loads((site / INDEX_NAME).read_text(encoding='utf-8'))
+    data['version'] = 0
+    (site / INDEX_NAME).write_text(json.dumps(data), encoding='utf-8')
+    assert len(PageIndex(str(site)).load().refresh().scanned) == 4
+
+
+def test_manifest_round_trip_and_invalidation(site):
+    page = site / 'customers.html'
+    text = page.read_text(encoding='utf-8')
+    entry = make_entry(page.stat(), content_hash(text), content_hash('span'), content_hash('render'))
+    save_manifest(str(site), {'customers.html': entry})
+    loaded = load_manifest(str(site))
+    assert loaded == {'customers.html': entry}
+    assert stat_matches(loaded['customers.html'], page.stat())
+
+    page.write_text(text + '\n', encoding='utf-8')
+    assert not stat_matches(loaded['customers.html'], page.stat())
+    assert not stat_matches(None, page.stat())
+    assert content_hash(text) == content_hash(text.encode('utf-8'))
+
+
+def test_manifest_with_other_version_is_ignored(site):
+    (site / MANIFEST_NAME).write_text(json.dumps({'version': 0, 'pages': {'a.html': {}}}), encoding='utf-8')
+    assert load_manifest(str(site)) == {}
+    (site / MANIFEST_NAME).write_text('[', encoding='utf-8')
+    assert load_manifest(str(site)) == {}
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""JS 记号扫描，以及基于它的内联脚本去重（dedupe）和脚本加载方式分析（defer）"""
+
+import pytest
+
+from page_tools.dedupe import dedupe_pages, scan_js
+from page_tools.defer import analyze_script, defer_page
+from page_tools.jslex import is_template_part, iter_tokens
+
+
+def tokens(source):
+    return [(token.kind, token.text) for token in iter_tokens(source)]
+
+
+def test_regex_versus_division():
+    assert tokens('a = b / c / d') == [
+        ('word', 'a'), ('punct', '='), ('word', 'b'), ('punct', '/'), ('word', 'c'), ('punct', '/'), ('word', 'd')]
+    assert tokens('x = /[/]"/g.test(y)')[2] == ('value', None)
+    assert tokens('return /a/.test(s)')[1] == ('value', None)
+
+
+def test_comments_and_strings_hide_brackets():
+    assert tokens('f("}", \'{\') // )\n/* ( */ g()') == [
+        ('word', 'f'), ('punct', '('), ('value', '"}"'), ('punct', ','), ('value', "'{'"), ('punct', ')'),
+        ('word', 'g'), ('punct', '('), ('punct', ')')]
+
+
+def test_nested_templates():
+    source = 'x = `a${b}c${`d${e}`}f` / 2'
+    result = list(iter_tokens(source))
+    assert [(t.kind, t.text) for t in result] == [
+        ('word', 'x'), ('punct', '='), ('punct', '${'), ('word', 'b'), ('punct', '}$'), ('punct', '${'),
+        ('punct', '${'), ('word', 'e'), ('punct', '}$'), ('value', None), ('punct', '}$'), ('value', None),
+        ('punct', '/'), ('value', None)]
+    prev = None
+    parts = []
+    for token in result:
+        if is_template_part(source, token, prev):
+            parts.append(source[token.start:token.end])
+        prev = token
+    assert parts == ['`a${', 'c${', '`d${', '`', 'f`']
+
+
+def test_newline_flag():
+    result = list(iter_tokens('a\n  b c'))
+    assert [token.newline for token in result] == [False, True, False]
+
+
+@pytest.mark.parametrize('source', ['f(', 'f())', '"abc', '`abc', '/* x', 'x = /abc', '`${`'])
+def test_unbalanced_or_unterminated_source_raises(source):
+    with pytest.raises(ValueError):
+        list(iter_tokens(source))
+
+
+def test_scan_js_finds_top_level_functions_only():
+    source = ("function a() {\n  return '}';\n}\n"
+              "var x = function b() {};\n"
+              "async function c() { return `\n${1}`; }\n"
+              "if (x) { function d() {} }\n")
+    scan = scan_js(source)
+    assert [(f.name, f.multiline) for f in scan.functions] == [('a', False), ('c', True)]
+    assert source[scan.functions[0].start:scan.functions[0].end].endswith('}')
+    assert source[scan.functions[1].start:].startswith('async function c')
+    assert scan.multiline
+    assert scan_js('function a() { (}') is None
+
+
+def page_with_script(name):
+    return f'''<body>
+        <script>
+            function formatDate(value) {{
+                return value.slice(0, 10);
+            }}
+            function {name}() {{ return 1; }}
+        </script>
+</body>'''
+
+
+def test_dedupe_extracts_functions_shared_by_pages():
+    pages = {'a.html': page_with_script('onlyA'), 'b.html': page_with_script('onlyB')}
+    new_pages, files, stats = dedupe_pages(pages)
+    assert len(files) == 1
+    (name, text), = files.items()
+    assert text.startswith('function formatDate(value) {')
+    for filename, content in new_pages.items():
+        assert 'formatDate' not in content
+        assert f'<script src="{name}"></script>' in content
+        assert stats[filename].functions == 1
+    assert 'function onlyA()' in new_pages['a.html']
+
+
+def test_dedupe_leaves_unscannable_scripts():
+    page = '<body><script>function f() { return "x; }</script></body>'
+    new_pages, files, _ = dedupe_pages({'a.html': page, 'b.html': page})
+    assert files == {} and new_pages == {'a.html': page, 'b.html': page}
+
+
+def test_analyze_script_separates_immediate_and_lazy_names():
+    info = analyze_script('var a = 1;\nfunction f() { return b(); }\n'
+                          "document.addEventListener('DOMContentLoaded', function () { f(); });\n"
+                          'var s = `${c}`, r = /d/g;')
+    assert info.declared == {'a', 'f', 's', 'r'}
+    assert 'b' not in info.immediate and 'c' in info.immediate and 'd' not in info.names
+    assert info.lazy['f'] == {'b', 'f'}
+    assert info.ready
+
+
+@pytest.mark.parametrize('inline, modes', [
+    ('helper();', ['blocking', 'inline']),
+    ('document.addEventListener("DOMContentLoaded", function () { helper(); });', ['defer', 'inline']),
+    ('var s = "helper()", r = /helper/, t = `helper`;', ['defer', 'inline']),
+])
+def test_defer_keeps_scripts_needed_at_parse_time(inline, modes):
+    page = f'<html><head>\n</head><body>\n<script src="js/a.js"></script>\n<script>{inline}</script>\n</body></html>'
+    result = defer_page(page, {'js/a.js': 'function helper() { return 1; }'}.get)
+    assert result.modes == modes
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""侧边栏菜单树：没有改动时逐字节往返，改动只影响被移动或插入的节点"""
+
+import pytest
+
+from conftest import read_repo_file, sidebar_pages
+from page_tools.menu import MenuTree, parse_node
+
+PAGES = sidebar_pages() + ['_sidebar-template.html']
+
+
+@pytest.mark.parametrize('name', PAGES)
+def test_round_trip_is_byte_stable(name):
+    content = read_repo_file(name)
+    tree = MenuTree.parse(content)
+    assert tree is not None
+    assert tree.serialize() == content
+
+
+@pytest.mark.parametrize('name', ['customers.html', 'index.html'])
+def test_round_trip_keeps_crlf(name):
+    content = read_repo_file(name).replace('\n', '\r\n')
+    assert MenuTree.parse(content).serialize() == content
+
+
+def test_items_carry_parsed_fields():
+    tree = MenuTree.parse(read_repo_file('customers.html'))
+    item = tree.find('customers.html')
+    assert (item.label, item.active, item.indent) == ('客户管理', True, 0)
+    assert tree.find('templates.html').indent == 1
+    assert tree.section('系统管理').index('settings.html') >= 0
+
+
+def test_move_changes_only_the_moved_nodes():
+    content = read_repo_file('customers.html')
+    tree = MenuTree.parse(content)
+    system = tree.section('系统管理')
+    assert system.move('settings.html', after='organizations.html')
+    moved = tree.serialize()
+    assert sorted(moved.splitlines()) == sorted(content.splitlines())
+
+    tree = MenuTree.parse(moved)
+    assert tree.section('系统管理').move('organizations.html', after='settings.html')
+    assert tree.serialize() == content
+
+
+def test_move_into_place_is_a_no_op():
+    content = read_repo_file('customers.html')
+    tree = MenuTree.parse(content)
+    assert tree.section('系统管理').move('organizations.html', after='settings.html')
+    assert tree.serialize() == content
+
+
+def test_insert_copy_follows_anchor_style():
+    tree = MenuTree.parse(read_repo_file('templates.html'))
+    section = tree.section('模板管理')
+    section.remove('diagnosis-templates.html')
+    item = section.insert_copy('templates.html', 'diagnosis-templates.html', 'stethoscope', '诊断模板')
+    assert (item.label, item.icon, item.indent, item.active) == ('诊断模板', 'stethoscope', 1, False)
+    assert [i.href for i in section.items()][-2:] == ['diagnosis-templates.html', 'task-templates.html']
+
+
+def test_parse_node_keeps_leading_comment_in_lead():
+    node = parse_node('<!-- 分组 -->\n    <div class="space-y-1"><div><span>分组</span></div>'
+                      '<a href="a.html"><span>A</span></a></div>', '\n    ')
+    assert node.lead == '\n    <!-- 分组 -->\n    '
+    assert node.kind == 'container'
+    assert [child.kind for child in node.children] == ['header', 'item']
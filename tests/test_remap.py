@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""多模式替换：Aho-Corasick 自动机和 Remapper 的最左最长、不链式替换、上下文限定"""
+
+import random
+
+import pytest
+
+from page_tools.remap import Automaton, Remapper, RemapRule, classify_contexts
+
+
+def naive_matches(keys, text):
+    return sorted((i, i + len(key), index) for index, key in enumerate(keys)
+                  for i in range(len(text)) if text.startswith(key, i))
+
+
+def test_automaton_reports_every_occurrence():
+    keys = ['he', 'she', 'his', 'hers', 'e']
+    text = 'ushers and his sheep hehe'
+    assert sorted(Automaton(keys).iter_matches(text)) == naive_matches(keys, text)
+
+
+def test_automaton_matches_naive_search_on_random_input():
+    rng = random.Random(0)
+    for _ in range(200):
+        keys = list({''.join(rng.choice('ab') for _ in range(rng.randint(1, 4))) for _ in range(6)})
+        text = ''.join(rng.choice('abc') for _ in range(40))
+        assert sorted(Automaton(keys).iter_matches(text)) == naive_matches(keys, text)
+
+
+def test_automaton_rejects_empty_key():
+    with pytest.raises(ValueError):
+        Automaton(['a', ''])
+
+
+def test_leftmost_longest_without_overlap():
+    remapper = Remapper([RemapRule({'he': '1', 'hers': '2', 'she': '3', 'rs': '4'})])
+    # she 最靠左，hers 与它重叠而放弃；之后的 rs 仍然替换
+    assert remapper.remap('ushers')[0] == 'u34'
+    assert remapper.remap('hers')[0] == '2'
+
+
+def test_replacements_are_not_chained():
+    content, counts = Remapper([RemapRule({'a': 'b', 'b': 'c'})]).remap('ab')
+    assert content == 'bc'
+    assert counts == {'a': 1, 'b': 1}
+
+
+def test_unchanged_content_is_returned_as_is():
+    content = '<p>nothing here</p>'
+    new_content, counts = Remapper([RemapRule({'hydration': 'skin'})]).remap(content)
+    assert new_content is content
+    assert not counts
+
+
+def test_duplicate_keys_and_unknown_contexts_are_rejected():
+    with pytest.raises(ValueError):
+        Remapper([RemapRule({'a': 'b'}), RemapRule({'a': 'c'})])
+    with pytest.raises(ValueError):
+        Remapper([RemapRule({'a': 'b'}, ('comment',))])
+
+
+def test_whole_value_in_quoted_and_attribute_contexts():
+    remapper = Remapper([RemapRule({'hydration': 'skin'}, ('quoted', 'attribute'), True)])
+    content = ('<div data-c="hydration" class="filter-hydration">hydration</div>'
+               '<script>f("hydration"); var hydration = 1; var t = `hydration`;</script>')
+    new_content, counts = remapper.remap(content)
+    assert new_content == ('<div data-c="skin" class="filter-hydration">hydration</div>'
+                           '<script>f("skin"); var hydration = 1; var t = `skin`;</script>')
+    assert counts == {'hydration': 3}
+
+
+def test_contexts_of_script_strings_and_comments():
+    content = '<!-- x --><a title="x">x</a><script>x("x", `x${x}x`);</script>'
+    kinds = {content[start:end]: kind for start, end, kind in classify_contexts(content)}
+    assert '<!-- x -->' not in ''.join(kinds)
+    assert [kind for start, end, kind in classify_contexts(content) if content[start:end] == 'x'] == [
+        'attribute', 'text', 'quoted', 'quoted', 'quoted']
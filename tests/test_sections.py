@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""分组级别的调整：在菜单树上移动和补齐菜单项，已经调整过的页面原样返回"""
+
+import pytest
+
+from conftest import read_repo_file, sidebar_pages
+from page_tools.menu import MenuTree
+from page_tools.sections import (
+    OLD_SYSTEM_SECTION, SERVICE_SECTION, TEMPLATE_MENU_ORDER, apply_template_menu, group_template_menus,
+    move_organizations_last,
+)
+from page_tools.sidebar import get_sidebar_template
+from page_tools.spans import locate_sidebar, section_block, splice
+
+SYSTEM_PAGES = [name for name in sidebar_pages() if '>系统管理</h3>' in read_repo_file(name)]
+
+
+def replace_section(content, name, text):
+    layout = locate_sidebar(content)
+    return splice(content, section_block(content, layout.sections[name]), text)
+
+
+def template_hrefs(content):
+    return [item.href for item in MenuTree.parse(content).section('模板管理').items()]
+
+
+@pytest.mark.parametrize('name', SYSTEM_PAGES)
+def test_template_menu_is_stable_on_current_pages(name):
+    content = read_repo_file(name)
+    assert apply_template_menu(content) == (content, True)
+
+
+def test_template_menu_restores_shuffled_page():
+    content = read_repo_file('templates.html')
+    tree = MenuTree.parse(content)
+    tree.section('模板管理').reorder([href for href, _, _ in reversed(TEMPLATE_MENU_ORDER)])
+    tree.section('系统管理').move('organizations.html', before='settings.html')
+    shuffled = tree.serialize()
+    assert shuffled != content
+    # 方案模板的高亮跟着菜单项移动，不会被标准菜单覆盖
+    assert apply_template_menu(shuffled) == (content, True)
+
+
+def test_template_menu_fills_in_legacy_section():
+    content = replace_section(get_sidebar_template('customers'), '系统管理', OLD_SYSTEM_SECTION)
+    new_content, matched = apply_template_menu(content)
+    assert matched
+    assert template_hrefs(new_content) == [href for href, _, _ in TEMPLATE_MENU_ORDER]
+    system = [item.href for item in MenuTree.parse(new_content).section('系统管理').items()]
+    assert system == ['settings.html', 'organizations.html']
+    assert move_organizations_last(new_content)[0] == new_content
+
+
+def test_template_menu_without_system_section():
+    content = '<aside id="sidebar"><nav><a href="a.html"><span>A</span></a></nav></aside>'
+    assert apply_template_menu(content) == (content, False)
+
+
+def test_group_template_menus():
+    pre_system = OLD_SYSTEM_SECTION.split('<!-- 模板管理（一级菜单） -->')[0].rstrip() + '''
+                    <a href="customer-profile-templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors">
+                        <i data-lucide="file-edit" class="w-4 h-4"></i>
+                        <span>资料模板</span>
+                    </a>
+                    <a href="settings.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors">
+                        <i data-lucide="settings" class="w-4 h-4"></i>
+                        <span>系统设置</span>
+                    </a>
+                </div>'''
+    content = replace_section(get_sidebar_template('customers'), '系统管理', pre_system)
+    content = replace_section(content, '智能服务', SERVICE_SECTION.render(None))
+
+    new_content, matched = group_template_menus(content)
+    assert matched
+    tree = MenuTree.parse(new_content)
+    assert [item.href for item in tree.section('智能服务').items()][:2] == ['cases.html', 'franchisees.html']
+    assert template_hrefs(new_content) == ['templates.html', 'customer-profile-templates.html']
+    assert '资料模板' not in new_content
+    assert group_template_menus(new_content) == (new_content, True)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""侧边栏区段定位：str 和 bytes 偏移一致、CRLF 页面、最坏情况线性时间"""
+
+import time
+
+import pytest
+
+from conftest import read_repo_file, sidebar_pages
+from page_tools.check import check_page
+from page_tools.sidebar import SIDEBAR_PAGES, get_sidebar_template
+from page_tools.spans import Span, block_looks_valid, locate_sidebar, locate_sidebar_block, section_block
+
+
+@pytest.mark.parametrize('name', sidebar_pages())
+def test_byte_offsets_match_character_offsets(name):
+    content = read_repo_file(name)
+    data = content.encode('utf-8')
+    layout = locate_sidebar(content)
+    byte_layout = locate_sidebar(data)
+
+    def encoded(span):
+        return data[span.start:span.end].decode('utf-8') if span else None
+
+    assert encoded(byte_layout.aside) == content[layout.aside.start:layout.aside.end]
+    assert byte_layout.sections.keys() == layout.sections.keys()
+    for name, span in layout.sections.items():
+        assert encoded(byte_layout.sections[name]) == content[span.start:span.end]
+
+
+def test_standard_sidebar_layout():
+    sidebar = get_sidebar_template('customers')
+    layout = locate_sidebar(sidebar)
+    assert layout.block == Span(0, len(sidebar))
+    assert list(layout.sections) == ['主要功能', '智能服务', '系统管理', '模板管理']
+    system = sidebar[slice(*section_block(sidebar, layout.sections['系统管理']))]
+    assert system.lstrip().startswith('<!-- 系统管理 -->')
+    assert system.endswith('</div>')
+
+
+def test_crlf_page_locates_same_regions():
+    content = read_repo_file('customers.html')
+    crlf = content.replace('\n', '\r\n')
+    layout = locate_sidebar(content)
+    crlf_layout = locate_sidebar(crlf)
+    assert crlf[slice(*crlf_layout.block)].replace('\r\n', '\n') == content[slice(*layout.block)]
+    assert crlf_layout.sections.keys() == layout.sections.keys()
+    assert block_looks_valid(crlf, crlf_layout.block)
+
+
+def test_crlf_page_passes_check(tmp_path):
+    path = tmp_path / 'customers.html'
+    path.write_bytes(read_repo_file('customers.html').replace('\n', '\r\n').encode('utf-8'))
+    expected = get_sidebar_template(SIDEBAR_PAGES['customers.html'])
+    assert check_page(str(path), expected).status == 'ok'
+
+
+def test_missing_markers():
+    assert locate_sidebar('<div>no sidebar</div>') is None
+    assert locate_sidebar('<aside id="sidebar"><div>') is None
+    layout = locate_sidebar('<aside id="sidebar"><div></div></aside>')
+    assert layout.block is None and layout.overlay is None and layout.sections == {}
+    assert locate_sidebar_block('<p>x</p>') is None
+
+
+def best_time(func, arg, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def adversarial_page(n):
+    """大量未闭合和嵌套的 <div>、分组标题在最后，没有遮罩层的结束标签"""
+    return ('<aside id="sidebar"><div><h3>主要功能</h3>' + '<div class="x">' * n + '</div>' * n
+            + '<div><h3>>系统管理</h3>' + '<div' * n + '</aside>' + '<!-- 遮罩层 (移动端) -->' + '<div ' * n)
+
+
+def test_locate_is_linear_in_page_size():
+    small = best_time(locate_sidebar, adversarial_page(5000))
+    large = best_time(locate_sidebar, adversarial_page(40000))
+    # 8 倍大小：线性约 8 倍，平方级会到 64 倍
+    assert large < small * 24 + 0.01
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+侧边栏统计快照
+schema:database/init.sql 生成的内存数据库里没有客户、订单和任务，fetch_stats 只会返回 {}；
+这里先写入两个机构的数据，再检查聚合口径、缓存和烘焙进侧边栏的数字
+"""
+
+import datetime
+import json
+
+import pytest
+
+from conftest import repo_path
+from page_tools.sidebar import get_sidebar_template
+from page_tools.stats import STAT_NAMES, StatsSource, fetch_stats, open_pool, select_org
+
+SCHEMA = 'schema:' + repo_path('database', 'init.sql')
+TODAY = datetime.date.today()
+YESTERDAY = TODAY - datetime.timedelta(days=1)
+LAST_MONTH = TODAY.replace(day=1) - datetime.timedelta(days=1)
+
+
+def seed(conn):
+    customers = [
+        # (id, org_id, created_at, is_deleted)
+        (1, 1, f'{TODAY} 09:00:00', 0),
+        (2, 1, f'{YESTERDAY} 09:00:00', 0),
+        (3, 1, f'{TODAY} 10:00:00', 1),
+        (4, 2, f'{LAST_MONTH} 09:00:00', 0),
+    ]
+    conn.executemany(
+        "INSERT INTO customers (id, customer_no, name, phone, org_id, store_id, created_at, is_deleted) "
+        "VALUES (?, 'C' || ?, '客户', '13800000000', ?, 1, ?, ?)",
+        [(cid, cid, org, created, deleted) for cid, org, created, deleted in customers])
+    tasks = [
+        # (org_id, customer_id, task_type, status)
+        (1, 1, 'follow_up', 'pending'),
+        (1, 1, 'follow_up', 'overdue'),
+        (1, 2, 'follow_up', 'completed'),
+        (1, 2, 'service', 'in_progress'),
+        (2, 4, 'follow_up', 'in_progress'),
+    ]
+    conn.executemany(
+        "INSERT INTO tasks (task_no, title, task_type, org_id, assigned_to, customer_id, status) "
+        "VALUES (?, '任务', ?, ?, 1, ?, ?)",
+        [(f'T{n}', task_type, org, customer, status) for n, (org, customer, task_type, status) in enumerate(tasks)])
+    orders = [
+        # (org_id, service_date, created_at)：没有服务日期时按下单日期
+        (1, str(TODAY), f'{LAST_MONTH} 09:00:00'),
+        (1, None, f'{TODAY} 09:00:00'),
+        (1, str(LAST_MONTH), f'{TODAY} 09:00:00'),
+        (2, None, f'{LAST_MONTH} 09:00:00'),
+    ]
+    conn.executemany(
+        "INSERT INTO orders (order_no, customer_id, customer_name, customer_phone, org_id, store_id, "
+        "original_amount, final_amount, service_date, created_at) VALUES (?, 1, '客户', '13800000000', ?, 1, 0, 0, ?, ?)",
+        [(f'O{n}', org, service, created) for n, (org, service, created) in enumerate(orders)])
+    conn.commit()
+
+
+EXPECTED = {
+    '1': {'totalCustomers': 2, 'newCustomers': 1, 'pendingCustomers': 1, 'monthlyOrders': 2, 'openTasks': 3},
+    '2': {'totalCustomers': 1, 'newCustomers': 0, 'pendingCustomers': 1, 'monthlyOrders': 0, 'openTasks': 1},
+}
+
+
+@pytest.fixture
+def pool():
+    pool, placeholder = open_pool(SCHEMA)
+    assert placeholder == '?'
+    yield pool
+    pool.close()
+
+
+def test_schema_stand_in_has_no_rows(pool):
+    assert fetch_stats(pool, '?', TODAY) == {}
+
+
+def test_fetch_stats_aggregates_seeded_rows(pool):
+    with pool.connection() as conn:
+        seed(conn)
+    assert fetch_stats(pool, '?', TODAY) == EXPECTED
+
+
+def test_select_org():
+    assert select_org(EXPECTED, 2) == EXPECTED['2']
+    assert select_org(EXPECTED, 3) == dict.fromkeys(STAT_NAMES, 0)
+    assert select_org(EXPECTED) == {
+        'totalCustomers': 3, 'newCustomers': 1, 'pendingCustomers': 2, 'monthlyOrders': 2, 'openTasks': 4}
+
+
+def test_stats_source_caches_and_bakes_into_sidebar(tmp_path):
+    cache = tmp_path / 'stats.json'
+    source = StatsSource(SCHEMA, str(cache), org_id=1)
+    source.pool, source.placeholder = open_pool(SCHEMA)
+    with source.pool.connection() as conn:
+        seed(conn)
+    try:
+        stats = source.get()
+    finally:
+        source.close()
+    assert stats == EXPECTED['1']
+    assert json.loads(cache.read_text(encoding='utf-8'))['orgs'] == EXPECTED
+
+    # 缓存未过期时不再查询数据库：新的来源没有写入数据，读到的仍是缓存中的数字
+    cached = StatsSource(SCHEMA, str(cache), org_id=1)
+    assert cached.get() == EXPECTED['1']
+    assert cached.pool is None
+
+    sidebar = get_sidebar_template('customers', stats=stats)
+    assert 'id="totalCustomers">2<' in sidebar
+    assert 'id="monthlyOrders">2<' in sidebar
+    assert get_sidebar_template('customers', stats=stats) != get_sidebar_template('customers')
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Tailwind 子集样式表：工具类规则、变体、规则顺序和 CDN 脚本替换"""
+
+import pytest
+
+from page_tools.tailwind import (
+    build_stylesheet, collect_candidates, expand_templates, generate_rules, purge_pages, split_variants,
+)
+
+
+def rule_text(candidate):
+    return [(rule.media, rule.selector, rule.declarations) for rule in generate_rules(candidate)]
+
+
+@pytest.mark.parametrize('candidate, expected', [
+    ('p-4', [(None, '.p-4', 'padding:1rem')]),
+    ('-mt-2', [(None, '.-mt-2', 'margin-top:-0.5rem')]),
+    ('w-[37px]', [(None, '.w-\\[37px\\]', 'width:37px')]),
+    ('bg-blue-500/50', [(None, '.bg-blue-500\\/50', 'background-color:rgb(59 130 246 / 0.5)')]),
+    ('md:hover:bg-blue-600', [('@media (min-width: 768px)', '.md\\:hover\\:bg-blue-600:hover',
+                               '--tw-bg-opacity:1;background-color:rgb(37 99 235 / var(--tw-bg-opacity))')]),
+    ('group-hover:text-white', [(None, '.group:hover .group-hover\\:text-white',
+                                 '--tw-text-opacity:1;color:rgb(255 255 255 / var(--tw-text-opacity))')]),
+    ('before:content-none', [(None, '.before\\:content-none::before', '--tw-content:none;content:var(--tw-content)')]),
+])
+def test_generate_rules(candidate, expected):
+    assert rule_text(candidate) == expected
+
+
+@pytest.mark.parametrize('candidate', ['hello', 'p-4x', 'md:lg:p-4', 'unknown:p-4', '-flex', 'text-notacolor-500'])
+def test_non_utilities_generate_nothing(candidate):
+    assert generate_rules(candidate) == []
+
+
+def test_split_variants_ignores_colons_in_brackets():
+    assert split_variants('md:bg-[url(a:b)]') == (['md'], 'bg-[url(a:b)]')
+
+
+def test_stylesheet_order_follows_plugins_and_screens():
+    css, used = build_stylesheet({'md:p-2', 'px-4', 'p-4', 'hello', 'animate-spin'})
+    assert used == {'md:p-2', 'px-4', 'p-4', 'animate-spin'}
+    # padding 在 padding-x 之前，同一元素上的 px-4 能覆盖 p-4；响应式规则在最后
+    assert css.index('.p-4{') < css.index('.px-4{') < css.index('@media (min-width: 768px){.md\\:p-2')
+    assert '@keyframes spin' in css
+    assert build_stylesheet(['p-4', 'md:p-2', 'px-4', 'animate-spin']) == (css, used)
+
+
+def test_template_literal_classes_expand_to_palette():
+    candidates = expand_templates('el.className = `bg-${color}-100 text-${color}-600/50`')
+    assert {'bg-red-100', 'bg-blue-100', 'text-green-600/50'} <= candidates
+    assert 'bg-blue-100' in collect_candidates(['<div class="p-4"></div>', '`bg-${c}-100`'])
+
+
+def test_purge_pages_replaces_cdn_script():
+    page = ('<html><head>\n    <script src="https://cdn.tailwindcss.com"></script>\n    <style>.card{}</style>\n'
+            '</head><body class="p-4 card pp-4 text-gray-500 text-bleu-500"></body></html>')
+    result = purge_pages({'a.html': page, 'b.html': '<p class="m-2">no cdn</p>'}, [], [])
+    assert list(result.pages) == ['a.html']
+    content = result.pages['a.html']
+    assert 'cdn.tailwindcss.com' not in content
+    assert f'<link rel="stylesheet" href="{result.name}">\n</head>' in content
+    assert {'p-4', 'm-2'} <= result.used
+    # 只报告与已生成的工具类同前缀的拼写错误
+    assert result.unknown == {'text-bleu-500'}
@@ -5,66 +5,13 @@
 统一模板管理菜单顺序：客户模板 → 诊断模板 → 方案模板 → 任务模板
 """
 
+import argparse
 import os
-import re
-
-# 标准的模板管理菜单HTML
-STANDARD_TEMPLATE_MENU = '''                    <!-- 系统管理 -->
-                <div class="space-y-2">
-                    <h3 class="text-xs font-semibold text-gray-400 uppercase tracking-wider mb-3">系统管理</h3>
-                    <!-- 模板管理（一级菜单） -->
-                    <div class="space-y-1">
-                        <div class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 font-medium">
-                            <i data-lucide="folder-open" class="w-4 h-4"></i>
-                            <span>模板管理</span>
-                        </div>
-                        <!-- 模板管理二级菜单 - 按业务流程排序 -->
-                        <a href="customer-profile-templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors ml-4">
-                            <i data-lucide="user-square" class="w-4 h-4"></i>
-                            <span>客户模板</span>
-                        </a>
-                        <a href="diagnosis-templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors ml-4">
-                            <i data-lucide="stethoscope" class="w-4 h-4"></i>
-                            <span>诊断模板</span>
-                        </a>
-                        <a href="templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors ml-4">
-                            <i data-lucide="layers" class="w-4 h-4"></i>
-                            <span>方案模板</span>
-                        </a>
-                        <a href="task-templates.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors ml-4">
-                            <i data-lucide="list-checks" class="w-4 h-4"></i>
-                            <span>任务模板</span>
-                        </a>
-                    </div>
-                    <a href="settings.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors">
-                        <i data-lucide="settings" class="w-4 h-4"></i>
-                        <span>系统设置</span>
-
-                    </a>
-                    <a href="organizations.html" class="flex items-center space-x-3 px-3 py-2 text-sm text-gray-700 hover:bg-gray-50 rounded-lg transition-colors">
-                        <i data-lucide="building-2" class="w-4 h-4"></i>
-                        <span>组织管理</span>
-
-                    </a>
-                </div>'''
-
-# 需要更新的HTML文件列表
-HTML_FILES = [
-    'index.html',
-    'customers.html',
-    'orders.html',
-    'tasks.html',
-    'cases.html',
-    'users.html',
-    'roles.html',
-    'organizations.html',
-    'franchisees.html',
-    'settings.html',
-    'customer-profile-templates.html',
-    'diagnosis-templates.html',
-    'templates.html',
-    'task-templates.html',
-]
+
+from page_tools.fileio import write_atomic
+from page_tools.index import select_pages
+from page_tools.parallel import run_pages
+from page_tools.sections import TEMPLATE_MENU_TARGETS, apply_template_menu
 
 def update_sidebar(filepath):
     """更新单个文件的侧边栏菜单"""
@@ -81,44 +28,18 @@ def update_sidebar(filepath):
             print(f'[SKIP] 未找到侧边栏: {filepath}')
             return False
 
-        # 匹配模式：从 "<!-- 系统管理 -->" 开始，到下一个主要的 </div> 或 </aside>
-        # 使用多个模式尝试匹配不同的侧边栏结构
-
-        patterns = [
-            # 模式1: 系统管理部分后面跟着 </div>\n</aside>
-            (r'([ \t]*)<!-- 系统管理 -->.*?</div>\s*</div>\s*</aside>',
-             lambda indent: STANDARD_TEMPLATE_MENU + '\n' + indent + '</div>\n' + indent[:-4] + '</aside>'),
-
-            # 模式2: 系统管理部分后面跟着 </div>\n<div (遮罩层)
-            (r'([ \t]*)<!-- 系统管理 -->.*?</div>\s*</div>\s*</aside>\s*<!-- 遮罩层',
-             lambda indent: STANDARD_TEMPLATE_MENU + '\n' + indent + '</div>\n' + indent[:-4] + '</aside>\n\n' + indent[:-4] + '<!-- 遮罩层'),
-        ]
-
-        updated = False
-        for pattern, replacer in patterns:
-            regex = re.compile(pattern, re.DOTALL)
-            match = regex.search(content)
-
-            if match:
-                indent = match.group(1)
-                replacement = replacer(indent)
-                new_content = regex.sub(replacement, content, count=1)
-
-                if new_content != content:
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
-                    print(f'[OK] 已更新: {filepath}')
-                    updated = True
-                    break
-                else:
-                    print(f'[SKIP] 无需更新: {filepath}')
-                    updated = True
-                    break
-
-        if not updated:
+        new_content, matched = apply_template_menu(content)
+
+        if not matched:
             print(f'[WARN] 未匹配到模式: {filepath}')
             return False
 
+        if new_content != content:
+            write_atomic(filepath, new_content)
+            print(f'[OK] 已更新: {filepath}')
+        else:
+            print(f'[SKIP] 无需更新: {filepath}')
+
         return True
 
     except Exception as e:
@@ -127,6 +48,18 @@ def update_sidebar(filepath):
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description='批量更新所有页面的侧边栏菜单')
+    parser.add_argument('base_dirs', nargs='*', help='页面所在目录，可以指定多个前端副本（默认当前目录）')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='并行进程数，0 表示使用全部CPU核心')
+    args = parser.parse_args()
+
+    # 目标页面由页面索引查出：侧边栏中有系统管理分组的页面
+    if args.base_dirs:
+        filepaths = [os.path.join(base_dir, filename) for base_dir in args.base_dirs
+                     for filename in select_pages(base_dir, TEMPLATE_MENU_TARGETS)]
+    else:
+        filepaths = select_pages('.', TEMPLATE_MENU_TARGETS)
+
     print('='*60)
     print('开始批量更新侧边栏菜单')
     print('='*60)
@@ -145,11 +78,11 @@ def main():
     skip_count = 0
     error_count = 0
 
-    for filename in HTML_FILES:
-        result = update_sidebar(filename)
+    results = run_pages(update_sidebar, [(filepath,) for filepath in filepaths], args.jobs)
+    for filepath, result in zip(filepaths, results):
         if result:
             success_count += 1
-        elif os.path.exists(filename):
+        elif os.path.exists(filepath):
             error_count += 1
         else:
             skip_count += 1